@@ -5,9 +5,14 @@ from app.business.account.service.user_service import UserService
 from app.business.account.model.user_viewmodel import UserCreate, UserUpdate, UserViewModel
 from app.business.account.schema.user import User
 from app.core.container import Container
+from app.core.data.query_compiler import get_view_fields
+from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
 
 router = APIRouter()
 
+# List endpoints only load the columns the view model returns
+USER_VIEW_FIELDS = get_view_fields(UserViewModel, User)
+
 def get_user_service() -> UserService:
     """
     Get the user service instance.
@@ -53,7 +58,23 @@ async def list_users(
     """
     List users with pagination.
     """
-    return await user_service.list(skip=skip, limit=limit)
+    return await user_service.list(skip=skip, limit=limit, fields=USER_VIEW_FIELDS)
+
+@router.post("/paging", response_model=PaginationResponse[UserViewModel])
+async def page_users(
+    request: PaginationRequest,
+    user_service: UserService = Depends(get_user_service)
+) -> PaginationResponse:
+    """
+    Page through users. Pass the returned next/previous cursor to fetch the adjacent page.
+    """
+    try:
+        return await user_service.find_paging(request, fields=USER_VIEW_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/{user_id}", response_model=UserViewModel)
 async def get_user(
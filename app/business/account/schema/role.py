@@ -4,6 +4,7 @@ from sqlmodel import Field, Relationship
 from typing import TYPE_CHECKING, Optional
 from app.business.menu.schema.menu_role import MenuRole
 from app.business.permission.schema.permission import Permission
+from app.core.data.indexes import IndexSpec, register_indexes
 
 if TYPE_CHECKING:
     from app.business.account.schema.user import User
@@ -36,3 +37,5 @@ class Role(BaseModel, table=True):
                 "is_active": True
             }
         }
+
+register_indexes(Role, IndexSpec(("name",), unique=True))
@@ -6,6 +6,7 @@ from app.business.account.schema.user_roles import UserRole
 from app.business.common.schema.base import BaseModel
 from sqlmodel import Field, Relationship
 from sqlalchemy.ext.hybrid import hybrid_property
+from app.core.data.indexes import IndexSpec, register_indexes
 
 if TYPE_CHECKING:
     from app.business.account.schema.role import Role
@@ -100,3 +101,9 @@ class User(BaseModel, table=True):
                 "is_active": True
             }
         } 
+
+register_indexes(
+    User,
+    IndexSpec(("email",), unique=True),
+    IndexSpec(("username",), unique=True),
+)
@@ -1,12 +1,29 @@
 from app.business.common.services.base import BaseService
 from app.business.account.schema.role import Role
 from app.business.account.model.role_viewmodel import RoleCreate, RoleUpdate
+from app.business.permission.services.permission_matrix import PermissionMatrixStore
+from typing import Optional
 
 
 class RoleService(BaseService[Role, RoleCreate, RoleUpdate]):
     """
     Service for role operations.
     """
+    model = Role
+
+    async def update(self, id: str, obj_in: RoleUpdate) -> Optional[Role]:
+        role = await super().update(id, obj_in)
+        if role is not None:
+            # Inactive roles are left out of the permission matrix
+            await PermissionMatrixStore().reload()
+        return role
+
+    async def delete(self, id: str) -> bool:
+        deleted = await super().delete(id)
+        if deleted:
+            await PermissionMatrixStore().reload()
+        return deleted
+
     async def get_by_name(self, name: str) -> Role | None:
         """
         Get a role by name.
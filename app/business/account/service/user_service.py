@@ -1,13 +1,21 @@
 from app.business.common.services.base import BaseService
-from app.business.account.schema import User
+from typing import List
+from app.business.account.schema import User, UserRole
 from app.business.account.model.user_viewmodel import UserCreate, UserUpdate
-from app.core.utils.password import hash_password
+from app.core.data.repository_factory import RepositoryFactory
+from app.core.utils.password import hash_password_async, PasswordHasherBusyError
 
 
 class UserService(BaseService[User, UserCreate, UserUpdate]):
     """
     Service for user operations.
     """
+    model = User
+
+    def __init__(self):
+        super().__init__()
+        self.user_role_repository = RepositoryFactory().get_repository(model=UserRole)
+
     async def create(self, obj_in: UserCreate) -> User:
         """
         Create a new user.
@@ -19,7 +27,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             The created user
         """
         # Hash the password
-        obj_in.password = hash_password(obj_in.password)
+        obj_in.password = await hash_password_async(obj_in.password)
         return await super().create(obj_in)
 
     async def update(self, id: str, obj_in: UserUpdate) -> User | None:
@@ -35,9 +43,43 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """
         # Hash the password if it's being updated
         if obj_in.password:
-            obj_in.password = hash_password(obj_in.password)
+            obj_in.password = await hash_password_async(obj_in.password)
         return await super().update(id, obj_in)
 
+    async def rehash_password(self, id: str, password: str) -> None:
+        """
+        Hash a verified password again with the current bcrypt cost and store it.
+
+        Args:
+            id: The user ID
+            password: The plain text password the user just signed in with
+        """
+        try:
+            password_hash = await hash_password_async(password)
+            # Matched through the provider's id field, only the password is written
+            if not await self.repository.update_one_by_id(id, UserUpdate(password=password_hash), return_document=False):
+                self.logger.warning(f"Skipped password rehash of user {id}, the user was not found")
+                return
+            self.logger.info(f"Rehashed password of user {id} with the current bcrypt cost")
+        except PasswordHasherBusyError:
+            # Logins come first, the next sign-in tries again
+            self.logger.debug(f"Skipped password rehash of user {id}, the hash pool is busy")
+        except Exception as e:
+            self.logger.error(f"Error rehashing password of user {id}: {str(e)}")
+
+    async def get_role_ids(self, id: str) -> List[str]:
+        """
+        Get the IDs of a user's roles from the link table, without loading the roles themselves.
+
+        Args:
+            id: The user ID
+
+        Returns:
+            The role IDs
+        """
+        links = await self.user_role_repository.find_many({"user_id": id}, fields=["role_id"])
+        return [str(link.role_id) for link in links]
+
     async def get_by_email(self, email: str) -> User | None:
         """
         Get a user by email.
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.business.application_info.model import ApplicationInfoViewModel
 from app.business.application_info.services import ApplicationInfoService
 from app.core.container import Container
+from app.core.utils.etag import is_not_modified, not_modified_response, set_cache_headers
 
 router = APIRouter()
 
+# Application info only changes on deploy or migration
+APPLICATION_INFO_CACHE_CONTROL = "public, max-age=300"
+
 def get_application_info_service() -> ApplicationInfoService:
     """
     Get the setting service instance.
@@ -14,11 +18,16 @@ def get_application_info_service() -> ApplicationInfoService:
 
 
 @router.get("/application-info", response_model=ApplicationInfoViewModel)
-async def application_info(application_info_service: ApplicationInfoService = Depends(get_application_info_service)) -> ApplicationInfoViewModel:
+async def application_info(request: Request, response: Response, application_info_service: ApplicationInfoService = Depends(get_application_info_service)) -> ApplicationInfoViewModel:
+    etag = await application_info_service.get_application_info_etag()
+    if etag is not None and is_not_modified(request, etag):
+        return not_modified_response(etag, APPLICATION_INFO_CACHE_CONTROL)
     info = await application_info_service.get_application_info()
     if info is None:
         # If the service returns None, it means the application info was not found.
         # Raise an HTTPException with status code 404.
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application info not found")
+    if etag is not None:
+        set_cache_headers(response, etag, APPLICATION_INFO_CACHE_CONTROL)
     return info
 
@@ -2,13 +2,18 @@ from app.core.logging import logger
 from app.core.config import settings
 from app.core.constants import Application_Version
 from app.core.data import DBFactory
+from app.core.cache import CacheFactory
 from app.business.application_info.schema import ApplicationInfo
 from app.business.common.schema import MigrationDB
 from app.core.data.repository_factory import RepositoryFactory
+from app.core.utils.etag import make_etag
+
+APPLICATION_INFO_CACHE_KEY = "application_info"
+APPLICATION_INFO_ETAG_CACHE_KEY = "application_info:etag"
 
 class ApplicationInfoService:
-    application_info: ApplicationInfo = None
     def __init__(self):
+        self.cache = CacheFactory().get_provider()
         self.repository = RepositoryFactory().get_repository(ApplicationInfo)
         self.db_migration_repository = RepositoryFactory().get_repository(model=MigrationDB)
 
@@ -19,22 +24,36 @@ class ApplicationInfoService:
         """
         try:
             # 1. Check if info is already cached
-            if self.application_info is not None:
-                return self.application_info
+            application_info: ApplicationInfo | None = await self.cache.get(APPLICATION_INFO_CACHE_KEY)
+            if application_info is not None:
+                return application_info
 
             # 2. If not cached, try to load from the repository
-            loaded_info: ApplicationInfo | None = await self.repository.find_one({})
+            application_info = await self.repository.find_one({})
             # 3. If loaded successfully, cache it
-            if loaded_info is not None:
-                self.application_info = loaded_info
+            if application_info is not None:
+                await self.cache.set(APPLICATION_INFO_CACHE_KEY, application_info, ttl=0)
             else:
-                await self.set_application_info() # Call the method to set the default
+                application_info = await self.set_application_info() # Call the method to set the default
 
-            return self.application_info
+            return application_info
         except Exception as e:
             logger.error(f"Failed to get application info in repository: {e}", exc_info=True)
             return None
 
+    async def get_application_info_etag(self) -> str | None:
+        """
+        Get the ETag of the application information, hashed from its content once per change.
+        """
+        etag: str | None = await self.cache.get(APPLICATION_INFO_ETAG_CACHE_KEY)
+        if etag is None:
+            application_info = await self.get_application_info()
+            if application_info is None:
+                return None
+            etag = make_etag("application-info", application_info.model_dump_json())
+            await self.cache.set(APPLICATION_INFO_ETAG_CACHE_KEY, etag, ttl=0)
+        return etag
+
     async def set_application_info(self, application_info: ApplicationInfo = None):
         try:
             application_info: ApplicationInfo | None = await self.repository.find_one({})
@@ -52,7 +71,7 @@ class ApplicationInfoService:
                     cache_provider=settings.CACHE_PROVIDER,
                     database_migration=getattr(migration_db, "id", "")
                 )
-                await self.repository.insert_one(application_info)
+                await self.repository.insert_one(application_info, return_document=False)
             else:
                 application_info.app_version=Application_Version
                 application_info.database_name=db_name
@@ -60,10 +79,12 @@ class ApplicationInfoService:
                 application_info.database_provider=settings.DB_PROVIDER
                 application_info.cache_provider=settings.CACHE_PROVIDER
                 application_info.database_migration=getattr(migration_db, "id", "")
-                await self.repository.update_one({'id': application_info.id }, application_info)
+                await self.repository.update_one({'id': application_info.id }, application_info, return_document=False)
      
             # Optionally update the cached info after creation
-            self.application_info = application_info
+            await self.cache.set(APPLICATION_INFO_CACHE_KEY, application_info, ttl=0)
+            await self.cache.delete(APPLICATION_INFO_ETAG_CACHE_KEY)
+            return application_info
         except Exception as e:
             logger.error(f"Failed to set application info in repository: {e}", exc_info=True)
 
@@ -0,0 +1,23 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+
+from app.business.auth.model import AuthTokenData
+from app.business.auth.services.access_token import AccessTokenValidator
+from app.core.config import settings
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> AuthTokenData:
+    """
+    Get the caller from the bearer access token.
+    The claims carry the user id, username and role ids, so no user lookup is needed.
+    """
+    try:
+        return await AccessTokenValidator().validate(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
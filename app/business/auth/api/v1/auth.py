@@ -1,5 +1,7 @@
 from typing import Annotated
-from app.business.auth.model import AuthToken
+from app.business.auth.model import AuthToken, AuthTokenData
+from app.business.auth.model.auth_token import AuthRefreshTokenRequest
+from app.business.auth.api.dependencies import get_current_user
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.business.auth.services.auth_service import AuthService
@@ -30,5 +32,38 @@ async def login_for_access_token(
         )
     
     token = await auth_service.get_token_data(user)
-    return token 
-    
\ No newline at end of file
+    return token
+
+@router.post("/refresh", response_model=AuthToken)
+async def refresh_access_token(
+    request: AuthRefreshTokenRequest,
+    auth_service: AuthService = Depends(get_auth_service)
+) -> AuthToken:
+    """
+    Exchange a refresh token for a new access and refresh token.
+    """
+    if token := await auth_service.refresh_token_data(request.refresh_token):
+        return token
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or revoked refresh token"
+    )
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: AuthRefreshTokenRequest,
+    auth_service: AuthService = Depends(get_auth_service)
+) -> None:
+    """
+    Revoke a refresh token.
+    """
+    await auth_service.revoke_refresh_token(request.refresh_token)
+
+@router.get("/me", response_model=AuthTokenData)
+async def read_current_user(
+    current_user: AuthTokenData = Depends(get_current_user)
+) -> AuthTokenData:
+    """
+    Get the caller's identity from the access token, without a database query.
+    """
+    return current_user
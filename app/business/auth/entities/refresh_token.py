@@ -1,24 +1,37 @@
-import datetime
-from typing import ClassVar, Optional, Annotated
-from pydantic import Field, StringConstraints
+from datetime import datetime
+from typing import ClassVar
+from sqlalchemy import DateTime
+from sqlmodel import Field
 from app.business.common.schema.base import BaseModel
+from app.core.data.indexes import IndexSpec, register_indexes
 
-class RefreshToken(BaseModel):
+class RefreshToken(BaseModel, table=True):
     """
     Refresh Token model for the system
     """
+    __tablename__ = "refresh"
     collection_name: ClassVar[str] = "refresh"
-    user_id: str = Field(..., description="User ID")
-    token: str = Field(..., description="Refresh token", unique=True)
-    valid_until: datetime = Field(..., description="Valid until")
-    is_active: bool = Field(default=True, description="Whether the refresh token is active")
+    user_id: str = Field(nullable=False, max_length=50, description="User ID")
+    jti: str = Field(nullable=False, max_length=50, description="Unique token ID, the jti claim of the refresh token")
+    token: str = Field(nullable=False, max_length=64, description="SHA-256 digest of the refresh token, the token itself is never stored")
+    valid_until: datetime = Field(nullable=False, sa_type=DateTime(timezone=True), description="Valid until")
+    is_active: bool = Field(default=True, nullable=False, description="Whether the refresh token is active, False once revoked")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "user_id": "1234567890",
-                "token": "1234567890",
+                "jti": "3f2b8c1e-7a4d-4e8b-9c6f-1d2e3f4a5b6c",
+                "token": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
                 "valid_until": "2025-01-01 00:00:00",
                 "is_active": True
             }
         }
+
+# Refresh and revocation look tokens up by jti, expired tokens are purged server-side
+register_indexes(
+    RefreshToken,
+    IndexSpec(("jti",), unique=True),
+    IndexSpec(("user_id",)),
+    IndexSpec(("valid_until",), expire_after_seconds=0),
+)
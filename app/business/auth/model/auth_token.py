@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class AuthToken(BaseModel):
     access_token: str
@@ -9,6 +9,9 @@ class AuthToken(BaseModel):
 
 class AuthTokenData(BaseModel):
     username: Optional[str] = None
+    user_id: Optional[str] = None
+    role_ids: List[str] = []
+    expires_at: Optional[int] = None
     
 class AuthRefreshTokenRequest(BaseModel):
     refresh_token: str
\ No newline at end of file
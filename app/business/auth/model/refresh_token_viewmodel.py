@@ -4,28 +4,32 @@ from typing import Optional
 from pydantic import BaseModel
 
 class RefreshTokenCreate(BaseModel):
+    user_id: str
+    jti: str
     token: str
     valid_until: datetime.datetime
-    isActive: bool = True
+    is_active: bool = True
 
     class Config:
         json_schema_extra = {
             "example": {
-                "token": "1234567890",
+                "user_id": "1234567890",
+                "jti": "3f2b8c1e-7a4d-4e8b-9c6f-1d2e3f4a5b6c",
+                "token": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
                 "valid_until": "2025-01-01 00:00:00",
-                "isActive": True
+                "is_active": True
             }
         }
 
 class RefreshTokenUpdate(BaseModel):
     valid_until: Optional[datetime.datetime] = None
-    isActive: Optional[bool] = None
+    is_active: Optional[bool] = None
 
     class Config:
         json_schema_extra = {
             "example": {
                 "valid_until": "2025-01-01 00:00:00",
-                "isActive": True
+                "is_active": True
             }
         }
 
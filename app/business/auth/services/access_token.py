@@ -0,0 +1,73 @@
+import hashlib
+import time
+from functools import lru_cache
+from typing import Any, Dict
+
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from app.business.auth.model import AuthTokenData
+from app.core.cache.memory_cache import MemoryCache
+from app.core.config import settings
+
+@lru_cache
+def get_signing_key() -> Key:
+    """
+    Get the key object for SECRET_KEY, built once instead of on every encode and decode.
+    """
+    return jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+
+def encode_token(claims: Dict[str, Any]) -> str:
+    return jwt.encode(claims, get_signing_key(), algorithm=settings.ALGORITHM)
+
+def decode_token(token: str) -> Dict[str, Any]:
+    return jwt.decode(token, get_signing_key(), algorithms=[settings.ALGORITHM])
+
+class AccessTokenValidator:
+    """
+    Validates access tokens and keeps the decoded claims in memory, keyed by the token's SHA-256 digest, until the token expires.
+    A token seen before is authorized without verifying its signature again or querying the database.
+    The cache is per process, the claims are never shared with other workers.
+    """
+    _instance = None
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.claims_cache = MemoryCache(max_entries=settings.TOKEN_CLAIMS_CACHE_SIZE, default_ttl=0)
+        return cls._instance
+
+    async def validate(self, token: str) -> AuthTokenData:
+        """
+        Validate an access token.
+
+        Args:
+            token: The encoded access token
+
+        Returns:
+            The claims of the token
+
+        Raises:
+            JWTError: If the token is malformed, forged, expired or not an access token
+        """
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        token_data: AuthTokenData | None = await self.claims_cache.get(digest)
+        if token_data is not None:
+            # The cache entry may outlive exp by under a second
+            if token_data.expires_at is not None and token_data.expires_at <= time.time():
+                await self.claims_cache.delete(digest)
+                raise JWTError("Signature has expired.")
+            return token_data
+
+        payload = decode_token(token)
+        if payload.get("type") != "access":
+            raise JWTError("Not an access token")
+        token_data = AuthTokenData(
+            username=payload.get("sub"),
+            user_id=payload.get("uid"),
+            role_ids=payload.get("roles", []),
+            expires_at=payload.get("exp"),
+        )
+        ttl = int(token_data.expires_at - time.time()) if token_data.expires_at is not None else settings.CACHE_DEFAULT_TTL
+        if ttl > 0:
+            await self.claims_cache.set(digest, token_data, ttl)
+        return token_data
@@ -2,18 +2,22 @@ from datetime import datetime, timedelta, UTC
 from typing import Optional
 from app.business.account.schema import User
 from app.business.account.service.user_service import UserService
-from app.core.utils.password import hash_password, verify_password
-from jose import JWTError, jwt
+from app.core.utils.background import run_in_background
+from app.core.utils.password import hash_password_async, password_needs_rehash, verify_password_async
 from app.core.config import settings
+from jose import JWTError
 from app.business.auth.model import AuthToken
+from app.business.auth.services.access_token import decode_token, encode_token
+from app.business.auth.services.refresh_token_service import RefreshTokenService
 import uuid
 
 class AuthService:
     """
     Service for authentication operations.
     """
-    def __init__(self, user_service: UserService):
+    def __init__(self, user_service: UserService, refresh_token_service: RefreshTokenService):
         self.user_service = user_service
+        self.refresh_token_service = refresh_token_service
 
     async def authenticate_user(self, username: str, password: str) -> User | None:
         """
@@ -29,11 +33,14 @@ class AuthService:
         user = await self.user_service.get_by_username(username)
         if not user:
             return None
-        if not verify_password(password, user.password):
+        if not await verify_password_async(password, user.password):
             return None
+        if password_needs_rehash(user.password):
+            # Upgrade hashes made with an older, cheaper cost without delaying the login
+            run_in_background(self.user_service.rehash_password(str(user.id), password))
         return user
     
-    def __create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    def __create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """
         Create an access token for the user.
         """
@@ -43,10 +50,10 @@ class AuthService:
         else:
             expire = datetime.now(UTC) + timedelta(minutes=15)
         to_encode.update({"exp": expire, "type": "access"})
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        encoded_jwt = encode_token(to_encode)
         return encoded_jwt
 
-    def __create_refresh_token(self, data: dict) -> str:
+    async def __create_refresh_token(self, data: dict) -> str:
         """
         Create a refresh token for the user.
         """
@@ -60,58 +67,77 @@ class AuthService:
             "jti": jti
         })
         
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        encoded_jwt = encode_token(to_encode)
         
         # Store refresh token info
-        refresh_token_store[jti] = {
-            "username": data["sub"],
-            "expires_at": expire,
-            "revoked": False
-        }
+        await self.refresh_token_service.store(user_id=data["uid"], jti=jti, token=encoded_jwt, valid_until=expire)
         
         return encoded_jwt
      
-    def get_token_data(self, user: User) -> AuthToken:
+    async def get_token_data(self, user: User) -> AuthToken:
         """
         Get the token data for the user.
+        The access token carries the user id and role ids,
+        so get_current_user and require_permission authorize it without a query.
         """
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = self.__create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
+            data={
+                "sub": user.username,
+                "uid": str(user.id),
+                "roles": await self.user_service.get_role_ids(user.id)
+            },
+            expires_delta=access_token_expires
         )
-        refresh_token = self.__create_refresh_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
+        refresh_token = await self.__create_refresh_token(
+            data={"sub": user.username, "uid": str(user.id)}
         )
-        return TokenData(token=access_token, token_type="bearer")
+        return AuthToken(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
 
-    async def store_refresh_token_mongo(
-        user_id: str, 
-        username: str, 
-        refresh_token: str,
-        device_info: Optional[str] = None,
-        ip_address: Optional[str] = None
-        ):
-        """Store refresh token in separate MongoDB collection"""
-        refresh_tokens_collection = get_refresh_tokens_collection()
-        expire_date = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    async def refresh_token_data(self, refresh_token: str) -> AuthToken | None:
+        """
+        Exchange a refresh token for a new token pair.
+        The refresh token is rotated, it is revoked once used so a stolen copy cannot be replayed.
         
-        token_doc = {
-            "_id": str(uuid.uuid4()),
-            "token": refresh_token,
-            "user_id": user_id,
-            "username": username,
-            "device_info": device_info,
-            "ip_address": ip_address,
-            "expires_at": expire_date,
-            "created_at": datetime.utcnow(),
-            "last_used": None,
-            "is_active": True
-        }
+        Args:
+            refresh_token: The encoded refresh token
+            
+        Returns:
+            The new token data, None if the refresh token is invalid, expired or revoked
+        """
+        try:
+            payload = decode_token(refresh_token)
+        except JWTError:
+            return None
+        if payload.get("type") != "refresh" or await self.refresh_token_service.is_revoked(payload.get("jti"), refresh_token):
+            return None
+        # Of concurrent refreshes with the same token only the one that revokes it gets a new pair
+        if not await self.refresh_token_service.revoke(payload["jti"]):
+            return None
+        user = await self.user_service.get(payload.get("uid"))
+        if user is None or not user.is_active:
+            return None
+        return await self.get_token_data(user)
+
+    async def revoke_refresh_token(self, refresh_token: str) -> bool:
+        """
+        Revoke a refresh token, on logout.
         
-        await refresh_tokens_collection.insert_one(token_doc)
-        return token_doc["_id"]
+        Args:
+            refresh_token: The encoded refresh token
+            
+        Returns:
+            True if the token was revoked, False if it is invalid
+        """
+        try:
+            payload = decode_token(refresh_token)
+        except JWTError:
+            return False
+        if payload.get("type") != "refresh":
+            return False
+        return await self.refresh_token_service.revoke(payload["jti"])
 
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """
         Get a password hash.
         
@@ -121,4 +147,4 @@ class AuthService:
         Returns:
             The hashed password
         """
-        return hash_password(password) 
\ No newline at end of file
+        return await hash_password_async(password)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import hashlib
+from datetime import datetime, UTC
+from typing import Optional
+
+from app.business.auth.entities import RefreshToken
+from app.business.auth.model import RefreshTokenCreate, RefreshTokenUpdate
+from app.business.common.services.base import BaseService
+from app.core.config import settings
+from app.core.data.unit_of_work import after_commit
+
+REVOKED_CACHE_PREFIX = "refresh_token:revoked:"
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+class RefreshTokenService(BaseService[RefreshToken, RefreshTokenCreate, RefreshTokenUpdate]):
+    """
+    Service for refresh token storage and revocation.
+    Tokens are looked up by their unique jti, only a digest of the token is stored.
+    Expired tokens are purged by the database, a TTL index on Mongo and the expiry job on PostgreSQL.
+    """
+    model = RefreshToken
+
+    async def store(self, user_id: str, jti: str, token: str, valid_until: datetime) -> None:
+        """
+        Store a newly issued refresh token.
+
+        Args:
+            user_id: The ID of the user the token was issued to
+            jti: The jti claim of the token
+            token: The encoded refresh token
+            valid_until: The expiry of the token
+        """
+        await self.repository.insert_one(
+            RefreshToken(user_id=user_id, jti=jti, token=_digest(token), valid_until=valid_until),
+            return_document=False
+        )
+
+    async def get_by_jti(self, jti: str) -> Optional[RefreshToken]:
+        """
+        Get a refresh token by jti.
+
+        Args:
+            jti: The jti claim of the token
+
+        Returns:
+            The refresh token if found, None otherwise
+        """
+        return await self.repository.find_one({"jti": jti})
+
+    async def is_revoked(self, jti: str, token: str) -> bool:
+        """
+        Check whether a refresh token may no longer be used.
+        Revoked jtis are remembered in the cache, so replays of a revoked token skip the database.
+
+        Args:
+            jti: The jti claim of the token
+            token: The encoded refresh token
+
+        Returns:
+            True if the token is unknown, revoked, expired or does not match the stored digest
+        """
+        if await self.cache.get(f"{REVOKED_CACHE_PREFIX}{jti}"):
+            return True
+        stored = await self.get_by_jti(jti)
+        if stored is not None and stored.is_active and stored.token == _digest(token):
+            # Mongo returns naive UTC datetimes
+            valid_until = stored.valid_until if stored.valid_until.tzinfo else stored.valid_until.replace(tzinfo=UTC)
+            if valid_until > datetime.now(UTC):
+                return False
+        await self.cache.set(f"{REVOKED_CACHE_PREFIX}{jti}", True)
+        return True
+
+    async def revoke(self, jti: str) -> bool:
+        """
+        Revoke a refresh token with a single conditional update.
+        Only one of several concurrent calls flips the token from active, so only that caller may rotate it.
+
+        Args:
+            jti: The jti claim of the token
+
+        Returns:
+            True if this call revoked an active token, False if it was unknown or already revoked
+        """
+        revoked = await self.repository.update_many({"jti": jti, "is_active": True}, RefreshTokenUpdate(is_active=False))
+        await after_commit(lambda: self.cache.set(f"{REVOKED_CACHE_PREFIX}{jti}", True, ttl=settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400))
+        return revoked == 1
+
+    async def revoke_all_for_user(self, user_id: str) -> int:
+        """
+        Revoke every active refresh token of a user, e.g. after a password change.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            Number of revoked tokens
+        """
+        return await self.repository.update_many({"user_id": user_id, "is_active": True}, RefreshTokenUpdate(is_active=False))
@@ -2,13 +2,18 @@ from fastapi import APIRouter, Depends
 
 from app.core.data.base_db import BaseDatabaseProvider
 from app.core.data.db_factory import DBFactory
+from app.core.cache import BaseCacheProvider, CacheFactory
 from app.core.config import settings
+from app.core.utils.password import PasswordHashPool
 from app.core.logging import logger
 
 router = APIRouter()
 
 def get_db_provider() -> BaseDatabaseProvider:
-    return DBFactory.get_provider()
+    return DBFactory().get_provider()
+
+def get_cache_provider() -> BaseCacheProvider:
+    return CacheFactory().get_provider()
 
 @router.get("/", tags=["Health"])
 async def health_check():
@@ -32,7 +37,8 @@ async def db_health_check(db_provider: BaseDatabaseProvider = Depends(get_db_pro
         return {
             "status": "healthy",
             "data": "connected",
-            "database_name": settings.DATABASE_NAME
+            "database_name": settings.DATABASE_NAME,
+            "pool": await db_provider.get_pool_stats()
         }
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
@@ -40,4 +46,34 @@ async def db_health_check(db_provider: BaseDatabaseProvider = Depends(get_db_pro
             "status": "unhealthy",
             "data": "disconnected",
             "error": str(e)
-        } 
\ No newline at end of file
+        } 
+
+@router.get("/cache", tags=["Health"])
+async def cache_health_check(cache_provider: BaseCacheProvider = Depends(get_cache_provider)):
+    """
+    Health check endpoint to verify the cache and report its hit ratio.
+    """
+    try:
+        return {
+            "status": "healthy",
+            "cache_provider": settings.CACHE_PROVIDER,
+            "stats": await cache_provider.get_stats()
+        }
+    except Exception as e:
+        logger.error(f"Cache health check failed: {str(e)}")
+        return {
+            "status": "unhealthy",
+            "error": str(e)
+        }
+
+
+@router.get("/password-hasher", tags=["Health"])
+async def password_hasher_health_check():
+    """
+    Health check endpoint reporting the password hash pool queue depth.
+    """
+    stats = PasswordHashPool().get_stats()
+    return {
+        "status": "degraded" if stats["queue_depth"] else "healthy",
+        "stats": stats
+    }
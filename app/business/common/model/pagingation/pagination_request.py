@@ -1,4 +1,4 @@
-from typing import Optional, Dict, List
+from typing import Literal, Optional, Dict, List
 from pydantic import BaseModel
 
 class PaginationRequest(BaseModel):
@@ -8,4 +8,6 @@ class PaginationRequest(BaseModel):
     search: Optional[Dict[str, str]] = None
     sort: Optional[Dict[str, str]] = None
     next: Optional[str] = None
-    previous: Optional[str] = None
\ No newline at end of file
+    previous: Optional[str] = None
+    # "estimated" reads the total from collection statistics when no filter is applied
+    count_mode: Literal["exact", "estimated"] = "exact"
@@ -1,10 +1,13 @@
-from typing import TypeVar, List
+from typing import Generic, List, Optional, TypeVar
 from pydantic import BaseModel
-from app.core.data.model_type import ModelType
 
-class PaginationResponse(BaseModel):
+DataType = TypeVar("DataType")
+
+class PaginationResponse(BaseModel, Generic[DataType]):
     total: int
     total_pages: int
-    data: List[ModelType]
+    data: List[DataType]
     has_previous: bool
     has_next: bool
+    next: Optional[str] = None
+    previous: Optional[str] = None
@@ -1,8 +1,10 @@
-from typing import Generic, Optional, List, Type
+from typing import AsyncIterator, Generic, Optional, List, Type
 
 from app.core.data.model_type import ModelType, CreateSchemaType, UpdateSchemaType
 from app.core.data.base_repository import BaseRepository
 from app.core.data.repository_factory import RepositoryFactory
+from app.core.cache import CacheFactory
+from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
 from app.core.logging import logger
 
 
@@ -10,12 +12,15 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Base service class that provides common CRUD operations.
     """
+    model: Type[ModelType] = None
+
     def __init__(self):
         if self.model is None:
             raise ValueError("Service must define model, or provide a repository instance")
-        self.repository = RepositoryFactory.get_repository(
-            model=ModelType,
+        self.repository = RepositoryFactory().get_repository(
+            model=self.model,
         )
+        self.cache = CacheFactory().get_provider()
         self.logger = logger
 
     async def create(self, obj_in: CreateSchemaType) -> ModelType:
@@ -29,7 +34,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             The created object
         """
         try:
-            return await self.repository.create(obj_in)
+            return await self.repository.insert_one(obj_in)
         except Exception as e:
             self.logger.error(f"Error in service create operation: {str(e)}")
             raise
@@ -45,7 +50,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             The object if found, None otherwise
         """
         try:
-            return await self.repository.get(id)
+            return await self.repository.find_by_id(id)
         except Exception as e:
             self.logger.error(f"Error in service get operation: {str(e)}")
             raise
@@ -54,7 +59,8 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self,
         skip: int = 0,
         limit: int = 10,
-        filter_dict: dict = None
+        filter_dict: dict = None,
+        fields: Optional[List[str]] = None
     ) -> List[ModelType]:
         """
         List objects with pagination and filtering.
@@ -63,16 +69,52 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             skip: Number of objects to skip
             limit: Maximum number of objects to return
             filter_dict: Dictionary of filters to apply
+            fields: Fields to load, None to load every field
             
         Returns:
             List of objects
         """
         try:
-            return await self.repository.list(skip=skip, limit=limit, filter_dict=filter_dict)
+            return await self.repository.list(skip=skip, limit=limit, filter_dict=filter_dict, fields=fields)
         except Exception as e:
             self.logger.error(f"Error in service list operation: {str(e)}")
             raise
 
+    async def find_paging(self, request: PaginationRequest, fields: Optional[List[str]] = None) -> PaginationResponse:
+        """
+        Get a page of objects, by page number or by next/previous cursor.
+        
+        Args:
+            request: The pagination request
+            fields: Fields to load, None to load every field
+            
+        Returns:
+            The page with its totals and cursors
+        """
+        try:
+            return await self.repository.find_paging(request, fields)
+        except Exception as e:
+            self.logger.error(f"Error in service paging operation: {str(e)}")
+            raise
+
+    async def iter_many(self, filter_dict: dict, batch_size: Optional[int] = None) -> AsyncIterator[List[ModelType]]:
+        """
+        Iterate over every object matching the filter in batches, for exports and background jobs.
+        
+        Args:
+            filter_dict: Dictionary of filters to apply
+            batch_size: Number of objects per batch
+            
+        Returns:
+            Async iterator of batches of objects
+        """
+        try:
+            async for batch in self.repository.iter_many(filter_dict, batch_size):
+                yield batch
+        except Exception as e:
+            self.logger.error(f"Error in service iterate operation: {str(e)}")
+            raise
+
     async def update(
         self,
         id: str,
@@ -89,7 +131,8 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             The updated object if found, None otherwise
         """
         try:
-            return await self.repository.update(id, obj_in)
+            # Only the fields that were set are written, the updated object comes back from the same statement
+            return await self.repository.update_one_by_id(id, obj_in)
         except Exception as e:
             self.logger.error(f"Error in service update operation: {str(e)}")
             raise
@@ -105,11 +148,44 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             True if the object was deleted, False otherwise
         """
         try:
-            return await self.repository.delete(id)
+            return await self.repository.delete_one(id)
         except Exception as e:
             self.logger.error(f"Error in service delete operation: {str(e)}")
             raise
 
+    async def update_many(self, filter_dict: dict, obj_in: UpdateSchemaType) -> int:
+        """
+        Update every object matching the filter in one statement.
+        
+        Args:
+            filter_dict: Dictionary of filters to apply
+            obj_in: The data to update the objects with
+            
+        Returns:
+            Number of updated objects
+        """
+        try:
+            return await self.repository.update_many(filter_dict, obj_in)
+        except Exception as e:
+            self.logger.error(f"Error in service update many operation: {str(e)}")
+            raise
+
+    async def delete_many(self, filter_dict: dict) -> int:
+        """
+        Delete every object matching the filter in one statement.
+        
+        Args:
+            filter_dict: Dictionary of filters to apply
+            
+        Returns:
+            Number of deleted objects
+        """
+        try:
+            return await self.repository.delete_many(filter_dict)
+        except Exception as e:
+            self.logger.error(f"Error in service delete many operation: {str(e)}")
+            raise
+
     async def count(self, filter_dict: dict = None) -> int:
         """
         Count objects with optional filtering.
@@ -1,13 +1,17 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from app.business.menu.schema.menu import Menu
 from app.business.menu.services.menu_service import MenuService
-from app.business.menu.model import MenuCreate, MenuUpdate, MenuViewModel
+from app.business.menu.model import MenuCreate, MenuUpdate, MenuViewModel, MenuTreeViewModel
 from app.business.account.service.role_service import RoleService
 from app.core.container import Container
+from app.core.utils.etag import is_not_modified, make_etag, not_modified_response, set_cache_headers
 
 router = APIRouter()
 
+# Clients keep the menus but revalidate them on every navigation, an unchanged tree costs a 304
+MENU_CACHE_CONTROL = "private, no-cache"
+
 def get_menu_service() -> MenuService:
     """
     Get the menu service instance.
@@ -50,11 +54,17 @@ async def list_menus(
 
 @router.get("/root", response_model=List[MenuViewModel])
 async def get_root_menus(
+    request: Request,
+    response: Response,
     menu_service: MenuService = Depends(get_menu_service)
 ) -> List[MenuViewModel]:
     """
     Get all root menu items (items without a parent).
     """
+    etag = make_etag("menus-root", await menu_service.get_tree_version())
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, MENU_CACHE_CONTROL)
+    set_cache_headers(response, etag, MENU_CACHE_CONTROL)
     return await menu_service.get_root_menus()
 
 @router.get("/{menu_id}", response_model=MenuViewModel)
@@ -117,14 +127,16 @@ async def delete_menu(
             detail="Menu item not found"
         )
 
-@router.get("/role/{role_id}", response_model=List[MenuViewModel])
+@router.get("/role/{role_id}", response_model=List[MenuTreeViewModel])
 async def get_menus_by_role(
     role_id: str,
+    request: Request,
+    response: Response,
     menu_service: MenuService = Depends(get_menu_service),
     role_service: RoleService = Depends(get_role_service)
-) -> List[MenuViewModel]:
+) -> List[MenuTreeViewModel]:
     """
-    Get all menu items accessible by a specific role.
+    Get the nested tree of menu items accessible by a specific role.
     """
     # Check if role exists
     if not await role_service.get(role_id):
@@ -133,4 +145,44 @@ async def get_menus_by_role(
             detail="Role not found"
         )
 
+    etag = make_etag("menus-role", role_id, await menu_service.get_tree_version())
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, MENU_CACHE_CONTROL)
+    set_cache_headers(response, etag, MENU_CACHE_CONTROL)
     return await menu_service.get_menus_by_role(role_id)
+
+@router.put("/{menu_id}/roles/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def add_menu_role(
+    menu_id: str,
+    role_id: str,
+    menu_service: MenuService = Depends(get_menu_service),
+    role_service: RoleService = Depends(get_role_service)
+) -> None:
+    """
+    Give a role access to a menu item.
+    """
+    if not await menu_service.get(menu_id) or not await role_service.get(role_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Menu item or role not found"
+        )
+    await menu_service.add_role(menu_id, role_id)
+
+@router.delete("/{menu_id}/roles/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_menu_role(
+    menu_id: str,
+    role_id: str,
+    menu_service: MenuService = Depends(get_menu_service)
+) -> None:
+    """
+    Revoke a role's access to a menu item.
+    """
+    try:
+        removed = await menu_service.remove_role(menu_id, role_id)
+    except ValueError:
+        removed = False
+    if not removed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Menu role link not found"
+        )
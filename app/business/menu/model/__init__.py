@@ -1 +1 @@
-from .menu_viewmodel import MenuCreate, MenuUpdate, MenuViewModel
\ No newline at end of file
+from .menu_viewmodel import MenuCreate, MenuUpdate, MenuViewModel, MenuTreeViewModel
\ No newline at end of file
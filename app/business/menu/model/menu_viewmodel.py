@@ -13,6 +13,22 @@ class MenuViewModel(BaseModel):
     component: Optional[str] = Field(..., description="The component of the menu")
     isActive: bool = Field(..., description="Whether the menu is active")
 
+class MenuTreeViewModel(BaseModel):
+    """
+    Menu tree node view model.
+    """
+    id: str = Field(..., description="The id of the menu")
+    key: str = Field(..., description="The key of the menu")
+    name: Optional[str] = Field(None, description="The name of the menu")
+    path: str = Field(..., description="The path of the menu")
+    icon: Optional[str] = Field(None, description="The icon of the menu")
+    redirect: Optional[str] = Field(None, description="The redirect path of the menu")
+    sortOrder: Optional[int] = Field(None, description="The position of the menu among its siblings")
+    parentId: Optional[str] = Field(None, description="The id of the parent menu")
+    hideInMenu: Optional[bool] = Field(None, description="Whether the menu is hidden")
+    hideChildrenInMenu: Optional[bool] = Field(None, description="Whether the children of the menu are hidden")
+    children: List["MenuTreeViewModel"] = Field(default_factory=list, description="The child menus")
+
 class MenuCreate(BaseModel):
     """
     Menu creation request model.
@@ -78,3 +94,4 @@ class MenuUpdate(BaseModel):
 # This is needed for the self-referencing type hint to work
 MenuCreate.model_rebuild()
 MenuUpdate.model_rebuild()
+MenuTreeViewModel.model_rebuild()
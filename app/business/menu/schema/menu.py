@@ -4,6 +4,7 @@ from app.business.common.schema.base import BaseModel
 from sqlmodel import Field, Relationship
 
 from app.business.menu.schema.menu_role import MenuRole
+from app.core.data.indexes import IndexSpec, register_indexes
 
 class Menu(BaseModel, table=True):
     """
@@ -34,3 +35,11 @@ class Menu(BaseModel, table=True):
                 "isActive": True
             }
         }
+
+# MenuService looks menus up by path and parentId, the seeder by key
+register_indexes(
+    Menu,
+    IndexSpec(("key",)),
+    IndexSpec(("path",)),
+    IndexSpec(("parentId",)),
+)
@@ -1,6 +1,7 @@
 import uuid
 from sqlmodel import Field
 from app.business.common.schema.base import BaseModel
+from app.core.data.indexes import IndexSpec, register_indexes
 
 class MenuRole(BaseModel, table=True):
     """
@@ -16,4 +17,10 @@ class MenuRole(BaseModel, table=True):
                 "menu_id": "1",
                 "role_id": "1"
             }
-        }
\ No newline at end of file
+        }
+
+# The base id is part of the primary key, the unique pair lets MenuService.add_role upsert with ON CONFLICT
+register_indexes(
+    MenuRole,
+    IndexSpec(("menu_id", "role_id"), unique=True),
+)
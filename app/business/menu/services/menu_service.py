@@ -1,7 +1,11 @@
-from app.business.menu.model.menu_viewmodel import MenuCreate, MenuUpdate, MenuViewModel
+from app.business.menu.model.menu_viewmodel import MenuCreate, MenuUpdate, MenuViewModel, MenuTreeViewModel
 from app.business.common.services.base import BaseService
 from app.business.menu.schema.menu import Menu
-from typing import List
+from app.business.menu.schema.menu_role import MenuRole
+from app.business.menu.services.menu_tree_index import MenuTreeIndex
+from app.core.data.ids import to_db_id
+from app.core.data.repository_factory import RepositoryFactory
+from typing import List, Optional
 
 
 class MenuService(BaseService[Menu, MenuCreate, MenuUpdate]):
@@ -12,7 +16,25 @@ class MenuService(BaseService[Menu, MenuCreate, MenuUpdate]):
     
     def __init__(self):
         super().__init__()
-        self.permission_service = None
+        self.menu_role_repository = RepositoryFactory().get_repository(model=MenuRole)
+        self.menu_tree = MenuTreeIndex()
+
+    async def create(self, obj_in: MenuCreate) -> Menu:
+        menu = await super().create(obj_in)
+        await self.menu_tree.upsert_menu(menu)
+        return menu
+
+    async def update(self, id: str, obj_in: MenuUpdate) -> Optional[Menu]:
+        menu = await super().update(id, obj_in)
+        if menu is not None:
+            await self.menu_tree.upsert_menu(menu)
+        return menu
+
+    async def delete(self, id: str) -> bool:
+        deleted = await super().delete(id)
+        if deleted:
+            await self.menu_tree.remove_menu(id)
+        return deleted
 
     async def get_by_path(self, path: str) -> Menu | None:
         """
@@ -36,7 +58,7 @@ class MenuService(BaseService[Menu, MenuCreate, MenuUpdate]):
         Returns:
             List of menu items
         """
-        return await self.repository.list(filter_dict={"parentId": parent_id})
+        return await self.menu_tree.get_children(parent_id)
 
     async def get_root_menus(self) -> List[MenuViewModel]:
         """
@@ -45,34 +67,58 @@ class MenuService(BaseService[Menu, MenuCreate, MenuUpdate]):
         Returns:
             List of root menu items
         """
-        return await self.repository.list(filter_dict={"parentId": None})
+        return await self.menu_tree.get_children(None)
 
-    async def get_menus_by_role(self, role_id: str) -> List[MenuViewModel]:
+    async def get_menus_by_role(self, role_id: str) -> List[MenuTreeViewModel]:
         """
-        Get all menu items accessible by a specific role.
+        Get the nested tree of menu items accessible by a specific role.
 
         Args:
             role_id: The role ID
 
         Returns:
-            List of menu items accessible by the role
+            The root menu items accessible by the role, with their accessible children
         """
-        if not self.permission_service:
-            raise ValueError("Permission service not initialized")
+        return await self.menu_tree.get_role_tree(role_id)
 
-        # Get all permissions for the role
-        permissions = await self.permission_service.get_by_role(role_id)
+    async def get_tree_version(self) -> str:
+        """
+        Get the version of the menu tree, for ETags of the menu endpoints.
+
+        Returns:
+            The version, it changes on every menu or menu-role write
+        """
+        return await self.menu_tree.get_version()
+
+    async def add_role(self, menu_id: str, role_id: str) -> None:
+        """
+        Give a role access to a menu item, giving it again is a no-op.
+
+        Args:
+            menu_id: The menu item's ID
+            role_id: The role ID
+
+        Raises:
+            ValueError: If an ID is malformed
+        """
+        link = {"menu_id": to_db_id(menu_id), "role_id": to_db_id(role_id)}
+        await self.menu_role_repository.insert_if_not_exist(link, MenuRole(**link))
+        await self.menu_tree.add_role_link(menu_id, role_id)
 
-        # Extract function IDs from permissions
-        function_ids = [permission.function_id for permission in permissions if permission.is_active]
+    async def remove_role(self, menu_id: str, role_id: str) -> bool:
+        """
+        Revoke a role's access to a menu item.
 
-        if not function_ids:
-            return []
+        Args:
+            menu_id: The menu item's ID
+            role_id: The role ID
 
-        # Get all menus with the function IDs
-        menus = []
-        for function_id in function_ids:
-            if menu := await self.get(function_id):
-                menus.append(menu)
+        Returns:
+            True if the role had access, False otherwise
 
-        return menus
+        Raises:
+            ValueError: If an ID is malformed
+        """
+        deleted = await self.menu_role_repository.delete_many({"menu_id": to_db_id(menu_id), "role_id": to_db_id(role_id)})
+        await self.menu_tree.remove_role_link(menu_id, role_id)
+        return deleted > 0
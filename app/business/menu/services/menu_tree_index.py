@@ -0,0 +1,208 @@
+import asyncio
+import uuid
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.business.menu.model import MenuTreeViewModel
+from app.business.menu.schema.menu import Menu
+from app.business.menu.schema.menu_role import MenuRole
+from app.core.cache import CacheFactory
+from app.core.data.repository_factory import RepositoryFactory
+from app.core.data.unit_of_work import after_commit
+from app.core.logging import logger
+
+MENU_TREE_VERSION_KEY = "menu_tree:version"
+
+def _to_id(value) -> Optional[str]:
+    return str(value) if value not in (None, "") else None
+
+class MenuTreeIndex:
+    """
+    Every menu held in memory by id and by parent, with the nested tree of each role built on first use.
+    Menu and menu-role writes patch the index and drop only the trees of the roles they touch.
+    Writes bump a version in the cache, workers holding another version reload on their next read.
+    Patches and version bumps wait for the write's unit of work to commit, so a rollback never reaches the index.
+    """
+    _instance = None
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__lock = asyncio.Lock()
+            cls._instance.__reset()
+        return cls._instance
+
+    def __reset(self) -> None:
+        self.version: Optional[str] = None
+        self.menus: Dict[str, Menu] = {}
+        self.children: Dict[Optional[str], List[str]] = {}
+        self.menu_roles: Dict[str, Set[str]] = {}
+        self.role_trees: Dict[str, List[MenuTreeViewModel]] = {}
+
+    async def __load(self) -> None:
+        menus = await RepositoryFactory().get_repository(Menu).find_many({})
+        links = await RepositoryFactory().get_repository(MenuRole).find_many({})
+        self.__reset()
+        for menu in menus:
+            menu_id = _to_id(menu.id)
+            self.menus[menu_id] = menu
+            # PostgreSQL loads the role links with the menu, the link table covers the other providers
+            self.menu_roles[menu_id] = {_to_id(role.id) for role in (getattr(menu, "roles", None) or [])}
+        for link in links:
+            self.menu_roles.setdefault(_to_id(link.menu_id), set()).add(_to_id(link.role_id))
+        for menu_id, menu in self.menus.items():
+            self.children.setdefault(_to_id(menu.parentId), []).append(menu_id)
+        for parent_id in self.children:
+            self.__sort_children(parent_id)
+        logger.info(f"Loaded menu tree index with {len(self.menus)} menus and {sum(len(roles) for roles in self.menu_roles.values())} role links")
+
+    async def __ensure_loaded(self) -> None:
+        cache = CacheFactory().get_provider()
+        shared_version = await cache.get(MENU_TREE_VERSION_KEY)
+        if self.version is not None and shared_version in (None, self.version):
+            return
+        async with self.__lock:
+            # Re-read the version, a reader holding the lock before this one may have loaded and published it
+            shared_version = await cache.get(MENU_TREE_VERSION_KEY)
+            if self.version is not None and shared_version in (None, self.version):
+                return
+            await self.__load()
+            self.version = shared_version or uuid.uuid4().hex
+            if shared_version is None:
+                await cache.set(MENU_TREE_VERSION_KEY, self.version, ttl=0)
+
+    async def __publish(self) -> None:
+        self.version = uuid.uuid4().hex
+        await CacheFactory().get_provider().set(MENU_TREE_VERSION_KEY, self.version, ttl=0)
+
+    def __sort_children(self, parent_id: Optional[str]) -> None:
+        self.children[parent_id].sort(key=lambda menu_id: (self.menus[menu_id].sortOrder is None, self.menus[menu_id].sortOrder or 0, self.menus[menu_id].name or ""))
+
+    def __drop_role_trees(self, role_ids: Iterable[str]) -> None:
+        for role_id in role_ids:
+            self.role_trees.pop(role_id, None)
+
+    def __build_tree(self, role_id: str, parent_id: Optional[str]) -> List[MenuTreeViewModel]:
+        nodes = []
+        for menu_id in self.children.get(parent_id, []):
+            menu = self.menus[menu_id]
+            # A menu hidden from the role hides its whole subtree
+            if not menu.isActive or role_id not in self.menu_roles.get(menu_id, ()):
+                continue
+            nodes.append(MenuTreeViewModel(
+                id=menu_id,
+                key=menu.key,
+                name=menu.name,
+                path=menu.path,
+                icon=menu.icon,
+                redirect=menu.redirect,
+                sortOrder=menu.sortOrder,
+                parentId=_to_id(menu.parentId),
+                hideInMenu=menu.hideInMenu,
+                hideChildrenInMenu=menu.hideChildrenInMenu,
+                children=self.__build_tree(role_id, menu_id),
+            ))
+        return nodes
+
+    async def get_version(self) -> str:
+        """
+        Get the version of the index, it changes on every menu or menu-role write.
+        """
+        await self.__ensure_loaded()
+        return self.version
+
+    async def get_role_tree(self, role_id: str) -> List[MenuTreeViewModel]:
+        """
+        Get the nested menu tree visible to a role.
+
+        Args:
+            role_id: The role ID
+
+        Returns:
+            The root menus of the role with their children, ordered by sortOrder
+        """
+        await self.__ensure_loaded()
+        role_id = _to_id(role_id)
+        if role_id not in self.role_trees:
+            self.role_trees[role_id] = self.__build_tree(role_id, None)
+        return self.role_trees[role_id]
+
+    async def get_children(self, parent_id: Optional[str]) -> List[Menu]:
+        """
+        Get the menus under a parent, ordered by sortOrder.
+
+        Args:
+            parent_id: The parent menu ID, None for the root menus
+
+        Returns:
+            List of menus
+        """
+        await self.__ensure_loaded()
+        return [self.menus[menu_id] for menu_id in self.children.get(_to_id(parent_id), [])]
+
+    async def upsert_menu(self, menu: Menu) -> None:
+        """
+        Patch a created or updated menu into the index once the write commits.
+        """
+        await after_commit(lambda: self.__upsert_menu(menu))
+
+    async def __upsert_menu(self, menu: Menu) -> None:
+        await self.__ensure_loaded()
+        menu_id = _to_id(menu.id)
+        previous = self.menus.get(menu_id)
+        if previous is not None and menu_id in self.children.get(_to_id(previous.parentId), []):
+            self.children[_to_id(previous.parentId)].remove(menu_id)
+        self.menus[menu_id] = menu
+        self.children.setdefault(_to_id(menu.parentId), []).append(menu_id)
+        self.__sort_children(_to_id(menu.parentId))
+        self.__drop_role_trees(self.menu_roles.setdefault(menu_id, set()))
+        await self.__publish()
+
+    async def remove_menu(self, menu_id: str) -> None:
+        """
+        Remove a deleted menu from the index once the write commits.
+        """
+        await after_commit(lambda: self.__remove_menu(menu_id))
+
+    async def __remove_menu(self, menu_id: str) -> None:
+        await self.__ensure_loaded()
+        menu_id = _to_id(menu_id)
+        menu = self.menus.pop(menu_id, None)
+        if menu is None:
+            return
+        if menu_id in self.children.get(_to_id(menu.parentId), []):
+            self.children[_to_id(menu.parentId)].remove(menu_id)
+        self.__drop_role_trees(self.menu_roles.pop(menu_id, set()))
+        await self.__publish()
+
+    async def add_role_link(self, menu_id: str, role_id: str) -> None:
+        """
+        Add a menu-role link to the index once the write commits.
+        """
+        await after_commit(lambda: self.__add_role_link(menu_id, role_id))
+
+    async def __add_role_link(self, menu_id: str, role_id: str) -> None:
+        await self.__ensure_loaded()
+        self.menu_roles.setdefault(_to_id(menu_id), set()).add(_to_id(role_id))
+        self.__drop_role_trees([_to_id(role_id)])
+        await self.__publish()
+
+    async def remove_role_link(self, menu_id: str, role_id: str) -> None:
+        """
+        Remove a menu-role link from the index once the write commits.
+        """
+        await after_commit(lambda: self.__remove_role_link(menu_id, role_id))
+
+    async def __remove_role_link(self, menu_id: str, role_id: str) -> None:
+        await self.__ensure_loaded()
+        self.menu_roles.get(_to_id(menu_id), set()).discard(_to_id(role_id))
+        self.__drop_role_trees([_to_id(role_id)])
+        await self.__publish()
+
+    async def invalidate(self) -> None:
+        """
+        Drop the whole index once the current write commits, for writes that bypass MenuService such as seeding.
+        """
+        await after_commit(self.__invalidate)
+
+    async def __invalidate(self) -> None:
+        self.__reset()
+        await CacheFactory().get_provider().set(MENU_TREE_VERSION_KEY, uuid.uuid4().hex, ttl=0)
@@ -0,0 +1,23 @@
+from fastapi import Depends, HTTPException, status
+
+from app.business.auth.api.dependencies import get_current_user
+from app.business.auth.model import AuthTokenData
+from app.business.permission.services.permission_matrix import PermissionMatrixStore
+
+def require_permission(resource: str, action: str):
+    """
+    Build a dependency that rejects the request unless one of the caller's roles may perform the action on the resource.
+    The roles come from the access token and the check from the in-memory permission matrix, no database query is made.
+
+    Usage:
+        @router.delete("/{user_id}", dependencies=[Depends(require_permission("user", "delete"))])
+    """
+    async def check_permission(current_user: AuthTokenData = Depends(get_current_user)) -> AuthTokenData:
+        matrix = await PermissionMatrixStore().get_matrix()
+        if not matrix.can(current_user.role_ids, resource, action):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        return current_user
+    return check_permission
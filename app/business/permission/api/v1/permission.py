@@ -5,6 +5,7 @@ from app.business.menu.services.menu_service import MenuService
 from app.business.permission.model import PermissionCreate, PermissionUpdate, PermissionViewModel
 from app.business.account.service.role_service import RoleService
 from app.core.container import Container
+from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
 from app.business.permission.schema.permission import Permission
 
 router = APIRouter()
@@ -71,6 +72,22 @@ async def list_permissions(
     """
     return await permission_service.list(skip=skip, limit=limit)
 
+@router.post("/paging", response_model=PaginationResponse[PermissionViewModel])
+async def page_permissions(
+    request: PaginationRequest,
+    permission_service: PermissionService = Depends(get_permission_service)
+) -> PaginationResponse:
+    """
+    Page through permissions. Pass the returned next/previous cursor to fetch the adjacent page.
+    """
+    try:
+        return await permission_service.find_paging(request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
 @router.get("/function/{function_id}", response_model=List[PermissionViewModel])
 async def get_permissions_by_function(
     function_id: str,
@@ -107,6 +124,18 @@ async def get_permissions_by_role(
     
     return await permission_service.get_by_role(role_id)
 
+@router.get("/check", response_model=bool)
+async def check_permission(
+    role_id: str,
+    resource: str,
+    action: str,
+    permission_service: PermissionService = Depends(get_permission_service)
+) -> bool:
+    """
+    Check whether a role may perform an action on a resource, answered from the in-memory permission matrix.
+    """
+    return await permission_service.can([role_id], resource, action)
+
 @router.get("/{permission_id}", response_model=PermissionViewModel)
 async def get_permission(
     permission_id: str,
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 import uuid
 from app.business.common.schema.base import BaseModel
 from sqlmodel import Field, Relationship
+from app.core.data.indexes import IndexSpec, register_indexes
 
 if TYPE_CHECKING:
     from app.business.account.schema.role import Role
@@ -22,3 +23,8 @@ class Permission(BaseModel, table=True):
     def __repr__(self):
         return f'<Permission {self.name}: {self.action} on {self.resource}>'
 
+register_indexes(
+    Permission,
+    IndexSpec(("name",)),
+    IndexSpec(("role_id",)),
+)
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.business.account.schema.role import Role
+from app.business.permission.schema.permission import Permission
+from app.core.cache import SnapshotStore
+from app.core.data.repository_factory import RepositoryFactory
+from app.core.logging import logger
+
+PERMISSION_MATRIX_VERSION_KEY = "permission_matrix:version"
+# A permission with this action grants every action on its resource
+WILDCARD_ACTION = "*"
+
+class PermissionMatrix:
+    """
+    Immutable snapshot of every role's permissions.
+    Each (resource, action) pair owns one bit, each role holds the bitset of the pairs it was granted.
+    """
+    __slots__ = ("version", "bits", "role_masks")
+
+    def __init__(self, version: int, bits: Dict[Tuple[str, str], int], role_masks: Dict[str, int]):
+        self.version = version
+        self.bits = bits
+        self.role_masks = role_masks
+
+    @classmethod
+    def build(cls, version: int, permissions: List[Permission], active_role_ids: Optional[Set[str]] = None) -> "PermissionMatrix":
+        """
+        Build a matrix from permission rows.
+
+        Args:
+            version: The version of the matrix
+            permissions: The permission rows
+            active_role_ids: Roles allowed in the matrix, None to allow every role
+
+        Returns:
+            The permission matrix
+        """
+        bits: Dict[Tuple[str, str], int] = {}
+        role_masks: Dict[str, int] = {}
+        for key in sorted({(permission.resource, permission.action) for permission in permissions}):
+            bits[key] = len(bits)
+        for permission in permissions:
+            role_id = str(permission.role_id)
+            if active_role_ids is not None and role_id not in active_role_ids:
+                continue
+            role_masks[role_id] = role_masks.get(role_id, 0) | (1 << bits[(permission.resource, permission.action)])
+        return cls(version, bits, role_masks)
+
+    def can(self, role_ids: Iterable[str], resource: str, action: str) -> bool:
+        """
+        Check whether any of the roles may perform an action on a resource.
+
+        Args:
+            role_ids: The role IDs
+            resource: The resource, e.g. 'user'
+            action: The action, e.g. 'read'
+
+        Returns:
+            True if one of the roles was granted the action or the wildcard action
+        """
+        mask = 0
+        for key in ((resource, action), (resource, WILDCARD_ACTION)):
+            bit = self.bits.get(key)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask != 0 and any(self.role_masks.get(str(role_id), 0) & mask for role_id in role_ids)
+
+class PermissionMatrixStore(SnapshotStore[PermissionMatrix]):
+    """
+    Holds the current PermissionMatrix, rebuilt after permission or role writes.
+    """
+    version_key = PERMISSION_MATRIX_VERSION_KEY
+
+    async def build(self, version: int) -> PermissionMatrix:
+        permissions = await RepositoryFactory().get_repository(Permission).find_many({})
+        roles = await RepositoryFactory().get_repository(Role).find_many({}, fields=["is_active"])
+        matrix = PermissionMatrix.build(version, permissions, {str(role.id) for role in roles if role.is_active})
+        logger.info(f"Built permission matrix version {version} with {len(matrix.bits)} permissions for {len(matrix.role_masks)} roles")
+        return matrix
+
+    async def get_matrix(self) -> PermissionMatrix:
+        return await self.get()
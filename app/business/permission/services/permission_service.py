@@ -1,13 +1,60 @@
 from app.business.common.services.base import BaseService
 from app.business.permission.schema.permission import Permission
 from app.business.permission.model import PermissionCreate, PermissionUpdate, PermissionViewModel
-from typing import List, Optional
+from app.business.permission.services.permission_matrix import PermissionMatrix, PermissionMatrixStore
+from typing import Iterable, List, Optional
 
 
 class PermissionService(BaseService[Permission, PermissionCreate, PermissionUpdate]):
     """
     Service for permission operations.
     """
+    model = Permission
+
+    def __init__(self):
+        super().__init__()
+        self.permission_matrix = PermissionMatrixStore()
+
+    async def create(self, obj_in: PermissionCreate) -> Permission:
+        permission = await super().create(obj_in)
+        await self.permission_matrix.reload()
+        return permission
+
+    async def update(self, id: str, obj_in: PermissionUpdate) -> Optional[Permission]:
+        permission = await super().update(id, obj_in)
+        if permission is not None:
+            await self.permission_matrix.reload()
+        return permission
+
+    async def delete(self, id: str) -> bool:
+        deleted = await super().delete(id)
+        if deleted:
+            await self.permission_matrix.reload()
+        return deleted
+
+    async def get_matrix(self) -> PermissionMatrix:
+        """
+        Get the current permission matrix.
+        
+        Returns:
+            The permission matrix
+        """
+        return await self.permission_matrix.get_matrix()
+
+    async def can(self, role_ids: Iterable[str], resource: str, action: str) -> bool:
+        """
+        Check whether any of the roles may perform an action on a resource, without a database query.
+        
+        Args:
+            role_ids: The role IDs
+            resource: The resource, e.g. 'user'
+            action: The action, e.g. 'read'
+            
+        Returns:
+            True if the action is allowed, False otherwise
+        """
+        return (await self.permission_matrix.get_matrix()).can(role_ids, resource, action)
+
     async def get_by_function_and_role(self, function_id: str, role_id: str) -> Optional[PermissionViewModel]:
         """
         Get a permission by function ID and role ID.
@@ -2,9 +2,11 @@ import json
 from typing import List
 
 from app.business.menu.schema.menu import Menu
+from app.business.menu.services.menu_tree_index import MenuTreeIndex
 from app.business.account.schema.role import Role
 from app.business.seed.model import ModelSeed
 from app.business.setting.schema import Setting
+from app.business.setting.services.settings_snapshot import SettingsSnapshotStore
 from app.business.account.schema.user import User
 from app.core.data.model_type import ModelType
 from app.core.logging import logger 
@@ -51,12 +53,14 @@ class SeederService:
                     list_menu.append(menu)
 
                 await menu_repo.insert_many(list_menu)
+                await MenuTreeIndex().invalidate()
 
             # Create setting
             if(await setting_repo.find_one({"key": "DASHBOARD_ADMIN"}) is None):
                 list_setting_data = self.read_file("./seed/4.settings/setting.json")
                 list_setting = [Setting(**item) for item in list_setting_data]
                 await setting_repo.insert_many(list_setting)
+                await SettingsSnapshotStore().reload()
 
         except Exception as e:
             logger.error(e)
@@ -76,8 +80,12 @@ class SeederService:
                 # Cast each item to model type
                 list_object_data = [model.model(**item) for item in object_data]
                 repo = RepositoryFactory().get_repository(model=model.model)
-                print(list_object_data)
-                await repo.insert_many(list_object_data)
+                result = await repo.bulk_write(list_object_data)
+                logger.info(f"Seeded {result.inserted_count} {model.model.__name__} from {model.path}")
+                if model.model is Menu:
+                    await MenuTreeIndex().invalidate()
+                elif model.model is Setting:
+                    await SettingsSnapshotStore().reload()
 
             return True
         except Exception as e:
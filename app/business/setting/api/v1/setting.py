@@ -1,12 +1,21 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from app.business.setting.services.setting_service import SettingService
 from app.business.setting.model import SettingCreate, SettingUpdate, SettingViewModel
 from app.business.setting.schema import Setting
 from app.core.container import Container
+from app.core.data.query_compiler import get_view_fields
+from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
+from app.core.utils.etag import is_not_modified, make_etag, not_modified_response, set_cache_headers
 
 router = APIRouter()
 
+# Public settings are the same for every client, shared caches may keep them for a minute
+PUBLIC_SETTINGS_CACHE_CONTROL = "public, max-age=60"
+
+# List endpoints only load the columns the view model returns
+SETTING_VIEW_FIELDS = get_view_fields(SettingViewModel, Setting)
+
 def get_setting_service() -> SettingService:
     """
     Get the setting service instance.
@@ -39,16 +48,39 @@ async def list_settings(
     """
     List settings with pagination.
     """
-    return await setting_service.list(skip=skip, limit=limit)
+    return await setting_service.list(skip=skip, limit=limit, fields=SETTING_VIEW_FIELDS)
+
+@router.post("/paging", response_model=PaginationResponse[SettingViewModel])
+async def page_settings(
+    request: PaginationRequest,
+    setting_service: SettingService = Depends(get_setting_service)
+) -> PaginationResponse:
+    """
+    Page through settings. Pass the returned next/previous cursor to fetch the adjacent page.
+    """
+    try:
+        return await setting_service.find_paging(request, fields=SETTING_VIEW_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/public", response_model=List[SettingViewModel])
 async def get_public_settings(
+    request: Request,
+    response: Response,
     setting_service: SettingService = Depends(get_setting_service)
 ) -> List[SettingViewModel]:
     """
     Get all public settings.
     """
-    return await setting_service.get_public_settings()
+    snapshot = await setting_service.get_snapshot()
+    etag = make_etag("settings-public", snapshot.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, PUBLIC_SETTINGS_CACHE_CONTROL)
+    set_cache_headers(response, etag, PUBLIC_SETTINGS_CACHE_CONTROL)
+    return list(snapshot.public)
 
 @router.get("/group/{group}", response_model=List[SettingViewModel])
 async def get_settings_by_group(
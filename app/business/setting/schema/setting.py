@@ -1,5 +1,7 @@
 from app.business.common.schema.base import BaseModel
+from sqlalchemy import false
 from sqlmodel import Field
+from app.core.data.indexes import IndexSpec, register_indexes
 
 class Setting(BaseModel, table=True):
     """
@@ -14,6 +16,8 @@ class Setting(BaseModel, table=True):
     value: str = Field(nullable=True)
     sorter: int = Field(nullable=True)
     hidden: bool = Field(nullable=False, default=False)
+    # The server default fills the rows of tables created before the column existed
+    public: bool = Field(nullable=False, default=False, sa_column_kwargs={"server_default": false()})
     description: str = Field(nullable=True, max_length=100)
     values: str = Field(nullable=True)
 
@@ -31,3 +35,12 @@ class Setting(BaseModel, table=True):
                 "description": "Primary theme color"
             }
         }
+
+# SettingService looks settings up by name, group and section, the seeder by key
+register_indexes(
+    Setting,
+    IndexSpec(("key",)),
+    IndexSpec(("name",)),
+    IndexSpec(("group", "section")),
+    IndexSpec(("section",)),
+)
@@ -1,6 +1,7 @@
 from app.business.common.services.base import BaseService
 from app.business.setting.schema import Setting
 from app.business.setting.model.setting_viewmodel import SettingCreate, SettingUpdate
+from app.business.setting.services.settings_snapshot import SettingsSnapshot, SettingsSnapshotStore
 from typing import List, Optional
 
 
@@ -8,6 +9,50 @@ class SettingService(BaseService[Setting, SettingCreate, SettingUpdate]):
     """
     Service for setting operations.
     """
+    model = Setting
+
+    def __init__(self):
+        super().__init__()
+        self.settings_snapshot = SettingsSnapshotStore()
+
+    async def create(self, obj_in: SettingCreate) -> Setting:
+        setting = await super().create(obj_in)
+        await self.settings_snapshot.reload()
+        return setting
+
+    async def update(self, id: str, obj_in: SettingUpdate) -> Optional[Setting]:
+        setting = await super().update(id, obj_in)
+        if setting is not None:
+            await self.settings_snapshot.reload()
+        return setting
+
+    async def delete(self, id: str) -> bool:
+        deleted = await super().delete(id)
+        if deleted:
+            await self.settings_snapshot.reload()
+        return deleted
+
+    async def get_snapshot(self) -> SettingsSnapshot:
+        """
+        Get the current settings snapshot.
+        
+        Returns:
+            The settings snapshot, its version changes on every setting write
+        """
+        return await self.settings_snapshot.get()
+
+    async def get_by_key(self, key: str) -> Optional[Setting]:
+        """
+        Get a setting by key.
+        
+        Args:
+            key: The setting's key
+            
+        Returns:
+            The setting if found, None otherwise
+        """
+        return (await self.get_snapshot()).by_key.get(key)
+
     async def get_by_name(self, name: str) -> Optional[Setting]:
         """
         Get a setting by name.
@@ -18,7 +63,7 @@ class SettingService(BaseService[Setting, SettingCreate, SettingUpdate]):
         Returns:
             The setting if found, None otherwise
         """
-        return await self.repository.find_one({"name": name})
+        return (await self.get_snapshot()).by_name.get(name)
     
     async def get_by_group(self, group: str) -> List[Setting]:
         """
@@ -30,7 +75,7 @@ class SettingService(BaseService[Setting, SettingCreate, SettingUpdate]):
         Returns:
             List of settings in the group
         """
-        return await self.repository.list(filter_dict={"group": group})
+        return list((await self.get_snapshot()).by_group.get(group, ()))
     
     async def get_by_section(self, section: str) -> List[Setting]:
         """
@@ -42,7 +87,7 @@ class SettingService(BaseService[Setting, SettingCreate, SettingUpdate]):
         Returns:
             List of settings in the section
         """
-        return await self.repository.list(filter_dict={"section": section})
+        return list((await self.get_snapshot()).by_section.get(section, ()))
     
     async def get_by_group_and_section(self, group: str, section: str) -> List[Setting]:
         """
@@ -55,7 +100,7 @@ class SettingService(BaseService[Setting, SettingCreate, SettingUpdate]):
         Returns:
             List of settings in the group and section
         """
-        return await self.repository.list(filter_dict={"group": group, "section": section})
+        return list((await self.get_snapshot()).by_group_section.get((group, section), ()))
     
     async def get_public_settings(self) -> List[Setting]:
         """
@@ -64,4 +109,4 @@ class SettingService(BaseService[Setting, SettingCreate, SettingUpdate]):
         Returns:
             List of public settings
         """
-        return await self.repository.list(filter_dict={"public": True})
\ No newline at end of file
+        return list((await self.get_snapshot()).public)
\ No newline at end of file
@@ -0,0 +1,45 @@
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from app.business.setting.schema import Setting
+from app.core.cache import SnapshotStore
+from app.core.data.repository_factory import RepositoryFactory
+from app.core.logging import logger
+
+SETTINGS_SNAPSHOT_VERSION_KEY = "settings_snapshot:version"
+
+def _group_by(settings: Tuple[Setting, ...], key) -> Mapping:
+    groups: Dict = {}
+    for setting in settings:
+        groups.setdefault(key(setting), []).append(setting)
+    return MappingProxyType({name: tuple(items) for name, items in groups.items()})
+
+class SettingsSnapshot:
+    """
+    Immutable view of the whole settings table, ordered by sorter and indexed by id, key, name, group, section and public flag.
+    The Setting instances are shared by every reader and must not be modified.
+    """
+    __slots__ = ("version", "settings", "by_id", "by_key", "by_name", "by_group", "by_section", "by_group_section", "public")
+
+    def __init__(self, version: int, settings: List[Setting]):
+        self.version = version
+        self.settings: Tuple[Setting, ...] = tuple(sorted(settings, key=lambda setting: (setting.sorter is None, setting.sorter or 0, setting.key)))
+        self.by_id: Mapping[str, Setting] = MappingProxyType({str(setting.id): setting for setting in self.settings})
+        self.by_key: Mapping[str, Setting] = MappingProxyType({setting.key: setting for setting in self.settings})
+        self.by_name: Mapping[str, Setting] = MappingProxyType({setting.name: setting for setting in self.settings})
+        self.by_group: Mapping[Optional[str], Tuple[Setting, ...]] = _group_by(self.settings, lambda setting: setting.group)
+        self.by_section: Mapping[Optional[str], Tuple[Setting, ...]] = _group_by(self.settings, lambda setting: setting.section)
+        self.by_group_section: Mapping[Tuple[Optional[str], Optional[str]], Tuple[Setting, ...]] = _group_by(self.settings, lambda setting: (setting.group, setting.section))
+        self.public: Tuple[Setting, ...] = tuple(setting for setting in self.settings if setting.public)
+
+class SettingsSnapshotStore(SnapshotStore[SettingsSnapshot]):
+    """
+    Holds the current SettingsSnapshot, reloaded after setting writes.
+    """
+    version_key = SETTINGS_SNAPSHOT_VERSION_KEY
+
+    async def build(self, version: int) -> SettingsSnapshot:
+        settings = await RepositoryFactory().get_repository(Setting).find_many({})
+        snapshot = SettingsSnapshot(version, settings)
+        logger.info(f"Loaded settings snapshot version {version} with {len(snapshot.settings)} settings")
+        return snapshot
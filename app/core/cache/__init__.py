@@ -0,0 +1,3 @@
+from .base_cache import BaseCacheProvider
+from .cache_factory import CacheFactory
+from .snapshot_store import SnapshotStore
\ No newline at end of file
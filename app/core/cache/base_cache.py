@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+class BaseCacheProvider(ABC):
+    @abstractmethod
+    async def get(self, key: str, default: Any = None) -> Any:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> int:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    async def get_stats(self) -> Dict[str, Any]:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def get_or_set(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[int] = None) -> Any:
+        """
+        Get a value, loading and caching it on a miss.
+
+        Args:
+            key: The cache key
+            loader: Coroutine function computing the value
+            ttl: Seconds the value stays cached, None for the provider default
+
+        Returns:
+            The cached or loaded value
+        """
+        missing = object()
+        value = await self.get(key, missing)
+        if value is missing:
+            value = await loader()
+            await self.set(key, value, ttl)
+        return value
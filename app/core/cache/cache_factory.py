@@ -0,0 +1,23 @@
+from app.core.cache.base_cache import BaseCacheProvider
+from app.core.config import settings
+
+class CacheFactory:
+    provider = None
+    _instance = None
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def get_provider(self) -> BaseCacheProvider:
+        if self.provider is None:
+            if settings.CACHE_PROVIDER.lower() == "memory":
+                from app.core.cache.memory_cache import MemoryCache
+                self.provider = MemoryCache()
+            elif settings.CACHE_PROVIDER.lower() == "redis":
+                # Imported here so the redis package is only needed when it is the provider
+                from app.core.cache.redis_cache import RedisCache
+                self.provider = RedisCache()
+            else:
+                raise NotImplementedError
+        return self.provider
@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.cache.base_cache import BaseCacheProvider
+from app.core.config import settings
+
+class MemoryCache(BaseCacheProvider):
+    """
+    In-process LRU cache with a TTL per key.
+    Values are stored by reference, callers must not mutate what they get back.
+    """
+    def __init__(self, max_entries: Optional[int] = None, default_ttl: Optional[int] = None):
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self.default_ttl = default_ttl if default_ttl is not None else settings.CACHE_DEFAULT_TTL
+        # key -> (value, expires_at), least recently used first
+        self.__entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.__entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self.__entries[key] = (value, time.monotonic() + ttl if ttl > 0 else None)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self.__entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        keys = [key for key in self.__entries if key.startswith(prefix)]
+        for key in keys:
+            del self.__entries[key]
+        return len(keys)
+
+    async def clear(self) -> None:
+        self.__entries.clear()
+
+    async def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "provider": "memory",
+            "entries": len(self.__entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,59 @@
+import pickle
+from typing import Any, Dict, Optional
+
+from redis.asyncio import Redis
+
+from app.core.cache.base_cache import BaseCacheProvider
+from app.core.config import settings
+
+class RedisCache(BaseCacheProvider):
+    """
+    Cache on a Redis-protocol server (Redis, Valkey, KeyDB or a local stand-in), shared by every worker.
+    Values are pickled, keys are namespaced with CACHE_KEY_PREFIX.
+    """
+    def __init__(self, url: Optional[str] = None, default_ttl: Optional[int] = None):
+        self.client: Redis = Redis.from_url(url or settings.CACHE_URL)
+        self.default_ttl = default_ttl if default_ttl is not None else settings.CACHE_DEFAULT_TTL
+        self.prefix = settings.CACHE_KEY_PREFIX
+        self.hits = 0
+        self.misses = 0
+
+    def __key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        raw = await self.client.get(self.__key(key))
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        await self.client.set(self.__key(key), pickle.dumps(value), ex=ttl if ttl > 0 else None)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.__key(key))
+
+    async def delete_prefix(self, prefix: str) -> int:
+        # SCAN walks the keyspace incrementally instead of blocking the server like KEYS
+        keys = [key async for key in self.client.scan_iter(match=f"{self.__key(prefix)}*", count=500)]
+        if not keys:
+            return 0
+        return await self.client.unlink(*keys)
+
+    async def clear(self) -> None:
+        await self.delete_prefix("")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "provider": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    async def close(self) -> None:
+        await self.client.aclose()
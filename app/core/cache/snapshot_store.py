@@ -0,0 +1,66 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Generic, Optional, TypeVar
+
+from app.core.cache.cache_factory import CacheFactory
+from app.core.data.unit_of_work import after_commit
+
+SnapshotType = TypeVar("SnapshotType")
+
+class SnapshotStore(ABC, Generic[SnapshotType]):
+    """
+    Holds an immutable snapshot built from the database and swaps it whole when the data changes.
+    Readers keep whichever snapshot they got, so they never see a half-built one.
+    The version is shared through the cache, workers holding another version rebuild on their next read.
+    Each subclass is a singleton and names its own version_key.
+    """
+    version_key: str = None
+    _instance = None
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.snapshot = None
+            cls._instance.version = None
+            cls._instance.__lock = asyncio.Lock()
+        return cls._instance
+
+    @abstractmethod
+    async def build(self, version: int) -> SnapshotType:
+        pass
+
+    async def get(self) -> SnapshotType:
+        """
+        Get the current snapshot, building it on first use or when another worker changed the data.
+        """
+        cache = CacheFactory().get_provider()
+        shared_version: Optional[int] = await cache.get(self.version_key)
+        snapshot = self.snapshot
+        if snapshot is not None and shared_version in (None, self.version):
+            return snapshot
+        async with self.__lock:
+            # Re-read the version, a reader holding the lock before this one may have built and published it
+            shared_version = await cache.get(self.version_key)
+            if self.snapshot is None or shared_version not in (None, self.version):
+                version = shared_version or time.time_ns()
+                self.snapshot = await self.build(version)
+                self.version = version
+                if shared_version is None:
+                    await cache.set(self.version_key, version, ttl=0)
+            return self.snapshot
+
+    async def reload(self) -> None:
+        """
+        Rebuild the snapshot under a new version once the current write commits.
+        Publishing earlier would let other workers rebuild from rows that are not committed yet,
+        and would keep the write in the snapshot if it rolled back.
+        """
+        await after_commit(self.__rebuild)
+
+    async def __rebuild(self) -> SnapshotType:
+        version = time.time_ns()
+        await CacheFactory().get_provider().set(self.version_key, version, ttl=0)
+        async with self.__lock:
+            self.snapshot = await self.build(version)
+            self.version = version
+            return self.snapshot
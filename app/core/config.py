@@ -25,14 +25,61 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
     MONGODB_MAX_CONNECTIONS: int = 100
     MONGODB_MIN_CONNECTIONS: int = 1
+    MONGODB_MAX_IDLE_TIME_MS: int = 300000
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 10000
+    # Comma-separated, in order of preference. zstd needs zstandard, snappy needs python-snappy
+    MONGODB_COMPRESSORS: str = "zstd,snappy"
+    MONGODB_READ_PREFERENCE: str = "primary"
+    # Read preference of find/list/count, writes and read-your-writes requests always use the primary
+    MONGODB_REPLICA_READ_PREFERENCE: str = "secondaryPreferred"
+
+    # PostgreSQL Settings
+    # Comma-separated read replica URLs, same form as DATABASE_URL
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_RETRY_SECONDS: int = 30
+    POSTGRESQL_ASYNC_DRIVER: str = "postgresql+asyncpg"
+    POSTGRESQL_POOL_SIZE: int = 5
+    POSTGRESQL_MAX_OVERFLOW: int = 10
+    POSTGRESQL_POOL_TIMEOUT: int = 30
+    POSTGRESQL_POOL_RECYCLE: int = 1800
+    POSTGRESQL_POOL_PRE_PING: bool = True
+
+    # Bulk Write Settings
+    # Keep batch size x columns under the 32767 bind parameters PostgreSQL accepts per statement
+    BULK_WRITE_BATCH_SIZE: int = 1000
+    # Rows fetched per round trip by iter_many
+    STREAM_BATCH_SIZE: int = 1000
+    # PostgreSQL expiry job, Mongo relies on TTL indexes
+    DATA_EXPIRY_INTERVAL_SECONDS: int = 300
+    DATA_EXPIRY_BATCH_SIZE: int = 1000
 
     # Cache Provider
+    # Memory keeps an LRU per process, Redis shares entries between workers
     CACHE_PROVIDER: str
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_DEFAULT_TTL: int = 300
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_KEY_PREFIX: str = "coreapp:"
+    # Models whose find_by_id/find_one are cached, as Model:ttl_seconds
+    CACHE_REPOSITORY_TTLS: str = "Setting:600,Role:600,Menu:600"
+    # Seconds a "not found" result stays cached
+    CACHE_NEGATIVE_TTL: int = 30
     # Security Settings
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ALGORITHM: str = "HS256"
+    # Decoded access tokens kept per process until they expire
+    TOKEN_CLAIMS_CACHE_SIZE: int = 10000
+    # bcrypt runs on its own thread pool, calls beyond MAX_PENDING running or queued hashes get a 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # bcrypt cost, calibrated at startup to the highest cost hashing within PASSWORD_HASH_TARGET_MS
+    PASSWORD_HASH_CALIBRATE: bool = True
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 10
+    PASSWORD_HASH_MAX_ROUNDS: int = 15
 
     # CORS Settings
     CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -8,6 +8,7 @@ from app.business.setting.services.setting_service import SettingService
 from app.business.common.services.file_reader.file_reader_service import FileReaderService
 from app.business.seed.services.seed_service import SeederService
 from app.business.auth.services.auth_service import AuthService
+from app.business.auth.services.refresh_token_service import RefreshTokenService
 from app.core.data.db_factory import DBFactory
 
 class Container(containers.DeclarativeContainer):
@@ -39,9 +40,13 @@ class Container(containers.DeclarativeContainer):
     file_reader_service = providers.Factory(
         FileReaderService
     )
+    refresh_token_service = providers.Factory(
+        RefreshTokenService
+    )
     auth_service = providers.Factory(
         AuthService,
-        user_service=user_service
+        user_service=user_service,
+        refresh_token_service=refresh_token_service
     )
     seeder_service = providers.Factory(
         SeederService,
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from app.core.data.indexes import IndexReport
 
 class BaseDatabaseProvider(ABC):
     @abstractmethod
@@ -19,7 +22,7 @@ class BaseDatabaseProvider(ABC):
         pass
 
     @abstractmethod
-    def create_table(self):
+    async def create_table(self):
         pass
 
     @abstractmethod
@@ -28,4 +31,28 @@ class BaseDatabaseProvider(ABC):
 
     @abstractmethod
     async def get_database_version(self) -> str:
-        pass
\ No newline at end of file
+        pass
+
+    async def get_pool_stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def get_index_report(self) -> IndexReport:
+        """
+        Report registered indexes that are missing, unused or invalid.
+        """
+        return IndexReport(missing=[], unused=[], invalid=[])
+
+    async def purge_expired(self) -> int:
+        """
+        Delete rows past the expiry declared on their indexes.
+        Mongo's TTL monitor removes expired documents itself, so the default does nothing.
+        """
+        return 0
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[Any]:
+        """
+        Open a unit of work shared by every repository until the scope exits.
+        Providers without sessions yield None.
+        """
+        yield None
\ No newline at end of file
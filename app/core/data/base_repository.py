@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Generic
+from typing import AsyncIterator, List, Dict, Any, Generic, Optional
 
+from app.core.data.bulk import BulkOperation, BulkWriteResult
 from app.core.data.model_type import ModelType, CreateSchemaType, UpdateSchemaType
 from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
 
@@ -11,23 +12,27 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
         pass
 
     @abstractmethod
-    async def insert_one(self, data: CreateSchemaType) -> List[ModelType]:
+    async def insert_one(self, data: CreateSchemaType, return_document: bool = True) -> List[ModelType]:
         pass
 
     @abstractmethod
-    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> List[ModelType]:
+    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> ModelType:
         pass
 
     @abstractmethod
-    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> bool:
+    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType, return_document: bool = True) -> bool:
         pass
 
     @abstractmethod
-    async def update_many(self, filter_dict: Dict[str, Any], data: List[UpdateSchemaType]) -> bool:
+    async def update_one_by_id(self, _id: str, data: UpdateSchemaType, return_document: bool = True) -> Optional[ModelType] | bool:
         pass
 
     @abstractmethod
-    async def bulk_write(self,data: List[ModelType]) -> bool:
+    async def update_many(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> int:
+        pass
+
+    @abstractmethod
+    async def bulk_write(self, data: List[ModelType | BulkOperation], ordered: bool = False, batch_size: Optional[int] = None) -> BulkWriteResult:
         pass
 
     @abstractmethod
@@ -35,15 +40,19 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
         pass
 
     @abstractmethod
-    async def delete_many(self, filter_dict: Dict[str, Any]) -> bool:
+    async def delete_many(self, filter_dict: Dict[str, Any]) -> int:
+        pass
+
+    @abstractmethod
+    async def find_one(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> ModelType:
         pass
 
     @abstractmethod
-    async def find_one(self, filter_dict: Dict[str, Any]) -> ModelType:
+    async def find_many(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> List[ModelType]:
         pass
 
     @abstractmethod
-    async def find_many(self, filter_dict: Dict[str, Any]) -> List[ModelType]:
+    def iter_many(self, filter_dict: Dict[str, Any], batch_size: Optional[int] = None) -> AsyncIterator[List[ModelType]]:
         pass
 
     @abstractmethod
@@ -51,5 +60,13 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
         pass
 
     @abstractmethod
-    async def find_paging(self, request: PaginationRequest) -> PaginationResponse:
+    async def find_paging(self, request: PaginationRequest, fields: Optional[List[str]] = None) -> PaginationResponse:
+        pass
+
+    @abstractmethod
+    async def list(self, skip: int = 0, limit: int = 10, filter_dict: Dict[str, Any] = None, fields: Optional[List[str]] = None) -> List[ModelType]:
+        pass
+
+    @abstractmethod
+    async def count(self, filter_dict: Dict[str, Any] = None) -> int:
         pass
\ No newline at end of file
@@ -0,0 +1,86 @@
+import time
+from enum import Enum
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.core.logging import logger
+
+class BulkOperationType(str, Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class BulkOperation(NamedTuple):
+    """
+    One write of a bulk_write call. Build it with insert, update or delete.
+    """
+    type: BulkOperationType
+    data: Any = None
+    filter_dict: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def insert(cls, data: Any) -> "BulkOperation":
+        return cls(BulkOperationType.INSERT, data=data)
+
+    @classmethod
+    def update(cls, filter_dict: Dict[str, Any], data: Any) -> "BulkOperation":
+        return cls(BulkOperationType.UPDATE, data=data, filter_dict=filter_dict)
+
+    @classmethod
+    def delete(cls, filter_dict: Dict[str, Any]) -> "BulkOperation":
+        return cls(BulkOperationType.DELETE, filter_dict=filter_dict)
+
+class BulkBatchStats(NamedTuple):
+    index: int
+    operations: int
+    duration: float
+    throughput: float
+
+class BulkWriteResult:
+    """
+    Counts and per-batch throughput of a bulk_write call.
+    """
+    def __init__(self):
+        self.inserted_ids: List[Any] = []
+        self.inserted_count = 0
+        self.updated_count = 0
+        self.deleted_count = 0
+        self.error_count = 0
+        self.batches: List[BulkBatchStats] = []
+
+    def record_batch(self, name: str, index: int, operations: int, started: float) -> None:
+        duration = time.perf_counter() - started
+        throughput = operations / duration if duration > 0 else float(operations)
+        self.batches.append(BulkBatchStats(index, operations, duration, throughput))
+        logger.info(f"Bulk write batch {index} for {name}: {operations} operations in {duration:.3f}s ({throughput:.0f} ops/s)")
+
+def to_operations(data: List[Any]) -> List[BulkOperation]:
+    """
+    Normalize bulk_write input, plain models are inserts.
+    """
+    return [item if isinstance(item, BulkOperation) else BulkOperation.insert(item) for item in data]
+
+def chunk_operations(operations: List[BulkOperation], batch_size: int) -> Iterator[List[BulkOperation]]:
+    for start in range(0, len(operations), max(batch_size, 1)):
+        yield operations[start:start + batch_size]
+
+def group_operations(batch: List[BulkOperation], ordered: bool) -> List[Tuple[BulkOperationType, List[BulkOperation]]]:
+    """
+    Group a batch into runs of the same operation type so each run is sent as one statement.
+    Ordered batches keep consecutive runs in place, unordered batches merge all operations of a type.
+
+    Args:
+        batch: The operations of the batch
+        ordered: Whether the operations must be applied in the given order
+
+    Returns:
+        The (operation type, operations) runs
+    """
+    if not ordered:
+        return [(operation_type, [op for op in batch if op.type == operation_type]) for operation_type in BulkOperationType if any(op.type == operation_type for op in batch)]
+    groups: List[Tuple[BulkOperationType, List[BulkOperation]]] = []
+    for op in batch:
+        if groups and groups[-1][0] == op.type:
+            groups[-1][1].append(op)
+        else:
+            groups.append((op.type, [op]))
+    return groups
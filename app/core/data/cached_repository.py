@@ -0,0 +1,136 @@
+import json
+import pickle
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from app.core.cache import BaseCacheProvider
+from app.core.config import settings
+from app.core.data.base_repository import BaseRepository
+from app.core.data.bulk import BulkOperation, BulkWriteResult
+from app.core.data.unit_of_work import after_commit, mark_written, written_in_unit_of_work
+from app.core.data.model_type import ModelType, CreateSchemaType, UpdateSchemaType
+from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
+
+def get_repository_ttls() -> Dict[str, int]:
+    """
+    Parse CACHE_REPOSITORY_TTLS ("Setting:600,Role:600") into model name -> TTL seconds.
+    """
+    ttls: Dict[str, int] = {}
+    for item in settings.CACHE_REPOSITORY_TTLS.split(","):
+        if not item.strip():
+            continue
+        name, _, ttl = item.partition(":")
+        ttls[name.strip()] = int(ttl) if ttl.strip() else settings.CACHE_DEFAULT_TTL
+    return ttls
+
+def _normalize_filter(filter_dict: Dict[str, Any]) -> str:
+    # Same filter in any key order maps to the same cache key
+    return json.dumps(filter_dict or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+class CachedRepository(BaseRepository[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Cache-aside wrapper around a repository.
+    find_by_id and find_one are served from the cache, misses are cached for CACHE_NEGATIVE_TTL
+    and every write drops all cached reads of the model, again once its unit of work commits
+    so reads racing the transaction cannot keep the pre-commit row.
+    Once a unit of work wrote the model its reads bypass the cache, an uncommitted row is never cached
+    and survives no rollback.
+    Entries are pickled, every hit returns its own detached copy rather than an instance shared across requests.
+    With the Memory provider each worker invalidates only its own entries, other workers catch up within the TTL.
+    """
+    def __init__(self, repository: BaseRepository, cache: BaseCacheProvider, ttl: int):
+        self.repository = repository
+        self.model: Type[ModelType] = repository.model
+        self.cache = cache
+        self.ttl = ttl
+        self.prefix = f"repo:{self.model.__name__}:"
+
+    async def __get_or_load(self, key: str, loader) -> Optional[ModelType]:
+        if written_in_unit_of_work(self.prefix):
+            return await loader()
+        # A cached miss is the pickled None, it differs from an absent key
+        entry = await self.cache.get(key)
+        if entry is not None:
+            return pickle.loads(entry)
+        document = await loader()
+        await self.cache.set(key, pickle.dumps(document), self.ttl if document is not None else settings.CACHE_NEGATIVE_TTL)
+        return document
+
+    async def invalidate(self) -> None:
+        await self.cache.delete_prefix(self.prefix)
+
+    async def __invalidate_write(self) -> None:
+        # Now for the writer's own reads, after commit for reads that raced the transaction
+        mark_written(self.prefix)
+        await self.invalidate()
+        await after_commit(self.invalidate)
+
+    async def find_by_id(self, _id: str) -> ModelType:
+        return await self.__get_or_load(f"{self.prefix}id:{_id}", lambda: self.repository.find_by_id(_id))
+
+    async def find_one(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> ModelType:
+        key = f"{self.prefix}one:{_normalize_filter(filter_dict)}"
+        if fields:
+            key = f"{key}:{','.join(sorted(fields))}"
+        return await self.__get_or_load(key, lambda: self.repository.find_one(filter_dict, fields=fields))
+
+    async def insert_many(self, data: List[CreateSchemaType]) -> List[ModelType]:
+        result = await self.repository.insert_many(data)
+        await self.__invalidate_write()
+        return result
+
+    async def insert_one(self, data: CreateSchemaType, return_document: bool = True) -> List[ModelType]:
+        result = await self.repository.insert_one(data, return_document=return_document)
+        await self.__invalidate_write()
+        return result
+
+    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> ModelType:
+        result = await self.repository.insert_if_not_exist(filter_dict, data)
+        await self.__invalidate_write()
+        return result
+
+    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType, return_document: bool = True) -> bool:
+        result = await self.repository.update_one(filter_dict, data, return_document=return_document)
+        await self.__invalidate_write()
+        return result
+
+    async def update_one_by_id(self, _id: str, data: UpdateSchemaType, return_document: bool = True) -> Optional[ModelType] | bool:
+        result = await self.repository.update_one_by_id(_id, data, return_document=return_document)
+        await self.__invalidate_write()
+        return result
+
+    async def update_many(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> int:
+        result = await self.repository.update_many(filter_dict, data)
+        await self.__invalidate_write()
+        return result
+
+    async def bulk_write(self, data: List[ModelType | BulkOperation], ordered: bool = False, batch_size: Optional[int] = None) -> BulkWriteResult:
+        try:
+            return await self.repository.bulk_write(data, ordered=ordered, batch_size=batch_size)
+        finally:
+            # Ordered batches may fail after earlier batches were committed
+            await self.__invalidate_write()
+
+    async def delete_one(self, _id: str) -> bool:
+        result = await self.repository.delete_one(_id)
+        await self.__invalidate_write()
+        return result
+
+    async def delete_many(self, filter_dict: Dict[str, Any]) -> int:
+        result = await self.repository.delete_many(filter_dict)
+        await self.__invalidate_write()
+        return result
+
+    async def find_many(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> List[ModelType]:
+        return await self.repository.find_many(filter_dict, fields=fields)
+
+    def iter_many(self, filter_dict: Dict[str, Any], batch_size: Optional[int] = None) -> AsyncIterator[List[ModelType]]:
+        return self.repository.iter_many(filter_dict, batch_size=batch_size)
+
+    async def find_paging(self, request: PaginationRequest, fields: Optional[List[str]] = None) -> PaginationResponse:
+        return await self.repository.find_paging(request, fields=fields)
+
+    async def list(self, skip: int = 0, limit: int = 10, filter_dict: Dict[str, Any] = None, fields: Optional[List[str]] = None) -> List[ModelType]:
+        return await self.repository.list(skip=skip, limit=limit, filter_dict=filter_dict, fields=fields)
+
+    async def count(self, filter_dict: Dict[str, Any] = None) -> int:
+        return await self.repository.count(filter_dict)
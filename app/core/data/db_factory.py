@@ -4,6 +4,7 @@ from app.core.config import settings
 from app.core.data.base_db import BaseDatabaseProvider
 from app.core.data.mongo_db.mongodb import MongoDB
 from app.core.data.postgresql_db.postgresqldb import PostGresqlDB
+from app.core.data.postgresql_db.postgresql_async_db import PostGresqlAsyncDB
 
 class DBFactory:
     provider = None
@@ -19,6 +20,8 @@ class DBFactory:
                  self.provider = MongoDB()
             elif settings.DB_PROVIDER.lower() == "postgresql":
                 self.provider = PostGresqlDB()
+            elif settings.DB_PROVIDER.lower() == "postgresql_async":
+                self.provider = PostGresqlAsyncDB()
             else:
                 raise NotImplementedError
         return self.provider
\ No newline at end of file
@@ -0,0 +1,21 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.data.base_db import BaseDatabaseProvider
+from app.core.logging import logger
+
+async def run_expiry_job(db_provider: BaseDatabaseProvider) -> None:
+    """
+    Purge expired rows every DATA_EXPIRY_INTERVAL_SECONDS until cancelled.
+    Every worker runs the job, the deletes are idempotent.
+
+    Args:
+        db_provider: The database provider
+    """
+    while True:
+        await asyncio.sleep(settings.DATA_EXPIRY_INTERVAL_SECONDS)
+        try:
+            if purged := await db_provider.purge_expired():
+                logger.info(f"Purged {purged} expired rows")
+        except Exception as e:
+            logger.error(f"Error in expiry job: {e}")
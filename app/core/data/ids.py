@@ -0,0 +1,27 @@
+import uuid
+from typing import Any
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.core.config import settings
+
+def to_db_id(value: Any) -> Any:
+    """
+    Convert an ID taken from a path, a query or a token to the type the configured provider stores.
+
+    Args:
+        value: The ID, usually a string
+
+    Returns:
+        An ObjectId on MongoDB, a UUID on PostgreSQL
+
+    Raises:
+        ValueError: If the ID is malformed for the provider
+    """
+    try:
+        if settings.DB_PROVIDER.lower() == "mongodb":
+            return value if isinstance(value, ObjectId) else ObjectId(str(value))
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except (InvalidId, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid ID: {value}") from e
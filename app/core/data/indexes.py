@@ -0,0 +1,64 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import Index
+
+from app.core.logging import logger
+
+class IndexSpec(NamedTuple):
+    """
+    Declaration of an ascending index on one model.
+    """
+    keys: Tuple[str, ...]
+    unique: bool = False
+    # Rows expire this many seconds after the date in the single key
+    # Mongo builds a TTL index, PostgreSQL purges them with the expiry job
+    expire_after_seconds: Optional[int] = None
+
+class IndexReport(NamedTuple):
+    missing: List[str]
+    unused: List[str]
+    invalid: List[str]
+
+# Table or collection name -> declared indexes
+_registry: Dict[str, List[IndexSpec]] = {}
+
+def get_table_name(model: Any) -> str:
+    # The name repositories read and write, the table on PostgreSQL and the collection on Mongo
+    return model.__tablename__
+
+def get_index_name(table_name: str, index: IndexSpec) -> str:
+    # Same naming as SQLModel's index=True, so already created indexes are recognized
+    return f"ix_{table_name}_{'_'.join(index.keys)}"
+
+def register_indexes(model: Any, *indexes: IndexSpec) -> None:
+    """
+    Declare the indexes a model's lookups rely on. They are built at startup by the database provider.
+
+    Args:
+        model: The table model or entity
+        indexes: The index declarations
+    """
+    table_name = get_table_name(model)
+    declared = _registry.setdefault(table_name, [])
+    declared.extend(index for index in indexes if index not in declared)
+    model_table = getattr(model, "__table__", None)
+    if model_table is not None:
+        # Attach to the table so create_all builds them on new tables and sorts can use them
+        existing = {table_index.name for table_index in model_table.indexes}
+        for index in indexes:
+            name = get_index_name(table_name, index)
+            if name not in existing:
+                Index(name, *[model_table.c[key] for key in index.keys], unique=index.unique)
+
+def get_registered_indexes() -> Dict[str, List[IndexSpec]]:
+    return {table_name: list(indexes) for table_name, indexes in _registry.items()}
+
+def get_registered_index_names() -> Dict[str, List[str]]:
+    return {table_name: [get_index_name(table_name, index) for index in indexes] for table_name, indexes in _registry.items()}
+
+def log_index_report(report: IndexReport) -> None:
+    if report.missing:
+        logger.warning(f"Missing indexes: {', '.join(report.missing)}")
+    if report.invalid:
+        logger.warning(f"Invalid indexes, drop and restart to rebuild them: {', '.join(report.invalid)}")
+    if report.unused:
+        logger.info(f"Indexes never used since statistics were reset: {', '.join(report.unused)}")
@@ -0,0 +1,171 @@
+import base64
+import binascii
+import json
+import math
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+
+from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
+
+# Ordered (field, direction) pairs, direction is 1 for ascending and -1 for descending.
+SortSpec = List[Tuple[str, int]]
+
+class KeysetPage(NamedTuple):
+    rows: List[Any]
+    next: Optional[str]
+    previous: Optional[str]
+    has_next: bool
+    has_previous: bool
+
+def get_sort_direction(direction: Any) -> int:
+    return -1 if str(direction).lower() in ("desc", "descending", "-1") else 1
+
+def get_sort_spec(sort: Optional[Dict[str, str]], id_field: str) -> SortSpec:
+    """
+    Build the keyset sort order, always ending with the id so every row has a unique position.
+
+    Args:
+        sort: Requested sort as field -> "asc"/"desc"
+        id_field: Name of the unique id field of the backend
+
+    Returns:
+        The sort specification
+    """
+    sort = sort or {}
+    spec = [(field, get_sort_direction(direction)) for field, direction in sort.items() if field != id_field]
+    if id_field in sort:
+        spec.append((id_field, get_sort_direction(sort[id_field])))
+    else:
+        spec.append((id_field, spec[-1][1] if spec else 1))
+    return spec
+
+def reverse_sort_spec(sort: SortSpec) -> SortSpec:
+    return [(field, -direction) for field, direction in sort]
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"$uuid": str(value)}
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$uuid" in value:
+            return uuid.UUID(value["$uuid"])
+        if "$oid" in value:
+            return ObjectId(value["$oid"])
+    return value
+
+def _get_value(row: Any, field: str) -> Any:
+    return row.get(field) if isinstance(row, dict) else getattr(row, field)
+
+def encode_cursor(sort: SortSpec, row: Any) -> str:
+    """
+    Encode the position of a row as an opaque cursor token.
+
+    Args:
+        sort: The sort specification the row was fetched with
+        row: A model instance or a raw document
+
+    Returns:
+        The cursor token
+    """
+    payload = {
+        "f": [field for field, _ in sort],
+        "v": [_encode_value(_get_value(row, field)) for field, _ in sort],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str, sort: SortSpec) -> List[Any]:
+    """
+    Decode a cursor token back into the sort key values.
+
+    Args:
+        token: The cursor token
+        sort: The sort specification of the current request
+
+    Returns:
+        The sort key values, in sort order
+
+    Raises:
+        ValueError: If the token is malformed or was issued for another sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(payload, dict) or payload.get("f") != [field for field, _ in sort]:
+        raise ValueError("Pagination cursor does not match the requested sort")
+    return [_decode_value(value) for value in payload["v"]]
+
+def get_keyset_position(request: PaginationRequest, sort: SortSpec) -> Tuple[SortSpec, Optional[List[Any]]]:
+    """
+    Resolve the effective sort and the cursor values of a request.
+    A previous cursor walks the sort backwards from the first row of the current page.
+
+    Args:
+        request: Pagination request
+        sort: The sort specification
+
+    Returns:
+        The sort to query with and the cursor values, None when no cursor is given
+    """
+    if request.previous:
+        return reverse_sort_spec(sort), decode_cursor(request.previous, sort)
+    if request.next:
+        return sort, decode_cursor(request.next, sort)
+    return sort, None
+
+def get_offset(request: PaginationRequest) -> int:
+    if request.next or request.previous:
+        return 0
+    return max((request.page or 1) - 1, 0) * request.limit
+
+def build_keyset_page(rows: List[Any], request: PaginationRequest, sort: SortSpec) -> KeysetPage:
+    """
+    Trim the look-ahead row and compute the cursors of the page.
+
+    Args:
+        rows: Up to limit + 1 rows fetched with the effective sort
+        request: Pagination request
+        sort: The sort specification (not reversed)
+
+    Returns:
+        The page rows in sort order and the next/previous cursor tokens
+    """
+    has_more = len(rows) > request.limit
+    rows = list(rows[:request.limit])
+    if request.previous:
+        rows.reverse()
+        has_previous, has_next = has_more, True
+    else:
+        has_next = has_more
+        has_previous = bool(request.next) or (request.page or 1) > 1
+    return KeysetPage(
+        rows=rows,
+        next=encode_cursor(sort, rows[-1]) if has_next and rows else None,
+        previous=encode_cursor(sort, rows[0]) if has_previous and rows else None,
+        has_next=has_next,
+        has_previous=has_previous,
+    )
+
+def build_paging_response(page: KeysetPage, data: List[Any], total: int, limit: int) -> PaginationResponse:
+    return PaginationResponse(
+        total=total,
+        total_pages=math.ceil(total / limit) if limit else 0,
+        data=data,
+        has_previous=page.has_previous,
+        has_next=page.has_next,
+        next=page.next,
+        previous=page.previous,
+    )
@@ -0,0 +1,56 @@
+import asyncio
+from typing import List
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.core.data.indexes import IndexReport, IndexSpec, get_index_name, get_registered_index_names, get_registered_indexes
+from app.core.logging import logger
+
+def _build_index_model(collection_name: str, index: IndexSpec) -> IndexModel:
+    options = {"name": get_index_name(collection_name, index), "unique": index.unique}
+    if index.expire_after_seconds is not None:
+        options["expireAfterSeconds"] = index.expire_after_seconds
+    return IndexModel([(key, ASCENDING) for key in index.keys], **options)
+
+async def _create_collection_indexes(database: AsyncDatabase, collection_name: str, indexes: List[IndexSpec]) -> None:
+    try:
+        await database.get_collection(collection_name).create_indexes(
+            [_build_index_model(collection_name, index) for index in indexes]
+        )
+    except Exception as e:
+        logger.error(f"Error creating indexes on {collection_name}: {str(e)}")
+
+async def apply_indexes(database: AsyncDatabase) -> None:
+    """
+    Build the registered indexes, every collection concurrently. Existing indexes are left as they are.
+
+    Args:
+        database: The application database
+    """
+    await asyncio.gather(*(
+        _create_collection_indexes(database, collection_name, indexes)
+        for collection_name, indexes in get_registered_indexes().items()
+    ))
+
+async def build_index_report(database: AsyncDatabase) -> IndexReport:
+    """
+    Compare the registered indexes with the collections' indexes and their $indexStats usage counters.
+
+    Args:
+        database: The application database
+
+    Returns:
+        Registered indexes that do not exist and non-unique indexes never used since the server started
+    """
+    missing, unused = [], []
+    for collection_name, names in get_registered_index_names().items():
+        cursor = await database.get_collection(collection_name).aggregate([{"$indexStats": {}}])
+        stats = await cursor.to_list(length=None)
+        found = {stat["name"] for stat in stats}
+        missing += [f"{collection_name}.{name}" for name in names if name not in found]
+        unused += [
+            f"{collection_name}.{stat['name']}" for stat in stats
+            if stat["name"] != "_id_" and not stat.get("spec", {}).get("unique") and stat["accesses"]["ops"] == 0
+        ]
+    return IndexReport(missing=missing, unused=unused, invalid=[])
@@ -1,9 +1,19 @@
-from typing import Type, Optional, List, Dict, Any
+import asyncio
+import time
+from typing import AsyncIterator, Type, Optional, List, Dict, Any, Union
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo import DeleteMany, InsertOne, ReadPreference, ReturnDocument, UpdateMany
 from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from bson import ObjectId
 
+from app.core.config import settings
 from app.core.data.base_repository import BaseRepository
+from app.core.data.bulk import BulkOperation, BulkOperationType, BulkWriteResult, chunk_operations, to_operations
+from app.core.data.keyset import SortSpec, build_keyset_page, build_paging_response, get_keyset_position, get_offset
+from app.core.data.mongo_db.pool import get_read_preference
+from app.core.data.read_routing import stick_to_primary, use_primary
+from app.core.data.query_compiler import compile_mongo_filter, compile_projection, compile_sort
 from app.core.data.model_type import ModelType, CreateSchemaType, UpdateSchemaType
 from app.core.logging import logger
 from app.business.common.model.pagingation import PaginationRequest, PaginationResponse
@@ -18,46 +28,192 @@ class MongoRepository(BaseRepository):
         model: Type[ModelType]
     ):
         self.db = db
-        self.collection = getattr(model, "__tablename__", None)
+        self.collection: AsyncCollection = db.get_collection(getattr(model, "__tablename__", None))
         self.model = model
+        self.__primary_collection = self.collection.with_options(read_preference=ReadPreference.PRIMARY)
+        self.__replica_collection = self.collection.with_options(read_preference=get_read_preference(settings.MONGODB_REPLICA_READ_PREFERENCE))
 
+    def __get_read_collection(self) -> AsyncCollection:
+        # Reads go to the replicas unless this request wrote or asked to read its own writes
+        return self.__primary_collection if use_primary() else self.__replica_collection
 
-    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> List[ModelType]:
-        pass
+    def __get_write_collection(self) -> AsyncCollection:
+        stick_to_primary()
+        return self.collection
 
-    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> bool:
+    @staticmethod
+    def __build_keyset_filter(sort: SortSpec, values: List[Any]) -> Dict[str, Any]:
+        # Expanded form of (a, b, _id) > (va, vb, vid) honouring each field's direction
+        clauses = []
+        for index, (field, direction) in enumerate(sort):
+            clause = {sort[i][0]: values[i] for i in range(index)}
+            clause[field] = {"$gt" if direction == 1 else "$lt": values[index]}
+            clauses.append(clause)
+        return {"$or": clauses}
+
+    @staticmethod
+    def __to_document(data: Any, **dump_options) -> Dict[str, Any]:
+        # Models name the document key id, MongoDB stores it as _id
+        document = data.model_dump(by_alias=True, **dump_options)
+        _id = document.pop("id", None)
+        if _id is not None:
+            document["_id"] = _id
+        return document
+
+    def __to_model(self, document: Dict[str, Any]) -> ModelType:
+        # The id field has no _id alias, without the rename the model would come back with id=None
+        document = dict(document)
+        if "_id" in document:
+            document["id"] = document.pop("_id")
+        return self.model(**document)
+
+    def __build_projection(self, fields: Optional[List[str]], required: List[str] = ()) -> Optional[Dict[str, int]]:
+        names = compile_projection(self.model, fields, "_id", required)
+        return None if names is None else {name: 1 for name in names}
+
+
+    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> ModelType:
         """
-        Update a document.
+        Insert a document unless one matches the filter, as a single atomic upsert.
+
+        Args:
+            filter_dict: Dictionary of filters identifying an existing document
+            data: The data to create the document with
+
+        Returns:
+            The inserted document, or the existing one
+        """
+        try:
+            obj_dict = self.__to_document(data, exclude_none=True)
+            update = {"$setOnInsert": {key: value for key, value in obj_dict.items() if key not in filter_dict}}
+            try:
+                doc = await self.__get_write_collection().find_one_and_update(
+                    filter_dict, update, upsert=True, return_document=ReturnDocument.AFTER
+                )
+            except DuplicateKeyError:
+                # A concurrent upsert won the race on a unique index, the document now exists
+                doc = await self.__get_read_collection().find_one(filter_dict)
+            logger.info(f"Upserted document in {self.collection.name} with filter: {filter_dict}")
+            return self.__to_model(doc)
+        except Exception as e:
+            logger.error(f"Error upserting document in {self.collection.name}: {str(e)}")
+            raise
+
+    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType, return_document: bool = True) -> Optional[ModelType]:
+        """
+        Update a document and return it from the same round trip.
 
         Args:
             filter_dict: Dictionary of filters to apply
             data: The data to update the document with
+            return_document: Return the updated document, False only reports whether a document matched
 
         Returns:
-            The updated document if found, None otherwise
+            The updated document if found, None otherwise. True/False when return_document is False
         """
         try:
             obj_dict = data.model_dump(by_alias=True, exclude_unset=True)
-            result = await self.collection.update_one(
+            if not return_document:
+                result = await self.__get_write_collection().update_one(filter=filter_dict, update={"$set": obj_dict})
+                if result.matched_count == 0:
+                    logger.warning(f"Document not found for update in {self.collection.name} with filter: {filter_dict}")
+                    return False
+                logger.info(f"Updated document in {self.collection.name} with filter: {filter_dict}")
+                return True
+            updated_obj = await self.__get_write_collection().find_one_and_update(
                 filter=filter_dict,
-                update={"$set": obj_dict}
+                update={"$set": obj_dict},
+                return_document=ReturnDocument.AFTER
             )
-            if result.modified_count == 0:
+            if updated_obj is None:
                 logger.warning(f"Document not found for update in {self.collection.name} with filter: {filter_dict}")
                 return None
-            if updated_obj := await self.collection.find_one(filter=filter_dict):
-                logger.info(f"Updated document in {self.collection.name} with filter: {filter_dict}")
-                return self.model(**updated_obj)
-            return None
+            logger.info(f"Updated document in {self.collection.name} with filter: {filter_dict}")
+            return self.__to_model(updated_obj)
         except Exception as e:
             logger.error(f"Error updating document in {self.collection.name}: {str(e)}")
             raise
 
-    async def update_many(self, filter_dict: Dict[str, Any], data: List[UpdateSchemaType]) -> bool:
-        pass
+    async def update_one_by_id(self, _id: str, data: UpdateSchemaType, return_document: bool = True) -> Optional[ModelType] | bool:
+        """
+        Update a document by its ID, only the fields that were set are written.
+
+        Args:
+            _id: The document ID
+            data: The data to update the document with
+            return_document: Return the updated document, False only reports whether a document matched
 
-    async def bulk_write(self, data: List[ModelType]) -> bool:
-        pass
+        Returns:
+            The updated document if found, None otherwise. True/False when return_document is False
+        """
+        return await self.update_one({"_id": ObjectId(_id)}, data, return_document=return_document)
+
+    async def update_many(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> int:
+        """
+        Update every document matching the filter in one server-side operation.
+
+        Args:
+            filter_dict: Dictionary of filters to apply
+            data: The data to update the documents with
+
+        Returns:
+            The number of modified documents
+        """
+        try:
+            obj_dict = data.model_dump(by_alias=True, exclude_unset=True)
+            result = await self.__get_write_collection().update_many(filter=filter_dict, update={"$set": obj_dict})
+            logger.info(f"Updated {result.modified_count} documents in {self.collection.name} with filter: {filter_dict}")
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"Error updating documents in {self.collection.name}: {str(e)}")
+            raise
+
+    @staticmethod
+    def __to_write_model(operation: BulkOperation, document: Optional[Dict[str, Any]]) -> Union[InsertOne, UpdateMany, DeleteMany]:
+        if operation.type == BulkOperationType.INSERT:
+            return InsertOne(document)
+        if operation.type == BulkOperationType.UPDATE:
+            return UpdateMany(operation.filter_dict, {"$set": operation.data.model_dump(by_alias=True, exclude_unset=True)})
+        return DeleteMany(operation.filter_dict)
+
+    async def bulk_write(self, data: List[ModelType | BulkOperation], ordered: bool = False, batch_size: Optional[int] = None) -> BulkWriteResult:
+        """
+        Bulk write documents in batches, one bulk_write command per batch.
+        Unordered batches let the server apply every write it can and report the failed ones.
+
+        Args:
+            data: Models to insert or insert/update/delete operations
+            ordered: Stop at the first failed write instead of continuing
+            batch_size: Number of operations per batch, defaults to BULK_WRITE_BATCH_SIZE
+
+        Returns:
+            The bulk write result
+        """
+        result = BulkWriteResult()
+        try:
+            for index, batch in enumerate(chunk_operations(to_operations(data), batch_size or settings.BULK_WRITE_BATCH_SIZE)):
+                started = time.perf_counter()
+                documents = [self.__to_document(operation.data, exclude_none=True) if operation.type == BulkOperationType.INSERT else None for operation in batch]
+                requests = [self.__to_write_model(operation, document) for operation, document in zip(batch, documents)]
+                try:
+                    batch_result = (await self.__get_write_collection().bulk_write(requests, ordered=ordered)).bulk_api_result
+                except BulkWriteError as e:
+                    if ordered:
+                        raise
+                    batch_result = e.details
+                    result.error_count += len(batch_result.get("writeErrors", []))
+                    logger.warning(f"Bulk write batch {index} in {self.collection.name} had {len(batch_result.get('writeErrors', []))} failed writes")
+                failed = {error["index"] for error in batch_result.get("writeErrors", [])}
+                # The driver sets _id on the inserted documents before sending them
+                result.inserted_ids.extend(document["_id"] for position, document in enumerate(documents) if document is not None and position not in failed)
+                result.inserted_count += batch_result.get("nInserted", 0)
+                result.updated_count += batch_result.get("nModified", 0)
+                result.deleted_count += batch_result.get("nRemoved", 0)
+                result.record_batch(self.collection.name, index, len(batch), started)
+            return result
+        except Exception as e:
+            logger.error(f"Error bulk writing documents in {self.collection.name}: {str(e)}")
+            raise
 
     async def delete_one(self, _id: str) -> bool:
         """
@@ -70,7 +226,7 @@ class MongoRepository(BaseRepository):
             True if the document was deleted, False otherwise
         """
         try:
-            result = await self.collection.delete_one({"_id": ObjectId(_id)})
+            result = await self.__get_write_collection().delete_one({"_id": ObjectId(_id)})
             if result.deleted_count == 0:
                 logger.warning(f"Document not found for deletion in {self.collection.name} with id: {_id}")
                 return False
@@ -80,31 +236,92 @@ class MongoRepository(BaseRepository):
             logger.error(f"Error deleting document from {self.collection.name}: {str(e)}")
             raise
 
-    async def delete_many(self, filter_dict: Dict[str, Any]) -> bool:
-        pass
+    async def delete_many(self, filter_dict: Dict[str, Any]) -> int:
+        """
+        Delete every document matching the filter in one server-side operation.
+
+        Args:
+            filter_dict: Dictionary of filters to apply
 
-    async def find_one(self, filter_dict: Dict[str, Any]) -> Optional[ModelType]:
+        Returns:
+            The number of deleted documents
+        """
+        try:
+            result = await self.__get_write_collection().delete_many(filter_dict)
+            logger.info(f"Deleted {result.deleted_count} documents from {self.collection.name} with filter: {filter_dict}")
+            return result.deleted_count
+        except Exception as e:
+            logger.error(f"Error deleting documents from {self.collection.name}: {str(e)}")
+            raise
+
+    async def find_one(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> Optional[ModelType]:
         """
         Find a single document matching the filter criteria.
 
         Args:
             filter_dict: Dictionary of filters to apply
+            fields: Fields to return, None to return every field
 
         Returns:
             The document if found, None otherwise
         """
         try:
-            if doc := await self.collection.find_one(filter_dict):
+            if doc := await self.__get_read_collection().find_one(filter_dict, self.__build_projection(fields)):
                 logger.info(f"Found document in {self.collection.name} matching filter: {str(filter_dict)}")
-                return self.model(**doc)
+                return self.__to_model(doc)
             logger.warning(f"No document found in {self.collection.name} matching filter: {str(filter_dict)}")
             return None
         except Exception as e:
             logger.error(f"Error finding document in {self.collection.name}: {str(e)}")
             raise
 
-    async def find_many(self, filter_dict: Dict[str, Any]) -> List[ModelType]:
-        pass
+    async def find_many(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> List[ModelType]:
+        """
+        Get every document matching the filter.
+
+        Args:
+            filter_dict: Dictionary of filters to apply
+            fields: Fields to return, None to return every field
+
+        Returns:
+            List of documents
+        """
+        try:
+            documents = [self.__to_model(doc) async for doc in self.__get_read_collection().find(filter_dict, self.__build_projection(fields))]
+            logger.info(f"Retrieved {len(documents)} documents from {self.collection.name}")
+            return documents
+        except Exception as e:
+            logger.error(f"Error finding documents in {self.collection.name}: {str(e)}")
+            raise
+
+    async def iter_many(self, filter_dict: Dict[str, Any], batch_size: Optional[int] = None) -> AsyncIterator[List[ModelType]]:
+        """
+        Iterate over the documents matching the filter in batches, holding one batch in memory at a time.
+        The cursor fetches batch_size documents per getMore round trip.
+
+        Args:
+            filter_dict: Dictionary of filters to apply
+            batch_size: Number of documents per batch, defaults to STREAM_BATCH_SIZE
+
+        Returns:
+            Async iterator of batches of documents
+        """
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        cursor = self.__get_read_collection().find(filter_dict, batch_size=batch_size)
+        try:
+            batch: List[ModelType] = []
+            async for doc in cursor:
+                batch.append(self.__to_model(doc))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        except Exception as e:
+            logger.error(f"Error iterating documents in {self.collection.name}: {str(e)}")
+            raise
+        finally:
+            await cursor.close()
 
     async def find_by_id(self, _id: str) -> ModelType:
         """
@@ -117,42 +334,99 @@ class MongoRepository(BaseRepository):
             The document if found, None otherwise
         """
         try:
-            if obj := await self.collection.find_one({"_id": ObjectId(_id)}):
+            if obj := await self.__get_read_collection().find_one({"_id": ObjectId(_id)}):
                 logger.info(f"Retrieved document from {self.collection.name} with id: {_id}")
-                return self.model(**obj)
+                return self.__to_model(obj)
             logger.warning(f"Document not found in {self.collection.name} with id: {_id}")
             return None
         except Exception as e:
             logger.error(f"Error retrieving document from {self.collection.name}: {str(e)}")
             raise
 
-    async def find_paging(self, request: PaginationRequest) -> PaginationResponse:
-        pass
+    async def find_paging(self, request: PaginationRequest, fields: Optional[List[str]] = None) -> PaginationResponse:
+        """
+        Find a page of documents.
+        A next/previous cursor seeks straight to the page through the sort index instead of skipping documents.
+        Page and exact total come from one aggregate, the filter and sort run before the $facet so they are served by an index.
+        Unfiltered estimated totals come from collection metadata and the page is a plain find.
+
+        Args:
+            request: Pagination request
+            fields: Fields to return, None to return every field
+
+        Returns:
+            Pagination response
+        """
+        try:
+            sort = compile_sort(self.model, request, "_id")
+            effective_sort, values = get_keyset_position(request, sort)
+            filter_dict = compile_mongo_filter(self.model, request)
+            keyset_filter = {} if values is None else self.__build_keyset_filter(effective_sort, values)
+            # The sort keys are always returned, the cursors are built from them
+            projection = self.__build_projection(fields, [field for field, _ in sort])
+            collection = self.__get_read_collection()
+            if request.count_mode == "estimated" and not filter_dict:
+                cursor = collection.find(keyset_filter, projection).sort(effective_sort).skip(get_offset(request)).limit(request.limit + 1)
+                documents, total = await asyncio.gather(cursor.to_list(length=request.limit + 1), collection.estimated_document_count())
+            else:
+                page_stages = [{"$match": keyset_filter}] if keyset_filter else []
+                page_stages += [{"$skip": get_offset(request)}, {"$limit": request.limit + 1}]
+                if projection:
+                    page_stages.append({"$project": projection})
+                pipeline = [
+                    {"$match": filter_dict},
+                    {"$sort": dict(effective_sort)},
+                    {"$facet": {"data": page_stages, "total": [{"$count": "count"}]}},
+                ]
+                result = (await (await collection.aggregate(pipeline)).to_list(length=1))[0]
+                documents = result["data"]
+                total = result["total"][0]["count"] if result["total"] else 0
+            page = build_keyset_page(documents, request, sort)
+            logger.info(f"Retrieved {len(page.rows)} documents from {self.collection.name}")
+            return build_paging_response(page, [self.__to_model(doc) for doc in page.rows], total, request.limit)
+        except Exception as e:
+            logger.error(f"Error paging documents from {self.collection.name}: {str(e)}")
+            raise
 
-    async def insert_one(self, data: CreateSchemaType) -> List[ModelType]:
+    async def insert_one(self, data: CreateSchemaType, return_document: bool = True) -> Optional[ModelType]:
         """
         Create a new document in the collection.
+        The returned model is built from the inserted payload and the generated id, without reading it back.
 
         Args:
             data: The data to create the document with
+            return_document: Return the created document, False skips building it
 
         Returns:
-            The created document
+            The created document, None when return_document is False
         """
         try:
-            obj_dict = data.model_dump(by_alias=True)
-            result = await self.collection.insert_one(obj_dict)
-            created_obj = await self.collection.find_one({"_id": result.inserted_id})
+            # Without an id the driver generates the ObjectId
+            obj_dict = self.__to_document(data)
+            result = await self.__get_write_collection().insert_one(obj_dict)
             logger.info(f"Created new document in {self.collection.name} with id: {result.inserted_id}")
-            return self.model(**created_obj)
+            if not return_document:
+                return None
+            return self.__to_model({**obj_dict, "_id": result.inserted_id})
         except Exception as e:
             logger.error(f"Error creating document in {self.collection.name}: {str(e)}")
             raise
 
-    async def insert_many(self, data: List[CreateSchemaType]):
+    async def insert_many(self, data: List[CreateSchemaType]) -> List[ModelType]:
+        """
+        Create many documents in one round trip.
+
+        Args:
+            data: The data to create the documents with
+
+        Returns:
+            The created documents, with their generated ids
+        """
         try:
-            result = await self.collection.insert_many(data)
+            documents = [self.__to_document(item) for item in data]
+            result = await self.__get_write_collection().insert_many(documents)
             logger.info(f"Created new documents in {self.collection.name} with id: {result.inserted_ids}")
+            return [self.__to_model({**document, "_id": _id}) for document, _id in zip(documents, result.inserted_ids)]
         except Exception as e:
             logger.error(f"Error creating documents in {self.collection.name}: {str(e)}")
             raise
@@ -160,7 +434,8 @@ class MongoRepository(BaseRepository):
         self,
         skip: int = 0,
         limit: int = 10,
-        filter_dict: Dict[str, Any] = None
+        filter_dict: Dict[str, Any] = None,
+        fields: Optional[List[str]] = None
     ) -> List[ModelType]:
         """
         List documents with pagination and filtering.
@@ -169,16 +444,17 @@ class MongoRepository(BaseRepository):
             skip: Number of documents to skip
             limit: Maximum number of documents to return
             filter_dict: Dictionary of filters to apply
+            fields: Fields to return, None to return every field
             
         Returns:
             List of documents
         """
         try:
             filter_dict = filter_dict or {}
-            cursor = self.collection.find(filter_dict).skip(skip).limit(limit)
+            cursor = self.__get_read_collection().find(filter_dict, self.__build_projection(fields)).skip(skip).limit(limit)
             documents = await cursor.to_list(length=limit)
             logger.info(f"Retrieved {len(documents)} documents from {self.collection.name}")
-            return [self.model(**doc) for doc in documents]
+            return [self.__to_model(doc) for doc in documents]
         except Exception as e:
             logger.error(f"Error listing documents from {self.collection.name}: {str(e)}")
             raise
@@ -195,7 +471,7 @@ class MongoRepository(BaseRepository):
         """
         try:
             filter_dict = filter_dict or {}
-            count = await self.collection.count_documents(filter_dict)
+            count = await self.__get_read_collection().count_documents(filter_dict)
             logger.info(f"Counted {count} documents in {self.collection.name}")
             return count
         except Exception as e:
@@ -5,31 +5,51 @@ from pymongo.asynchronous.database import AsyncDatabase
 
 from app.core.config import settings
 from app.core.data.base_db import BaseDatabaseProvider
+from app.core.data.indexes import IndexReport
+from app.core.data.mongo_db.indexes import apply_indexes, build_index_report
+from app.core.data.mongo_db.pool import PoolMetricsListener, build_pool_stats, get_client_options
 
 class MongoDB(BaseDatabaseProvider):
-    db: AsyncMongoClient
+    db: AsyncMongoClient = None
     def __init__(self):
-        self.db = AsyncMongoClient(settings.DATABASE_URL, uuidRepresentation="standard")
+        self.pool_listener = PoolMetricsListener()
+        self.__get_client()
+
+    def __get_client(self) -> AsyncMongoClient:
+        # One client per provider, it owns the connection pool
+        if self.db is None:
+            self.db = AsyncMongoClient(settings.DATABASE_URL, **get_client_options(self.pool_listener))
+        return self.db
+
     def get_database(self) -> AsyncDatabase:
-        return self.db.get_database(settings.DATABASE_NAME)
+        return self.__get_client().get_database(settings.DATABASE_NAME)
 
     async def connect(self):
-        self.db = AsyncMongoClient(settings.DATABASE_URL, uuidRepresentation="standard")
+        await self.__get_client().admin.command("ping")
 
     async def close(self):
-        await self.db.close()
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
 
     async def ping(self):
-        await self.db.command("ping")
+        await self.__get_client().admin.command("ping")
 
     async def get_database_name(self) -> str:
         return settings.DATABASE_NAME
     
-    def create_table(self):
-        return super().create_table()
+    async def create_table(self):
+        # Collections are created on first write, only their indexes need building
+        await apply_indexes(self.get_database())
+
+    async def get_index_report(self) -> IndexReport:
+        return await build_index_report(self.get_database())
     
+    async def get_pool_stats(self):
+        return build_pool_stats(self.pool_listener)
+
     async def get_database_version(self) -> str:
-        server_info = await self.db.server_info()
+        server_info = await self.__get_client().server_info()
         return server_info["version"]
 
 
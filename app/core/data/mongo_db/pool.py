@@ -0,0 +1,138 @@
+from typing import Any, Dict, List
+
+from pymongo import ReadPreference, monitoring
+
+from app.core.config import settings
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    CMAP listener recording checkout latency and how much of the pool is in use.
+    """
+    def __init__(self):
+        self.checkout_count = 0
+        self.checkout_failures = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.waiting = 0
+        self.checked_out = 0
+        self.open_connections = 0
+        self.pool_cleared_count = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.pool_cleared_count += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open_connections = max(self.open_connections - 1, 0)
+
+    def connection_check_out_started(self, event):
+        self.waiting += 1
+
+    def connection_check_out_failed(self, event):
+        self.waiting = max(self.waiting - 1, 0)
+        self.checkout_failures += 1
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self.checkout_timeouts += 1
+        self.__record_wait(event)
+
+    def connection_checked_out(self, event):
+        self.waiting = max(self.waiting - 1, 0)
+        self.checked_out += 1
+        self.checkout_count += 1
+        self.__record_wait(event)
+
+    def connection_checked_in(self, event):
+        self.checked_out = max(self.checked_out - 1, 0)
+
+    def __record_wait(self, event):
+        wait = getattr(event, "duration", None) or 0.0
+        self.checkout_wait_total += wait
+        self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+_READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primarypreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondarypreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+def get_read_preference(name: str) -> Any:
+    """
+    Get a read preference from its connection string name, e.g. secondaryPreferred.
+
+    Raises:
+        ValueError: If the name is not a read preference mode
+    """
+    try:
+        return _READ_PREFERENCES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Invalid read preference: {name}")
+
+def get_compressors() -> List[str]:
+    return [compressor.strip() for compressor in settings.MONGODB_COMPRESSORS.split(",") if compressor.strip()]
+
+def get_client_options(listener: PoolMetricsListener) -> Dict[str, Any]:
+    """
+    Build the AsyncMongoClient pool and wire options from settings.
+    Compressors whose module (zstandard, python-snappy) is not installed are skipped by the driver with a warning.
+
+    Args:
+        listener: The pool metrics listener to register
+
+    Returns:
+        The client keyword arguments
+    """
+    options = {
+        "uuidRepresentation": "standard",
+        "maxPoolSize": settings.MONGODB_MAX_CONNECTIONS,
+        "minPoolSize": settings.MONGODB_MIN_CONNECTIONS,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "readPreference": get_read_preference(settings.MONGODB_READ_PREFERENCE).mongos_mode,
+        "event_listeners": [listener],
+    }
+    if compressors := get_compressors():
+        options["compressors"] = compressors
+    return options
+
+def build_pool_stats(listener: PoolMetricsListener) -> Dict[str, Any]:
+    """
+    Get a snapshot of the pool usage, summed over every server the client is connected to.
+
+    Args:
+        listener: The pool metrics listener of the client
+
+    Returns:
+        Pool statistics
+    """
+    checkout_count = listener.checkout_count
+    return {
+        "pool_size": settings.MONGODB_MAX_CONNECTIONS,
+        "checked_out": listener.checked_out,
+        "open": listener.open_connections,
+        "idle": max(listener.open_connections - listener.checked_out, 0),
+        "waiting": listener.waiting,
+        "saturation": round(listener.checked_out / settings.MONGODB_MAX_CONNECTIONS, 3) if settings.MONGODB_MAX_CONNECTIONS else 0.0,
+        "checkouts": checkout_count,
+        "checkout_failures": listener.checkout_failures,
+        "checkout_timeouts": listener.checkout_timeouts,
+        "pool_cleared_count": listener.pool_cleared_count,
+        "wait_avg_ms": round(listener.checkout_wait_total / checkout_count * 1000, 3) if checkout_count else 0.0,
+        "wait_max_ms": round(listener.checkout_wait_max * 1000, 3),
+    }
@@ -0,0 +1,30 @@
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+from app.core.logging import logger
+
+def add_missing_columns(connection: Connection, metadata: MetaData) -> None:
+    """
+    Add the model columns that existing tables lack, create_all only builds tables that do not exist yet.
+    A NOT NULL column needs a server default so the rows already in the table get a value.
+
+    Args:
+        connection: An AUTOCOMMIT connection
+        metadata: The metadata of the application tables
+    """
+    inspector = inspect(connection)
+    quote = connection.dialect.identifier_preparer.quote
+    for table_name, table in metadata.tables.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            definition = CreateColumn(column).compile(dialect=connection.dialect)
+            try:
+                connection.execute(text(f"ALTER TABLE {quote(table_name)} ADD COLUMN IF NOT EXISTS {definition}"))
+                logger.info(f"Added column {column.name} to {table_name}")
+            except Exception as e:
+                logger.error(f"Error adding column {column.name} to {table_name}: {e}")
@@ -0,0 +1,44 @@
+from datetime import timedelta
+from sqlalchemy import MetaData, delete, func, select
+from sqlalchemy.engine import Connection
+
+from app.core.data.indexes import get_registered_indexes
+from app.core.logging import logger
+
+def purge_expired(connection: Connection, metadata: MetaData, batch_size: int) -> int:
+    """
+    Delete the rows past the expiry declared with IndexSpec.expire_after_seconds, the PostgreSQL counterpart of a Mongo TTL index.
+    Rows go batch_size at a time so each statement holds few row locks and writes a small burst of WAL.
+    The connection must be in AUTOCOMMIT so every batch commits on its own.
+
+    Args:
+        connection: An AUTOCOMMIT connection
+        metadata: The metadata of the application tables
+        batch_size: Rows deleted per statement
+
+    Returns:
+        Number of deleted rows
+    """
+    purged = 0
+    for table_name, indexes in get_registered_indexes().items():
+        if table_name not in metadata.tables:
+            continue
+        table = metadata.tables[table_name]
+        for index in indexes:
+            if index.expire_after_seconds is None:
+                continue
+            # The registered index on the date column serves this range scan
+            expired = (
+                select(table.c.id)
+                .where(table.c[index.keys[0]] < func.now() - timedelta(seconds=index.expire_after_seconds))
+                .limit(batch_size)
+            )
+            try:
+                while True:
+                    deleted = connection.execute(delete(table).where(table.c.id.in_(expired))).rowcount
+                    purged += deleted
+                    if deleted < batch_size:
+                        break
+            except Exception as e:
+                logger.error(f"Error purging expired rows of {table_name}: {e}")
+    return purged
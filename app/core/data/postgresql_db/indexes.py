@@ -0,0 +1,56 @@
+from sqlalchemy import MetaData, text
+from sqlalchemy.engine import Connection
+
+from app.core.data.indexes import IndexReport, get_index_name, get_registered_index_names, get_registered_indexes
+from app.core.logging import logger
+
+def apply_indexes(connection: Connection, metadata: MetaData) -> None:
+    """
+    Build the registered indexes of existing tables with CREATE INDEX CONCURRENTLY, which does not block writes.
+    The connection must be in AUTOCOMMIT, concurrent builds cannot run inside a transaction.
+
+    Args:
+        connection: An AUTOCOMMIT connection
+        metadata: The metadata of the application tables
+    """
+    quote = connection.dialect.identifier_preparer.quote
+    for table_name, indexes in get_registered_indexes().items():
+        if table_name not in metadata.tables:
+            continue
+        for index in indexes:
+            name = get_index_name(table_name, index)
+            columns = ", ".join(quote(key) for key in index.keys)
+            try:
+                connection.execute(text(
+                    f"CREATE {'UNIQUE ' if index.unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} ON {quote(table_name)} ({columns})"
+                ))
+            except Exception as e:
+                logger.error(f"Error creating index {name} on {table_name}: {e}")
+
+def build_index_report(connection: Connection, metadata: MetaData) -> IndexReport:
+    """
+    Compare the registered indexes with the catalog and the index usage statistics.
+
+    Args:
+        connection: A database connection
+        metadata: The metadata of the application tables
+
+    Returns:
+        Registered indexes that do not exist, non-unique indexes never scanned and indexes left invalid by a failed build
+    """
+    rows = connection.execute(text(
+        "SELECT s.relname, s.indexrelname, s.idx_scan, i.indisvalid, i.indisunique "
+        "FROM pg_stat_user_indexes s JOIN pg_index i ON i.indexrelid = s.indexrelid "
+        "WHERE s.relname = ANY(:tables)"
+    ), {"tables": list(metadata.tables)}).all()
+    found = {row.indexrelname for row in rows}
+    missing = [
+        f"{table_name}.{name}"
+        for table_name, names in get_registered_index_names().items() if table_name in metadata.tables
+        for name in names if name not in found
+    ]
+    return IndexReport(
+        missing=missing,
+        unused=[f"{row.relname}.{row.indexrelname}" for row in rows if row.idx_scan == 0 and not row.indisunique],
+        invalid=[f"{row.relname}.{row.indexrelname}" for row in rows if not row.indisvalid],
+    )
@@ -0,0 +1,74 @@
+import time
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from app.core.config import settings
+
+class PoolMetricsMixin:
+    """
+    Records how long callers wait to check a connection out of the pool.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_count = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.checkout_count += 1
+            self.checkout_wait_total += wait
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+class MeteredQueuePool(PoolMetricsMixin, QueuePool):
+    pass
+
+class MeteredAsyncQueuePool(PoolMetricsMixin, AsyncAdaptedQueuePool):
+    pass
+
+def get_engine_pool_options() -> Dict[str, Any]:
+    """
+    Build the create_engine pool keyword arguments from settings.
+
+    Returns:
+        Pool options shared by the sync and async engines
+    """
+    return {
+        "pool_size": settings.POSTGRESQL_POOL_SIZE,
+        "max_overflow": settings.POSTGRESQL_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRESQL_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRESQL_POOL_RECYCLE,
+        "pool_pre_ping": settings.POSTGRESQL_POOL_PRE_PING,
+    }
+
+def build_pool_stats(pool: Pool) -> Dict[str, Any]:
+    """
+    Get a snapshot of the pool usage.
+
+    Args:
+        pool: The engine pool
+
+    Returns:
+        Pool statistics
+    """
+    checkout_count = getattr(pool, "checkout_count", 0)
+    wait_total = getattr(pool, "checkout_wait_total", 0.0)
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.POSTGRESQL_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkout_count,
+        "checkout_timeouts": getattr(pool, "checkout_timeouts", 0),
+        "wait_avg_ms": round(wait_total / checkout_count * 1000, 3) if checkout_count else 0.0,
+        "wait_max_ms": round(getattr(pool, "checkout_wait_max", 0.0) * 1000, 3),
+    }
@@ -0,0 +1,129 @@
+from contextlib import asynccontextmanager
+from typing import List
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.sql import text
+from app.core.config import settings
+from app.core.data.base_db import BaseDatabaseProvider
+from app.core.data.indexes import IndexReport
+from app.core.data.postgresql_db.columns import add_missing_columns
+from app.core.data.postgresql_db.expiry import purge_expired
+from app.core.data.postgresql_db.indexes import apply_indexes, build_index_report
+from app.core.data.postgresql_db.pool import MeteredAsyncQueuePool, build_pool_stats, get_engine_pool_options
+from app.core.data.postgresql_db.replicas import ReplicaRouter, RoutingSession, get_replica_urls
+from app.core.data.unit_of_work import pop_after_commit, reset_current_session, run_after_commit, set_current_session
+from app.business.common.schema.base import SqlBaseModel
+
+class PostGresqlAsyncDB(BaseDatabaseProvider):
+    """
+    PostgreSQL provider built on SQLAlchemy's asyncio engine, so queries never block the event loop.
+    """
+    engine: AsyncEngine = None
+    SessionLocal: async_sessionmaker = None
+    replica_engines: List[AsyncEngine] = None
+    replica_router: ReplicaRouter = None
+
+    def __init__(self):
+        super().__init__()
+
+    async def connect(self):
+        async with self.__get_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def close(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+        for engine in self.replica_engines or []:
+            await engine.dispose()
+
+    async def ping(self):
+        async with self.__get_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        for engine in self.replica_engines or []:
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+                self.replica_router.mark_up(engine.sync_engine)
+            except Exception:
+                self.replica_router.mark_down(engine.sync_engine)
+
+    def __get_database_url(self, base_url: str) -> URL:
+        url = make_url(f"{base_url}/{settings.DATABASE_NAME}")
+        if url.drivername != settings.POSTGRESQL_ASYNC_DRIVER:
+            url = url.set(drivername=settings.POSTGRESQL_ASYNC_DRIVER)
+        return url
+
+    def __create_engine(self, base_url: str) -> AsyncEngine:
+        return create_async_engine(
+            self.__get_database_url(base_url),
+            poolclass=MeteredAsyncQueuePool,
+            **get_engine_pool_options()
+        )
+
+    def __get_engine(self) -> AsyncEngine:
+        if self.engine is None:
+            self.engine = self.__create_engine(settings.DATABASE_URL)
+            if replica_urls := get_replica_urls():
+                self.replica_engines = [self.__create_engine(url) for url in replica_urls]
+                # Sessions pick binds on the sync side of the async engines
+                self.replica_router = ReplicaRouter([engine.sync_engine for engine in self.replica_engines])
+        return self.engine
+
+    async def create_table(self):
+        async with self.__get_engine().begin() as connection:
+            await connection.run_sync(SqlBaseModel.metadata.create_all)
+        async with self.__get_engine().connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.run_sync(add_missing_columns, SqlBaseModel.metadata)
+            await connection.run_sync(apply_indexes, SqlBaseModel.metadata)
+
+    async def get_index_report(self) -> IndexReport:
+        async with self.__get_engine().connect() as connection:
+            return await connection.run_sync(build_index_report, SqlBaseModel.metadata)
+
+    async def purge_expired(self) -> int:
+        async with self.__get_engine().connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            return await connection.run_sync(purge_expired, SqlBaseModel.metadata, settings.DATA_EXPIRY_BATCH_SIZE)
+
+    def get_database(self) -> AsyncSession:
+        if self.SessionLocal is None:
+            self.SessionLocal = async_sessionmaker(
+                bind=self.__get_engine(),
+                class_=AsyncSession,
+                sync_session_class=RoutingSession,
+                autoflush=False,
+                expire_on_commit=False,
+                router=self.replica_router
+            )
+        return self.SessionLocal()
+
+    async def get_database_name(self) -> str:
+        return settings.DATABASE_NAME
+
+    async def get_database_version(self) -> str:
+        async with self.get_database() as session:
+            return (await session.execute(text("SELECT version()"))).scalar()
+
+    async def get_pool_stats(self):
+        stats = build_pool_stats(self.__get_engine().sync_engine.pool)
+        if self.replica_router is not None:
+            stats["replicas"] = self.replica_router.get_stats()
+        return stats
+
+    @asynccontextmanager
+    async def session_scope(self):
+        session = self.get_database()
+        token = set_current_session(session)
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            pop_after_commit(session)
+            await session.rollback()
+            raise
+        finally:
+            reset_current_session(token)
+            await session.close()
+        # Caches and snapshots are refreshed only once the data they are built from is committed
+        await run_after_commit(pop_after_commit(session))
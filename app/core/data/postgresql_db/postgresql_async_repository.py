@@ -0,0 +1,406 @@
+from datetime import datetime, UTC
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.business.common.model.pagingation.pagination_request import PaginationRequest
+from app.business.common.model.pagingation.pagination_response import PaginationResponse
+from app.core.config import settings
+from app.core.data.base_repository import BaseRepository
+from app.core.data.bulk import BulkOperation, BulkOperationType, BulkWriteResult, chunk_operations, group_operations, to_operations
+from app.core.data.model_type import CreateSchemaType, ModelType, UpdateSchemaType
+from app.core.data.keyset import build_keyset_page, build_paging_response
+from app.core.data.postgresql_db.query import build_bulk_delete_statements, build_bulk_insert_statements, build_count_statement, build_insert_if_not_exist_statement, build_estimated_count, build_load_only, build_paging_statement, build_update_statement, use_estimated_count
+from app.core.data.query_compiler import compile_sort
+from app.core.data.read_routing import stick_to_primary
+from app.core.data.unit_of_work import get_current_session, in_unit_of_work
+from app.core.logging import logger
+
+class PostgreSqlAsyncRepository(BaseRepository):
+    def __init__(self, db: AsyncSession, model: Type[ModelType]):
+        self._db = db
+        self.model = model
+
+    @property
+    def db(self) -> AsyncSession:
+        """
+        The request-scoped session when a unit of work is active, the repository's own session otherwise.
+        """
+        session = get_current_session()
+        return session if session is not None else self._db
+
+    async def _commit(self):
+        # Inside a unit of work the scope commits once at the end of the request
+        # The rest of the request reads its own writes from the primary
+        stick_to_primary()
+        if in_unit_of_work():
+            await self.db.flush()
+        else:
+            await self.db.commit()
+
+    async def _rollback(self):
+        if not in_unit_of_work():
+            await self.db.rollback()
+
+    async def _release(self):
+        if not in_unit_of_work():
+            await self.db.close()
+
+    async def insert_many(self, data: List[CreateSchemaType]) -> List[ModelType]:
+        """
+        Insert many data into the database.
+        Args:
+            data: List of data to insert.
+        Returns:
+            List of inserted data.
+        """
+        try:
+            self.db.add_all(data)
+            await self._commit()
+            for item in data:
+                await self.db.refresh(item)
+            return data
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error inserting many data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def insert_one(self, data: CreateSchemaType, return_document: bool = True) -> List[ModelType]:
+        """
+        Insert one data into the database.
+        Args:
+            data: Data to insert.
+            return_document: Kept for the repository contract, the inserted instance is returned without a read.
+        Returns:
+            Inserted data.
+        """
+        try:
+            self.db.add(data)
+            await self._commit()
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error inserting one data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+        return data
+
+    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> ModelType:
+        """
+        Insert one data into the database if it does not exist.
+        Runs as a single INSERT ... ON CONFLICT DO NOTHING statement, so concurrent callers cannot insert duplicates.
+        Args:
+            filter_dict: Filter to check if data exists.
+            data: Data to insert.
+        Returns:
+            Inserted data, or the existing data.
+        """
+        try:
+            statement = build_insert_if_not_exist_statement(self.model, filter_dict, data)
+            row = (await self.db.execute(statement)).scalars().first()
+            if row is None:
+                # The conflicting row was committed after this statement's snapshot was taken
+                row = (await self.db.execute(select(self.model).filter_by(**filter_dict).limit(1))).scalars().first()
+            await self._commit()
+            return row
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error inserting if not exist data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType, return_document: bool = True) -> bool:
+        """
+        Update one data in the database.
+        Args:
+            filter_dict: Filter to update data.
+            data: Data to update.
+            return_document: Kept for the repository contract, the result is always a flag.
+        Returns:
+            True if updated, False otherwise.
+        """
+        try:
+            result = await self.db.execute(select(self.model).filter_by(**filter_dict).limit(1))
+            existing_data = result.scalars().first()
+            if existing_data:
+                for key, value in data.model_dump().items():
+                    setattr(existing_data, key, value)
+
+                if(hasattr(existing_data, 'updated_at')):
+                    existing_data.updated_at = datetime.now(UTC)
+                await self._commit()
+                return True
+            else:
+                self.db.add(data)
+                await self._commit()
+                await self.db.refresh(data)
+                return True
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error updating one data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def update_one_by_id(self, _id: str, data: UpdateSchemaType, return_document: bool = True) -> Optional[ModelType] | bool:
+        """
+        Update one row by id with a single UPDATE ... RETURNING statement.
+        Args:
+            _id: ID of the row to update.
+            data: Data to update, only the fields that were set are written.
+            return_document: Return the updated row, False only reports whether a row matched.
+        Returns:
+            The updated row if found, None otherwise. True/False when return_document is False.
+        """
+        try:
+            statement = build_update_statement(self.model, {"id": _id}, data)
+            if return_document:
+                updated = (await self.db.execute(statement.returning(self.model))).scalars().first()
+            else:
+                updated = (await self.db.execute(statement)).rowcount == 1
+            await self._commit()
+            return updated
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error updating data by id for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def update_many(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> int:
+        """
+        Update many data in the database with a single UPDATE ... WHERE statement.
+        Args:
+            filter_dict: Filter to update data.
+            data: Data to update, only the fields that were set are written.
+        Returns:
+            Number of updated rows.
+        """
+        try:
+            result = await self.db.execute(build_update_statement(self.model, filter_dict, data))
+            await self._commit()
+            return result.rowcount
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error updating many data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def bulk_write(self, data: List[ModelType | BulkOperation], ordered: bool = False, batch_size: Optional[int] = None) -> BulkWriteResult:
+        """
+        Bulk write data into the database in batches.
+        Inserts are sent as multi-row INSERT ... RETURNING statements, deletes by id as one DELETE ... IN.
+        Each batch is committed on its own, inside a unit of work the whole write stays in the request transaction.
+        Args:
+            data: Models to insert or insert/update/delete operations.
+            ordered: Keep the operations in order, otherwise operations of the same type in a batch are merged.
+            batch_size: Number of operations per batch, defaults to BULK_WRITE_BATCH_SIZE.
+        Returns:
+            The bulk write result.
+        """
+        result = BulkWriteResult()
+        try:
+            for index, batch in enumerate(chunk_operations(to_operations(data), batch_size or settings.BULK_WRITE_BATCH_SIZE)):
+                started = time.perf_counter()
+                for operation_type, operations in group_operations(batch, ordered):
+                    if operation_type == BulkOperationType.INSERT:
+                        for statement in build_bulk_insert_statements(self.model, [op.data for op in operations]):
+                            result.inserted_ids.extend((await self.db.execute(statement)).scalars().all())
+                    elif operation_type == BulkOperationType.UPDATE:
+                        for op in operations:
+                            result.updated_count += (await self.db.execute(build_update_statement(self.model, op.filter_dict, op.data))).rowcount
+                    else:
+                        for statement in build_bulk_delete_statements(self.model, operations):
+                            result.deleted_count += (await self.db.execute(statement)).rowcount
+                await self._commit()
+                result.record_batch(self.model.__name__, index, len(batch), started)
+            result.inserted_count = len(result.inserted_ids)
+            return result
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error bulk write data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def delete_one(self, _id: str) -> bool:
+        """
+        Delete one data from the database.
+        Args:
+            _id: ID of the data to delete.
+        Returns:
+            True if deleted, False otherwise.
+        """
+        try:
+            await self.db.execute(delete(self.model).filter_by(id=_id))
+            await self._commit()
+            return True
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error deleting one data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def delete_many(self, filter_dict: Dict[str, Any]) -> int:
+        """
+        Delete many data from the database with a single DELETE ... WHERE statement.
+        Args:
+            filter_dict: Filter to delete data.
+        Returns:
+            Number of deleted rows.
+        """
+        try:
+            result = await self.db.execute(delete(self.model).filter_by(**filter_dict))
+            await self._commit()
+            return result.rowcount
+        except Exception as e:
+            await self._rollback()
+            logger.error(f"Error deleting many data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def find_one(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> ModelType:
+        """
+        Find one data from the database.
+        Args:
+            filter_dict: Filter to find data.
+            fields: Fields to load, None to load every field.
+        Returns:
+            Found data.
+        """
+        try:
+            result = await self.db.execute(select(self.model).options(*build_load_only(self.model, fields)).filter_by(**filter_dict).limit(1))
+            return result.scalars().first()
+        except Exception as e:
+            logger.error(f"Error finding one data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def find_many(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> List[ModelType]:
+        """
+        Find many data from the database.
+        Args:
+            filter_dict: Filter to find data.
+            fields: Fields to load, None to load every field.
+        Returns:
+            List of found data.
+        """
+        try:
+            result = await self.db.execute(select(self.model).options(*build_load_only(self.model, fields)).filter_by(**filter_dict))
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"Error finding many data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def iter_many(self, filter_dict: Dict[str, Any], batch_size: Optional[int] = None) -> AsyncIterator[List[ModelType]]:
+        """
+        Iterate over the data matching the filter in batches, holding one batch in memory at a time.
+        Rows are read through a server-side cursor fetching batch_size rows per round trip.
+        Args:
+            filter_dict: Filter to find data.
+            batch_size: Number of rows per batch, defaults to STREAM_BATCH_SIZE.
+        Returns:
+            Async iterator of batches of found data.
+        """
+        try:
+            statement = select(self.model).filter_by(**filter_dict).execution_options(yield_per=batch_size or settings.STREAM_BATCH_SIZE)
+            result = await self.db.stream_scalars(statement)
+            async for partition in result.partitions():
+                yield partition
+        except Exception as e:
+            logger.error(f"Error iterating many data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def find_by_id(self, _id: str) -> ModelType:
+        """
+        Find one data from the database by id.
+        Args:
+            _id: ID of the data to find.
+        Returns:
+            Found data.
+        """
+        try:
+            return await self.db.get(self.model, _id)
+        except Exception as e:
+            logger.error(f"Error finding one data by id for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def find_paging(self, request: PaginationRequest, fields: Optional[List[str]] = None) -> PaginationResponse:
+        """
+        Find paging data from the database.
+        A next/previous cursor seeks straight to the page through the sort index instead of skipping rows.
+        The total is computed by the same statement as the page.
+        Args:
+            request: Pagination request.
+            fields: Fields to load, None to load every field.
+        Returns:
+            Pagination response.
+        """
+        try:
+            sort = compile_sort(self.model, request, "id")
+            rows = (await self.db.execute(build_paging_statement(self.model, request, sort, fields))).all()
+            page = build_keyset_page([row[0] for row in rows], request, sort)
+            if rows:
+                total = rows[0].total or 0
+            elif use_estimated_count(request):
+                total = (await self.db.execute(select(build_estimated_count(self.model)))).scalar() or 0
+            else:
+                # Past the last row there is nothing to carry the total, count separately
+                total = (await self.db.execute(build_count_statement(self.model, request))).scalar_one()
+            return build_paging_response(page, page.rows, total, request.limit)
+        except Exception as e:
+            logger.error(f"Error finding paging data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def list(self, skip: int = 0, limit: int = 10, filter_dict: Dict[str, Any] = None, fields: Optional[List[str]] = None) -> List[ModelType]:
+        """
+        List data from the database with pagination and filtering.
+        Args:
+            skip: Number of data to skip.
+            limit: Maximum number of data to return.
+            filter_dict: Filter to find data.
+            fields: Fields to load, None to load every field.
+        Returns:
+            List of found data.
+        """
+        try:
+            statement = select(self.model).options(*build_load_only(self.model, fields)).filter_by(**(filter_dict or {}))
+            result = await self.db.execute(statement.offset(skip).limit(limit))
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"Error listing data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
+
+    async def count(self, filter_dict: Dict[str, Any] = None) -> int:
+        """
+        Count data in the database.
+        Args:
+            filter_dict: Filter to count data.
+        Returns:
+            Number of data.
+        """
+        try:
+            result = await self.db.execute(select(func.count()).select_from(self.model).filter_by(**(filter_dict or {})))
+            return result.scalar_one()
+        except Exception as e:
+            logger.error(f"Error counting data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            await self._release()
@@ -1,18 +1,52 @@
 
 
 from datetime import datetime, UTC
-from typing import Any, Dict, List, Type
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
 from app.business.common.model.pagingation.pagination_request import PaginationRequest
 from app.business.common.model.pagingation.pagination_response import PaginationResponse
+from app.core.config import settings
 from app.core.data.base_repository import BaseRepository
+from app.core.data.bulk import BulkOperation, BulkOperationType, BulkWriteResult, chunk_operations, group_operations, to_operations
 from app.core.data.model_type import CreateSchemaType, ModelType, UpdateSchemaType
+from app.core.data.keyset import build_keyset_page, build_paging_response
+from app.core.data.postgresql_db.query import build_bulk_delete_statements, build_bulk_insert_statements, build_count_statement, build_insert_if_not_exist_statement, build_estimated_count, build_load_only, build_paging_statement, build_update_statement, use_estimated_count
+from app.core.data.query_compiler import compile_sort
+from app.core.data.read_routing import stick_to_primary
+from app.core.data.unit_of_work import get_current_session, in_unit_of_work
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
 from app.core.logging import logger
 class PostgreSqlRepository(BaseRepository):
     def __init__(self, db: Session, model: Type[ModelType]):
-        self.db = db
+        self._db = db
         self.model = model
 
+    @property
+    def db(self) -> Session:
+        """
+        The request-scoped session when a unit of work is active, the repository's own session otherwise.
+        """
+        session = get_current_session()
+        return session if session is not None else self._db
+
+    def _commit(self):
+        # Inside a unit of work the scope commits once at the end of the request
+        # The rest of the request reads its own writes from the primary
+        stick_to_primary()
+        if in_unit_of_work():
+            self.db.flush()
+        else:
+            self.db.commit()
+
+    def _rollback(self):
+        if not in_unit_of_work():
+            self.db.rollback()
+
+    def _release(self):
+        if not in_unit_of_work():
+            self.db.close()
+
     async def insert_many(self, data: List[CreateSchemaType]) -> List[ModelType]:
         """
         Insert many data into the database.
@@ -23,66 +57,69 @@ class PostgreSqlRepository(BaseRepository):
         """
         try:
             self.db.add_all(data)
-            self.db.commit()
-            refresh_data = [self.db.refresh(item) for item in data]
-            return refresh_data
+            self._commit()
+            for item in data:
+                self.db.refresh(item)
+            return data
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Error inserting many data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def insert_one(self, data: CreateSchemaType) -> List[ModelType]:
+    async def insert_one(self, data: CreateSchemaType, return_document: bool = True) -> List[ModelType]:
         """
         Insert one data into the database.
         Args:
             data: Data to insert.
+            return_document: Kept for the repository contract, the inserted instance is returned without a read.
         Returns:
             Inserted data.
         """
         try:
             self.db.add(data)
-            self.db.commit()
+            self._commit()
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Error inserting one data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
         return data
 
-    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> List[ModelType]:
+    async def insert_if_not_exist(self, filter_dict: Dict[str, Any], data: CreateSchemaType) -> ModelType:
         """
         Insert one data into the database if it does not exist.
+        Runs as a single INSERT ... ON CONFLICT DO NOTHING statement, so concurrent callers cannot insert duplicates.
         Args:
             filter_dict: Filter to check if data exists.
             data: Data to insert.
         Returns:
-            Inserted data.
+            Inserted data, or the existing data.
         """
         try:
-            existing_data = self.db.query(self.model).filter_by(**filter_dict).first()
-            if existing_data:
-                return existing_data
-            else:
-                self.db.add(data)
-                self.db.commit()
-                self.db.refresh(data)
-                return data
+            statement = build_insert_if_not_exist_statement(self.model, filter_dict, data)
+            row = self.db.execute(statement).scalars().first()
+            if row is None:
+                # The conflicting row was committed after this statement's snapshot was taken
+                row = self.db.execute(select(self.model).filter_by(**filter_dict).limit(1)).scalars().first()
+            self._commit()
+            return row
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Error inserting if not exist data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> bool:  
+    async def update_one(self, filter_dict: Dict[str, Any], data: UpdateSchemaType, return_document: bool = True) -> bool:  
         """
         Update one data in the database.
         Args:
             filter_dict: Filter to update data.
             data: Data to update.
+            return_document: Kept for the repository contract, the result is always a flag.
         Returns:
             True if updated, False otherwise.
         """
@@ -94,62 +131,101 @@ class PostgreSqlRepository(BaseRepository):
 
                 if(hasattr(existing_data, 'updated_at')):
                     existing_data.updated_at = datetime.now(UTC)
-                self.db.commit()
+                self._commit()
                 return True
             else:
                 self.db.add(data)
-                self.db.commit()
+                self._commit()
                 self.db.refresh(data)
                 return True
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Error updating one data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def update_many(self, filter_dict: Dict[str, Any], data: List[UpdateSchemaType]) -> bool:
+    async def update_one_by_id(self, _id: str, data: UpdateSchemaType, return_document: bool = True) -> Optional[ModelType] | bool:
         """
-        Update many data in the database.
+        Update one row by id with a single UPDATE ... RETURNING statement.
+        Args:
+            _id: ID of the row to update.
+            data: Data to update, only the fields that were set are written.
+            return_document: Return the updated row, False only reports whether a row matched.
+        Returns:
+            The updated row if found, None otherwise. True/False when return_document is False.
+        """
+        try:
+            statement = build_update_statement(self.model, {"id": _id}, data)
+            if return_document:
+                updated = (self.db.execute(statement.returning(self.model))).scalars().first()
+            else:
+                updated = (self.db.execute(statement)).rowcount == 1
+            self._commit()
+            return updated
+        except Exception as e:
+            self._rollback()
+            logger.error(f"Error updating data by id for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            self._release()
+
+    async def update_many(self, filter_dict: Dict[str, Any], data: UpdateSchemaType) -> int:
+        """
+        Update many data in the database with a single UPDATE ... WHERE statement.
         Args:
             filter_dict: Filter to update data.
-            data: Data to update.
+            data: Data to update, only the fields that were set are written.
         Returns:
-            True if updated, False otherwise.
+            Number of updated rows.
         """
         try:
-            existing_data = self.db.query(self.model).filter_by(**filter_dict).all()
-            if existing_data:
-                for item in existing_data:
-                    for key, value in data.model_dump().items():
-                        setattr(item, key, value)
-            self.db.commit()
-            return True
+            result = self.db.execute(build_update_statement(self.model, filter_dict, data))
+            self._commit()
+            return result.rowcount
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Error updating many data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def bulk_write(self, data: List[ModelType]) -> bool:
+    async def bulk_write(self, data: List[ModelType | BulkOperation], ordered: bool = False, batch_size: Optional[int] = None) -> BulkWriteResult:
         """
-        Bulk write data into the database.
+        Bulk write data into the database in batches.
+        Inserts are sent as multi-row INSERT ... RETURNING statements, deletes by id as one DELETE ... IN.
+        Each batch is committed on its own, inside a unit of work the whole write stays in the request transaction.
         Args:
-            data: List of data to write.
+            data: Models to insert or insert/update/delete operations.
+            ordered: Keep the operations in order, otherwise operations of the same type in a batch are merged.
+            batch_size: Number of operations per batch, defaults to BULK_WRITE_BATCH_SIZE.
         Returns:
-            True if written, False otherwise.
+            The bulk write result.
         """
+        result = BulkWriteResult()
         try:
-            self.db.add_all(data)
-            self.db.commit()
-            return True
+            for index, batch in enumerate(chunk_operations(to_operations(data), batch_size or settings.BULK_WRITE_BATCH_SIZE)):
+                started = time.perf_counter()
+                for operation_type, operations in group_operations(batch, ordered):
+                    if operation_type == BulkOperationType.INSERT:
+                        for statement in build_bulk_insert_statements(self.model, [op.data for op in operations]):
+                            result.inserted_ids.extend((self.db.execute(statement)).scalars().all())
+                    elif operation_type == BulkOperationType.UPDATE:
+                        for op in operations:
+                            result.updated_count += (self.db.execute(build_update_statement(self.model, op.filter_dict, op.data))).rowcount
+                    else:
+                        for statement in build_bulk_delete_statements(self.model, operations):
+                            result.deleted_count += (self.db.execute(statement)).rowcount
+                self._commit()
+                result.record_batch(self.model.__name__, index, len(batch), started)
+            result.inserted_count = len(result.inserted_ids)
+            return result
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Error bulk write data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
     async def delete_one(self, _id: str) -> bool:
         """
@@ -161,64 +237,89 @@ class PostgreSqlRepository(BaseRepository):
         """
         try:
             self.db.query(self.model).filter_by(id=_id).delete()
-            self.db.commit()
+            self._commit()
             return True
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Error deleting one data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def delete_many(self, filter_dict: Dict[str, Any]) -> bool:
+    async def delete_many(self, filter_dict: Dict[str, Any]) -> int:
         """
-        Delete many data from the database.
+        Delete many data from the database with a single DELETE ... WHERE statement.
         Args:
             filter_dict: Filter to delete data.
         Returns:
-            True if deleted, False otherwise.
+            Number of deleted rows.
         """
         try:
-            return self.db.query(self.model).filter_by(**filter_dict).first()
+            result = self.db.execute(delete(self.model).filter_by(**filter_dict))
+            self._commit()
+            return result.rowcount
         except Exception as e:
+            self._rollback()
             logger.error(f"Error deleting many data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def find_one(self, filter_dict: Dict[str, Any]) -> ModelType:
+    async def find_one(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> ModelType:
         """
         Find one data from the database.
         Args:
             filter_dict: Filter to find data.
+            fields: Fields to load, None to load every field.
         Returns:
             Found data.
         """
         try:
-            data = self.db.query(self.model).filter_by(**filter_dict).first()
+            data = self.db.query(self.model).options(*build_load_only(self.model, fields)).filter_by(**filter_dict).first()
             return data
         except Exception as e:
             logger.error(f"Error finding one data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def find_many(self, filter_dict: Dict[str, Any]) -> List[ModelType]:
+    async def find_many(self, filter_dict: Dict[str, Any], fields: Optional[List[str]] = None) -> List[ModelType]:
         """
         Find many data from the database.
         Args:
             filter_dict: Filter to find data.
+            fields: Fields to load, None to load every field.
         Returns:
             List of found data.
         """
         try:
-            return self.db.query(self.model).filter_by(**filter_dict).all()
+            return self.db.query(self.model).options(*build_load_only(self.model, fields)).filter_by(**filter_dict).all()
         except Exception as e:
             logger.error(f"Error finding many data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
     
+    async def iter_many(self, filter_dict: Dict[str, Any], batch_size: Optional[int] = None) -> AsyncIterator[List[ModelType]]:
+        """
+        Iterate over the data matching the filter in batches, holding one batch in memory at a time.
+        Rows are read through a server-side cursor fetching batch_size rows per round trip.
+        Args:
+            filter_dict: Filter to find data.
+            batch_size: Number of rows per batch, defaults to STREAM_BATCH_SIZE.
+        Returns:
+            Async iterator of batches of found data.
+        """
+        try:
+            statement = select(self.model).filter_by(**filter_dict).execution_options(yield_per=batch_size or settings.STREAM_BATCH_SIZE)
+            for partition in self.db.execute(statement).scalars().partitions():
+                yield partition
+        except Exception as e:
+            logger.error(f"Error iterating many data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            self._release()
+
     async def find_by_id(self, _id: str) -> ModelType:
         """
         Find one data from the database by id.
@@ -233,23 +334,69 @@ class PostgreSqlRepository(BaseRepository):
             logger.error(f"Error finding one data by id for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
-    async def find_paging(self, request: PaginationRequest) -> PaginationResponse:
+    async def find_paging(self, request: PaginationRequest, fields: Optional[List[str]] = None) -> PaginationResponse:
         """
         Find paging data from the database.
+        A next/previous cursor seeks straight to the page through the sort index instead of skipping rows.
+        The total is computed by the same statement as the page.
         Args:
             request: Pagination request.
+            fields: Fields to load, None to load every field.
         Returns:
             Pagination response.
         """
         try:
-            return self.db.query(self.model).filter_by(**request.filter_dict).offset((request.page - 1) * request.limit).limit(request.limit).all()
+            sort = compile_sort(self.model, request, "id")
+            rows = self.db.execute(build_paging_statement(self.model, request, sort, fields)).all()
+            page = build_keyset_page([row[0] for row in rows], request, sort)
+            if rows:
+                total = rows[0].total or 0
+            elif use_estimated_count(request):
+                total = self.db.execute(select(build_estimated_count(self.model))).scalar() or 0
+            else:
+                # Past the last row there is nothing to carry the total, count separately
+                total = self.db.execute(build_count_statement(self.model, request)).scalar_one()
+            return build_paging_response(page, page.rows, total, request.limit)
         except Exception as e:
             logger.error(f"Error finding paging data for model {self.model.__name__}: {e}")
             raise e
         finally:
-            self.db.close()
+            self._release()
 
+    async def list(self, skip: int = 0, limit: int = 10, filter_dict: Dict[str, Any] = None, fields: Optional[List[str]] = None) -> List[ModelType]:
+        """
+        List data from the database with pagination and filtering.
+        Args:
+            skip: Number of data to skip.
+            limit: Maximum number of data to return.
+            filter_dict: Filter to find data.
+            fields: Fields to load, None to load every field.
+        Returns:
+            List of found data.
+        """
+        try:
+            statement = select(self.model).options(*build_load_only(self.model, fields)).filter_by(**(filter_dict or {}))
+            return self.db.execute(statement.offset(skip).limit(limit)).scalars().all()
+        except Exception as e:
+            logger.error(f"Error listing data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            self._release()
 
-        
+    async def count(self, filter_dict: Dict[str, Any] = None) -> int:
+        """
+        Count data in the database.
+        Args:
+            filter_dict: Filter to count data.
+        Returns:
+            Number of data.
+        """
+        try:
+            return self.db.execute(select(func.count()).select_from(self.model).filter_by(**(filter_dict or {}))).scalar_one()
+        except Exception as e:
+            logger.error(f"Error counting data for model {self.model.__name__}: {e}")
+            raise e
+        finally:
+            self._release()
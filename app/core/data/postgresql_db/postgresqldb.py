@@ -1,14 +1,23 @@
+from contextlib import asynccontextmanager
 from sqlmodel import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql import text
 from app.core.config import settings
 from sqlalchemy.orm import sessionmaker
 from app.core.data.base_db import BaseDatabaseProvider
+from app.core.data.indexes import IndexReport
+from app.core.data.postgresql_db.columns import add_missing_columns
+from app.core.data.postgresql_db.expiry import purge_expired
+from app.core.data.postgresql_db.indexes import apply_indexes, build_index_report
+from app.core.data.postgresql_db.pool import MeteredQueuePool, build_pool_stats, get_engine_pool_options
+from app.core.data.postgresql_db.replicas import ReplicaRouter, RoutingSession, get_replica_urls
+from app.core.data.unit_of_work import pop_after_commit, reset_current_session, run_after_commit, set_current_session
 from app.business.common.schema.base import SqlBaseModel
 
 class PostGresqlDB(BaseDatabaseProvider):
     engine: Engine = None
     SessionLocal: sessionmaker = None
+    replica_router: ReplicaRouter = None
 
     def __init__(self):
         super().__init__()
@@ -20,23 +29,77 @@ class PostGresqlDB(BaseDatabaseProvider):
         self.get_database().close()
 
     async def ping(self):
-        self.get_database().connection().execute("SELECT 1")
+        with self.__get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+        if self.replica_router is not None:
+            self.replica_router.check()
     
+    def __create_engine(self, url: str) -> Engine:
+        return create_engine(
+            f"{url}/{settings.DATABASE_NAME}",
+            poolclass=MeteredQueuePool,
+            **get_engine_pool_options()
+        )
+
     def __get_engine(self):
         if self.engine is None:
-            self.engine = create_engine(f"{settings.DATABASE_URL}/{settings.DATABASE_NAME}")
+            self.engine = self.__create_engine(settings.DATABASE_URL)
+            if replica_urls := get_replica_urls():
+                self.replica_router = ReplicaRouter([self.__create_engine(url) for url in replica_urls])
         return self.engine
     
-    def create_table(self):
+    async def create_table(self):
         SqlBaseModel.metadata.create_all(bind=self.__get_engine())
+        with self.__get_engine().connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            add_missing_columns(connection, SqlBaseModel.metadata)
+            apply_indexes(connection, SqlBaseModel.metadata)
+
+    async def get_index_report(self) -> IndexReport:
+        with self.__get_engine().connect() as connection:
+            return build_index_report(connection, SqlBaseModel.metadata)
+
+    async def purge_expired(self) -> int:
+        with self.__get_engine().connect() as connection:
+            return purge_expired(connection.execution_options(isolation_level="AUTOCOMMIT"), SqlBaseModel.metadata, settings.DATA_EXPIRY_BATCH_SIZE)
 
     def get_database(self):
         if self.SessionLocal is None:
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.__get_engine())
+            self.SessionLocal = sessionmaker(
+                class_=RoutingSession,
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                bind=self.__get_engine(),
+                router=self.replica_router
+            )
         return self.SessionLocal()
     
     async def get_database_name(self) -> str:
         return settings.DATABASE_NAME
 
     async def get_database_version(self) -> str:
-        return self.get_database().execute(text("SELECT version()")).scalar()
\ No newline at end of file
+        return self.get_database().execute(text("SELECT version()")).scalar()
+
+    async def get_pool_stats(self):
+        stats = build_pool_stats(self.__get_engine().pool)
+        if self.replica_router is not None:
+            stats["replicas"] = self.replica_router.get_stats()
+        return stats
+
+    @asynccontextmanager
+    async def session_scope(self):
+        session = self.get_database()
+        token = set_current_session(session)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            pop_after_commit(session)
+            session.rollback()
+            raise
+        finally:
+            reset_current_session(token)
+            session.close()
+        # Caches and snapshots are refreshed only once the data they are built from is committed
+        await run_after_commit(pop_after_commit(session))
\ No newline at end of file
@@ -0,0 +1,219 @@
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional, Type
+from sqlalchemy import BigInteger, Delete, Insert, Table, UniqueConstraint, Update, and_, cast, column, delete, func, insert, literal, or_, select, table, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql import ColumnElement, Select
+from app.business.common.model.pagingation import PaginationRequest
+from app.core.data.bulk import BulkOperation
+from app.core.data.keyset import SortSpec, get_keyset_position, get_offset
+from app.core.data.model_type import ModelType
+from app.core.data.query_compiler import compile_projection, compile_sql_filters, has_predicates
+
+def build_filter_clauses(model: Type[ModelType], request: PaginationRequest) -> List[ColumnElement]:
+    return compile_sql_filters(model, request)
+
+def build_load_only(model: Type[ModelType], fields: Optional[List[str]], required: List[str] = ()) -> List[LoaderOption]:
+    """
+    Build the load_only option selecting only the requested columns.
+    Relationship fields are left to their own loading strategy.
+
+    Args:
+        model: The table model
+        fields: Requested fields, None to load every column
+        required: Columns the query itself needs
+
+    Returns:
+        The loader options, empty when every column is loaded
+    """
+    names = compile_projection(model, fields, "id", required)
+    if names is None:
+        return []
+    columns = model.__table__.columns
+    return [load_only(*[getattr(model, name) for name in names if name in columns])]
+
+def build_order_by(model: Type[ModelType], sort: SortSpec) -> List[ColumnElement]:
+    return [getattr(model, field).asc() if direction == 1 else getattr(model, field).desc() for field, direction in sort]
+
+def build_keyset_clause(model: Type[ModelType], sort: SortSpec, values: List[Any]) -> ColumnElement:
+    """
+    Build the predicate selecting rows strictly after the cursor position.
+
+    Args:
+        model: The table model
+        sort: The effective sort specification
+        values: The cursor values, in sort order
+
+    Returns:
+        The keyset predicate
+    """
+    columns = [getattr(model, field) for field, _ in sort]
+    directions = {direction for _, direction in sort}
+    if len(directions) == 1:
+        # A row value comparison can be answered by a single composite index range scan
+        return tuple_(*columns) > tuple_(*values) if 1 in directions else tuple_(*columns) < tuple_(*values)
+    clauses = []
+    for index, (sort_column, (_, direction)) in enumerate(zip(columns, sort)):
+        equals = [columns[i] == values[i] for i in range(index)]
+        clauses.append(and_(*equals, sort_column > values[index] if direction == 1 else sort_column < values[index]))
+    return or_(*clauses)
+
+def use_estimated_count(request: PaginationRequest) -> bool:
+    return request.count_mode == "estimated" and not has_predicates(request)
+
+def build_estimated_count(model: Type[ModelType]) -> ColumnElement:
+    """
+    Read the planner's row estimate for the table instead of counting it.
+    reltuples is refreshed by VACUUM/ANALYZE and is -1 for tables never analyzed.
+    """
+    pg_class = table("pg_class", column("oid"), column("reltuples"))
+    return (
+        select(cast(func.greatest(pg_class.c.reltuples, 0), BigInteger))
+        .where(pg_class.c.oid == func.to_regclass(f'"{model.__tablename__}"'))
+        .scalar_subquery()
+    )
+
+def build_total_column(model: Type[ModelType], request: PaginationRequest, keyset: bool) -> ColumnElement:
+    """
+    Build the total row count as a column of the page query so page and total come back in one round trip.
+
+    Args:
+        model: The table model
+        request: Pagination request
+        keyset: Whether the page is filtered by a cursor predicate
+
+    Returns:
+        The labelled total column
+    """
+    if use_estimated_count(request):
+        return build_estimated_count(model).label("total")
+    if not keyset:
+        # Evaluated over every filtered row before OFFSET/LIMIT apply
+        return func.count().over().label("total")
+    # The window would only see rows past the cursor, count the filtered set instead
+    return build_count_statement(model, request).correlate(None).scalar_subquery().label("total")
+
+def build_paging_statement(model: Type[ModelType], request: PaginationRequest, sort: SortSpec, fields: Optional[List[str]] = None) -> Select:
+    """
+    Build the page query, fetching one extra row to know whether another page follows.
+    Rows are (model, total) pairs.
+
+    Args:
+        model: The table model
+        request: Pagination request
+        sort: The sort specification
+        fields: Columns to load, the sort keys are always loaded for the cursors
+
+    Returns:
+        The select statement
+    """
+    effective_sort, values = get_keyset_position(request, sort)
+    statement = (
+        select(model, build_total_column(model, request, values is not None))
+        .options(*build_load_only(model, fields, [field for field, _ in sort]))
+        .where(*build_filter_clauses(model, request))
+    )
+    if values is not None:
+        statement = statement.where(build_keyset_clause(model, effective_sort, values))
+    return statement.order_by(*build_order_by(model, effective_sort)).offset(get_offset(request)).limit(request.limit + 1)
+
+def build_count_statement(model: Type[ModelType], request: PaginationRequest) -> Select:
+    return select(func.count()).select_from(model).where(*build_filter_clauses(model, request))
+
+
+def get_conflict_target(model_table: Table, fields: List[str]) -> Optional[List[str]]:
+    """
+    Get the ON CONFLICT target when the fields are exactly a unique key of the table.
+
+    Args:
+        model_table: The table
+        fields: The fields identifying the row
+
+    Returns:
+        The conflict columns, None when no unique key is exactly the fields
+    """
+    keys = [{column.name for column in model_table.primary_key.columns}]
+    keys += [{column.name} for column in model_table.columns if column.unique]
+    keys += [{column.name for column in index.columns} for index in model_table.indexes if index.unique]
+    keys += [{column.name for column in constraint.columns} for constraint in model_table.constraints if isinstance(constraint, UniqueConstraint)]
+    return list(fields) if set(fields) in keys else None
+
+def build_insert_if_not_exist_statement(model: Type[ModelType], filter_dict: Dict[str, Any], data: ModelType) -> Select:
+    """
+    Build one statement that inserts the row unless one matches the filter and returns either the new or the existing row:
+    WITH inserted AS (INSERT ... RETURNING *)
+    SELECT * FROM inserted UNION ALL SELECT * FROM table WHERE filter AND NOT EXISTS (SELECT 1 FROM inserted)
+    When the filter is a unique key the insert is INSERT ... ON CONFLICT (key) DO NOTHING, which is atomic.
+    Otherwise ON CONFLICT would never fire, the insert is INSERT ... SELECT ... WHERE NOT EXISTS (filter),
+    which concurrent transactions may both pass, only a unique key rules out duplicates.
+
+    Args:
+        model: The table model
+        filter_dict: Filter identifying an existing row
+        data: Row to insert
+
+    Returns:
+        The ORM select statement
+    """
+    model_table = model.__table__
+    values = data.model_dump(exclude_none=True)
+    conflict_target = get_conflict_target(model_table, list(filter_dict))
+    if conflict_target is not None:
+        insert_statement = pg_insert(model_table).values(**values).on_conflict_do_nothing(index_elements=conflict_target)
+    else:
+        row = select(*[literal(value, model_table.c[name].type).label(name) for name, value in values.items()]).where(
+            ~select(literal(1)).select_from(model_table).filter_by(**filter_dict).exists()
+        )
+        insert_statement = pg_insert(model_table).from_select(list(values), row).on_conflict_do_nothing()
+    inserted = insert_statement.returning(*model_table.c).cte("inserted")
+    existing = (
+        select(*model_table.c)
+        .filter_by(**filter_dict)
+        .where(~select(literal(1)).select_from(inserted).exists())
+        .limit(1)
+    )
+    return select(model).from_statement(union_all(select(*inserted.c), existing))
+
+def build_bulk_insert_statements(model: Type[ModelType], data: List[ModelType]) -> List[Insert]:
+    """
+    Build multi-row INSERT ... VALUES (...), (...) RETURNING id statements.
+    Rows are grouped by their set of columns so server defaults still apply to the columns left out.
+
+    Args:
+        model: The table model
+        data: Rows to insert
+
+    Returns:
+        One statement per column set
+    """
+    model_table = model.__table__
+    groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for item in data:
+        row = item.model_dump(exclude_none=True)
+        groups.setdefault(frozenset(row), []).append(row)
+    return [insert(model_table).values(rows).returning(model_table.c.id) for rows in groups.values()]
+
+def build_update_statement(model: Type[ModelType], filter_dict: Dict[str, Any], data: Any) -> Update:
+    values = data.model_dump(exclude_unset=True)
+    if hasattr(model, 'updated_at'):
+        values['updated_at'] = datetime.now(UTC)
+    return update(model).filter_by(**filter_dict).values(**values)
+
+def build_bulk_delete_statements(model: Type[ModelType], operations: List[BulkOperation]) -> List[Delete]:
+    """
+    Build the DELETE statements of a run of delete operations.
+    Deletes by id alone are merged into a single DELETE ... WHERE id IN (...).
+
+    Args:
+        model: The table model
+        operations: The delete operations
+
+    Returns:
+        The delete statements
+    """
+    ids = [op.filter_dict["id"] for op in operations if list(op.filter_dict) == ["id"]]
+    statements = [delete(model).filter_by(**op.filter_dict) for op in operations if list(op.filter_dict) != ["id"]]
+    if ids:
+        statements.insert(0, delete(model).where(model.id.in_(ids)))
+    return statements
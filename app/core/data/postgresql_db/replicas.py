@@ -0,0 +1,98 @@
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.data.postgresql_db.pool import build_pool_stats
+from app.core.data.read_routing import use_primary
+from app.core.logging import logger
+
+def get_replica_urls() -> List[str]:
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+class ReplicaRouter:
+    """
+    Round-robin over the read replicas, skipping the ones whose connections failed.
+    A failed replica is retried after DATABASE_REPLICA_RETRY_SECONDS.
+    """
+    def __init__(self, engines: List[Engine]):
+        self.engines = engines
+        self.__counter = itertools.count()
+        self.__down_since: Dict[int, float] = {}
+        for engine in engines:
+            event.listen(engine, "handle_error", self.__on_error)
+            # A new connection to a replica that was down means it is reachable again
+            event.listen(engine, "connect", lambda *_, engine=engine: self.mark_up(engine))
+
+    def next(self) -> Optional[Engine]:
+        """
+        Get the next healthy replica.
+
+        Returns:
+            The replica engine, None when every replica is down
+        """
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self.__counter) % len(self.engines)]
+            down_since = self.__down_since.get(id(engine))
+            if down_since is None or now - down_since >= settings.DATABASE_REPLICA_RETRY_SECONDS:
+                return engine
+        return None
+
+    def mark_down(self, engine: Engine) -> None:
+        if id(engine) not in self.__down_since:
+            logger.warning(f"Read replica {engine.url.host} is down, reads fall back to the other replicas")
+        self.__down_since[id(engine)] = time.monotonic()
+
+    def mark_up(self, engine: Engine) -> None:
+        if self.__down_since.pop(id(engine), None) is not None:
+            logger.info(f"Read replica {engine.url.host} is back")
+
+    def check(self) -> None:
+        """
+        Probe every replica with SELECT 1 and update its health.
+        """
+        for engine in self.engines:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                self.mark_up(engine)
+            except Exception:
+                self.mark_down(engine)
+
+    def is_healthy(self, engine: Engine) -> bool:
+        return id(engine) not in self.__down_since
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"host": engine.url.host, "healthy": self.is_healthy(engine), **build_pool_stats(engine.pool)}
+            for engine in self.engines
+        ]
+
+    def __on_error(self, context) -> None:
+        # Connection failures, not query errors, take the replica out of the rotation
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+class RoutingSession(Session):
+    """
+    Session sending plain SELECTs to a read replica and everything else to the primary.
+    Once the session wrote, or the context asked for read-your-writes, it stays on the primary.
+    """
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        is_read = isinstance(clause, Select) and not self._flushing
+        if self._flushing or (clause is not None and not is_read):
+            self.info["wrote"] = True
+        elif is_read and self.router is not None and not self.info.get("wrote") and not use_primary():
+            if (engine := self.router.next()) is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
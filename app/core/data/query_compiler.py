@@ -0,0 +1,145 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy.sql import ColumnElement
+
+from app.business.common.model.pagingation import PaginationRequest
+from app.core.data.keyset import SortSpec, get_sort_spec
+from app.core.data.model_type import ModelType
+
+SORT_DIRECTIONS = ("asc", "desc", "ascending", "descending", "1", "-1")
+ID_FIELDS = ("id", "_id")
+
+class QueryCompilationError(ValueError):
+    """
+    Raised when a pagination request cannot be answered with an index-friendly query.
+    """
+    pass
+
+def get_index_prefixes(model: Type[ModelType]) -> List[List[str]]:
+    """
+    Get the column lists an index can serve an ORDER BY for.
+
+    Args:
+        model: The table model
+
+    Returns:
+        The column names of every index, primary key and unique column, in index order
+    """
+    table = getattr(model, "__table__", None)
+    if table is None:
+        return []
+    prefixes = [[column.name for column in index.columns] for index in table.indexes]
+    prefixes.append([column.name for column in table.primary_key.columns])
+    prefixes += [[column.name] for column in table.columns if column.unique or column.index]
+    return prefixes
+
+def _check_fields(model: Type[ModelType], fields: List[str], kind: str) -> None:
+    unknown = [field for field in fields if field not in model.model_fields]
+    if unknown:
+        raise QueryCompilationError(f"Unknown {kind} field(s) for {model.__name__}: {', '.join(unknown)}")
+
+def compile_sort(model: Type[ModelType], request: PaginationRequest, id_field: str) -> SortSpec:
+    """
+    Compile the requested sort into a keyset sort specification.
+    The requested fields must be a prefix of an index, so the database never sorts a full scan.
+
+    Args:
+        model: The model being paged
+        request: Pagination request
+        id_field: Name of the unique id field of the backend
+
+    Returns:
+        The sort specification, ending with the id tie-breaker
+
+    Raises:
+        QueryCompilationError: If a field is unknown, unindexed or the direction is invalid
+    """
+    sort = {id_field if field in ID_FIELDS else field: str(direction).lower() for field, direction in (request.sort or {}).items()}
+    invalid = [field for field, direction in sort.items() if direction not in SORT_DIRECTIONS]
+    if invalid:
+        raise QueryCompilationError(f"Sort direction must be 'asc' or 'desc' for: {', '.join(invalid)}")
+    fields = [field for field in sort if field != id_field]
+    _check_fields(model, fields, "sort")
+    if fields and not any(prefix[:len(fields)] == fields for prefix in get_index_prefixes(model)):
+        raise QueryCompilationError(f"Sorting {model.__name__} by {', '.join(fields)} is not backed by an index")
+    return get_sort_spec(sort, id_field)
+
+def compile_sql_filters(model: Type[ModelType], request: PaginationRequest) -> List[ColumnElement]:
+    """
+    Compile filter and search into SQL predicates: IN lists and anchored LIKE prefixes.
+
+    Args:
+        model: The table model
+        request: Pagination request
+
+    Returns:
+        The WHERE clauses
+    """
+    filters, search = request.filter or {}, request.search or {}
+    _check_fields(model, list(filters) + list(search), "filter")
+    clauses = []
+    for field, values in filters.items():
+        column = getattr(model, field)
+        clauses.append(column == values[0] if len(values) == 1 else column.in_(values))
+    for field, prefix in search.items():
+        clauses.append(getattr(model, field).startswith(prefix, autoescape=True))
+    return clauses
+
+def compile_mongo_filter(model: Type[ModelType], request: PaginationRequest) -> Dict[str, Any]:
+    """
+    Compile filter and search into a Mongo filter document: $in lists and anchored regex prefixes.
+
+    Args:
+        model: The model being paged
+        request: Pagination request
+
+    Returns:
+        The filter document
+    """
+    filters, search = request.filter or {}, request.search or {}
+    _check_fields(model, list(filters) + list(search), "filter")
+    conditions: List[Dict[str, Any]] = []
+    for field, values in filters.items():
+        conditions.append({field: values[0] if len(values) == 1 else {"$in": values}})
+    for field, prefix in search.items():
+        # A case-sensitive ^prefix regex is answered by an index range scan
+        conditions.append({field: {"$regex": f"^{re.escape(prefix)}"}})
+    if len(conditions) > 1:
+        return {"$and": conditions}
+    return conditions[0] if conditions else {}
+
+def has_predicates(request: PaginationRequest) -> bool:
+    return bool(request.filter or request.search)
+
+def compile_projection(model: Type[ModelType], fields: Optional[List[str]], id_field: str, required: Iterable[str] = ()) -> Optional[List[str]]:
+    """
+    Compile the requested fields into the list of fields to load.
+    The id and the required fields (e.g. the sort keys a cursor is built from) are always loaded.
+
+    Args:
+        model: The model being read
+        fields: Requested fields, None to load every field
+        id_field: Name of the unique id field of the backend
+        required: Fields the query itself needs
+
+    Returns:
+        The fields to load, None to load every field
+
+    Raises:
+        QueryCompilationError: If a field is unknown
+    """
+    if not fields:
+        return None
+    names = [id_field if field in ID_FIELDS else field for field in fields]
+    relationships = getattr(model, "__sqlmodel_relationships__", {})
+    _check_fields(model, [field for field in names if field != id_field and field not in relationships], "projection")
+    return list(dict.fromkeys([id_field, *names, *required]))
+
+def get_view_fields(view_model: Type[BaseModel], model: Type[ModelType]) -> List[str]:
+    """
+    Get the fields of the model a view model is built from, to project reads onto them.
+    """
+    relationships = getattr(model, "__sqlmodel_relationships__", {})
+    return [field for field in view_model.model_fields if field in model.model_fields or field in relationships]
@@ -0,0 +1,24 @@
+from contextvars import ContextVar, Token
+
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+def use_primary() -> bool:
+    """
+    Whether reads in the current context must go to the primary.
+
+    Returns:
+        True once the context wrote, or asked for read-your-writes, False when reads may go to a replica
+    """
+    return _primary_reads.get()
+
+def stick_to_primary() -> Token:
+    """
+    Send every following read of the current context (request) to the primary, so it sees its own writes.
+
+    Returns:
+        The token used to restore the previous routing
+    """
+    return _primary_reads.set(True)
+
+def reset_read_routing(token: Token) -> None:
+    _primary_reads.reset(token)
@@ -1,26 +1,37 @@
 from typing import Type
 
+from app.core.cache import CacheFactory
 from app.core.config import settings
+from app.core.data.cached_repository import CachedRepository, get_repository_ttls
 from app.core.data.db_factory import DBFactory
 from app.core.data.model_type import ModelType
 from app.core.data.mongo_db.mongo_repository import MongoRepository
 from app.core.data.postgresql_db.postgresql_repository import PostgreSqlRepository
+from app.core.data.postgresql_db.postgresql_async_repository import PostgreSqlAsyncRepository
 
 
 class RepositoryFactory:
     def __init__(self):
         self._db_factory = DBFactory()
+        self._repository_ttls = get_repository_ttls()
 
     def __get_repository_class(self):
         if settings.DB_PROVIDER.lower() == "mongodb":
             return MongoRepository
         elif settings.DB_PROVIDER.lower() == "postgresql":
             return PostgreSqlRepository
+        elif settings.DB_PROVIDER.lower() == "postgresql_async":
+            return PostgreSqlAsyncRepository
         else:
             raise ValueError(f"Invalid database provider: {settings.DB_PROVIDER}")
         
     def get_repository(self, model: Type[ModelType]):
         repository_cls = self.__get_repository_class()
         db = self._db_factory.get_provider().get_database()
-        return repository_cls(db=db, model=model) 
+        repository = repository_cls(db=db, model=model)
+        # Models listed in CACHE_REPOSITORY_TTLS get their find_by_id/find_one reads cached
+        ttl = self._repository_ttls.get(model.__name__)
+        if ttl is not None:
+            return CachedRepository(repository, CacheFactory().get_provider(), ttl)
+        return repository
     
@@ -0,0 +1,98 @@
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, List, Optional
+
+from app.core.logging import logger
+
+AfterCommitCallback = Callable[[], Awaitable[Any]]
+# Key of the callback list in the session's info dict
+AFTER_COMMIT_KEY = "after_commit"
+# Key of the set of names written by the unit of work
+WRITTEN_KEY = "written"
+
+_current_session: ContextVar[Optional[Any]] = ContextVar("current_session", default=None)
+
+def get_current_session() -> Optional[Any]:
+    """
+    Get the session of the unit of work running in the current context.
+
+    Returns:
+        The request-scoped session if a unit of work is active, None otherwise
+    """
+    return _current_session.get()
+
+def set_current_session(session: Any) -> Token:
+    """
+    Bind a session to the current context.
+
+    Args:
+        session: The session shared by every repository until the token is reset
+
+    Returns:
+        The token used to restore the previous session
+    """
+    return _current_session.set(session)
+
+def reset_current_session(token: Token) -> None:
+    """
+    Restore the session that was bound before set_current_session.
+
+    Args:
+        token: The token returned by set_current_session
+    """
+    _current_session.reset(token)
+
+def in_unit_of_work() -> bool:
+    return _current_session.get() is not None
+
+async def after_commit(callback: AfterCommitCallback) -> None:
+    """
+    Run a callback once the current unit of work commits, it is dropped if the unit of work rolls back.
+    Outside a unit of work the write is already durable, so the callback runs at once.
+
+    Args:
+        callback: The coroutine function to run, e.g. a cache invalidation
+    """
+    session = _current_session.get()
+    if session is None:
+        await callback()
+    else:
+        session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+def mark_written(name: str) -> None:
+    """
+    Record that the current unit of work wrote under a name, e.g. a cache prefix.
+    Outside a unit of work the write is already durable and nothing is recorded.
+
+    Args:
+        name: The name checked later with written_in_unit_of_work
+    """
+    session = _current_session.get()
+    if session is not None:
+        session.info.setdefault(WRITTEN_KEY, set()).add(name)
+
+def written_in_unit_of_work(name: str) -> bool:
+    """
+    Check whether the current unit of work wrote under a name, its reads then see uncommitted rows.
+    """
+    session = _current_session.get()
+    return session is not None and name in session.info.get(WRITTEN_KEY, ())
+
+def pop_after_commit(session: Any) -> List[AfterCommitCallback]:
+    """
+    Take the callbacks registered on a session, so a rolled back or retried session never runs them.
+    """
+    return session.info.pop(AFTER_COMMIT_KEY, [])
+
+async def run_after_commit(callbacks: List[AfterCommitCallback]) -> None:
+    """
+    Run the callbacks of a committed unit of work, in registration order.
+    The data is already committed, so a failing callback is logged and does not fail the request.
+
+    Args:
+        callbacks: The callbacks taken with pop_after_commit
+    """
+    for callback in callbacks:
+        try:
+            await callback()
+        except Exception as e:
+            logger.exception(f"After-commit callback failed: {e}")
@@ -1,2 +1,2 @@
 from .banner import get_banner
-from .password import verify_password, hash_password
+from .password import verify_password, hash_password, verify_password_async, hash_password_async, PasswordHashPool, PasswordHasherBusyError
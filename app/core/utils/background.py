@@ -0,0 +1,23 @@
+import asyncio
+import contextvars
+from typing import Coroutine, Set
+
+# Strong references, the event loop only keeps weak ones to running tasks
+_background_tasks: Set[asyncio.Task] = set()
+
+def run_in_background(coro: Coroutine) -> asyncio.Task:
+    """
+    Run a coroutine detached from the current request.
+    The task starts from an empty context, so the request's unit of work session
+    and read routing do not leak into it after the request has finished.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        The task running the coroutine
+    """
+    task = asyncio.create_task(coro, context=contextvars.Context())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
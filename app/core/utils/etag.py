@@ -0,0 +1,48 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from a data version or content.
+
+    Args:
+        parts: Values identifying the representation, e.g. a route name and a data version
+
+    Returns:
+        The quoted ETag
+    """
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check the request's If-None-Match header against an ETag.
+
+    Args:
+        request: The incoming request
+        etag: The current ETag of the resource
+
+    Returns:
+        True if the client already holds the current representation
+    """
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    """
+    Build an empty 304 response carrying the validators of the unchanged resource.
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
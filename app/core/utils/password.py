@@ -1,4 +1,16 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+from app.core.logging import logger
+
+T = TypeVar("T")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -25,4 +37,161 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if the password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password) 
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password) 
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a hash was made with a lower cost than the configured one.
+    
+    Args:
+        hashed_password: The hashed password
+        
+    Returns:
+        True if the password should be hashed again
+    """
+    return pwd_context.needs_update(hashed_password)
+
+def configure_password_rounds(rounds: int) -> None:
+    # New hashes use the cost, hashes below it are reported by password_needs_rehash
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+def _time_hash(rounds: int) -> float:
+    started = time.perf_counter()
+    bcrypt.using(rounds=rounds).hash("calibration")
+    return time.perf_counter() - started
+
+class PasswordHasherBusyError(Exception):
+    """
+    Raised when more password hashes are pending than PASSWORD_HASH_MAX_PENDING allows.
+    """
+
+class PasswordHashPool:
+    """
+    Runs bcrypt on a dedicated thread pool so hashing never blocks the event loop.
+    bcrypt releases the GIL, so PASSWORD_HASH_WORKERS hashes run in parallel.
+    At most PASSWORD_HASH_MAX_PENDING hashes may be running or queued, further calls fail fast
+    with PasswordHasherBusyError so a login storm is shed instead of stalling the worker.
+    """
+    _instance = None
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__reset()
+        return cls._instance
+
+    def __reset(self) -> None:
+        self.max_workers = settings.PASSWORD_HASH_WORKERS
+        self.max_pending = settings.PASSWORD_HASH_MAX_PENDING
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self.executor
+
+    def __release(self, hash_seconds: float, wait_seconds: float) -> None:
+        self.pending -= 1
+        self.completed += 1
+        self.hash_seconds += hash_seconds
+        self.wait_seconds += wait_seconds
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run a password function on the pool.
+
+        Args:
+            func: hash_password or verify_password
+            args: The function arguments
+
+        Returns:
+            The function result
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusyError(f"{self.pending} password hashes pending")
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                # Counted when the thread finishes, even if the awaiting request was cancelled
+                loop.call_soon_threadsafe(self.__release, time.perf_counter() - started, started - submitted)
+
+        self.pending += 1
+        try:
+            future = self.__get_executor().submit(timed)
+        except Exception:
+            self.pending -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "running": min(self.pending, self.max_workers),
+            "queue_depth": max(self.pending - self.max_workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_hash_ms": round(self.hash_seconds * 1000 / self.completed, 1) if self.completed else 0.0,
+            "avg_wait_ms": round(self.wait_seconds * 1000 / self.completed, 1) if self.completed else 0.0,
+        }
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password with bcrypt on the password hash pool.
+    
+    Args:
+        password: The password to hash
+        
+    Returns:
+        The hashed password
+    """
+    return await PasswordHashPool().run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash on the password hash pool.
+    
+    Args:
+        plain_password: The plain text password
+        hashed_password: The hashed password
+        
+    Returns:
+        True if the password matches, False otherwise
+    """
+    return await PasswordHashPool().run(verify_password, plain_password, hashed_password)
+
+
+async def calibrate_password_rounds() -> int:
+    """
+    Pick the bcrypt cost for this host and apply it.
+    With PASSWORD_HASH_CALIBRATE the cost is the highest one hashing within PASSWORD_HASH_TARGET_MS,
+    each extra round doubles the time, clamped to PASSWORD_HASH_MIN_ROUNDS..PASSWORD_HASH_MAX_ROUNDS.
+    Otherwise PASSWORD_HASH_ROUNDS is used as is.
+    
+    Returns:
+        The bcrypt cost
+    """
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    if settings.PASSWORD_HASH_CALIBRATE:
+        # Best of two samples, the first one may pay for thread start-up
+        seconds = min([await PasswordHashPool().run(_time_hash, settings.PASSWORD_HASH_MIN_ROUNDS) for _ in range(2)])
+        extra_rounds = math.floor(math.log2(settings.PASSWORD_HASH_TARGET_MS / 1000 / seconds)) if seconds > 0 else 0
+        rounds = max(settings.PASSWORD_HASH_MIN_ROUNDS, min(settings.PASSWORD_HASH_MAX_ROUNDS, settings.PASSWORD_HASH_MIN_ROUNDS + extra_rounds))
+        logger.info(f"Calibrated bcrypt cost {rounds}: cost {settings.PASSWORD_HASH_MIN_ROUNDS} hashes in {seconds * 1000:.0f} ms, target {settings.PASSWORD_HASH_TARGET_MS} ms")
+    configure_password_rounds(rounds)
+    return rounds
@@ -3,6 +3,7 @@ from app.infrastructure.middleware.cors import setup_cors_middleware
 from app.infrastructure.middleware.logging import setup_logging_middleware
 from app.infrastructure.middleware.error_handler import setup_error_handler_middleware
 from app.infrastructure.middleware.swagger import setup_swagger_middleware
+from app.infrastructure.middleware.db_session import setup_db_session_middleware
 
 def setup_middleware(app: FastAPI) -> None:
     """
@@ -12,6 +13,7 @@ def setup_middleware(app: FastAPI) -> None:
         app (FastAPI): The FastAPI application instance
     """
     # Setup middleware in order of execution
+    setup_db_session_middleware(app)     # Innermost, so route errors roll the request session back
     setup_error_handler_middleware(app)  # First to catch all errors
     setup_logging_middleware(app)        # Then to log requests
     setup_cors_middleware(app)           # Then to handle CORS
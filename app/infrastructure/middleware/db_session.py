@@ -0,0 +1,30 @@
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.data.db_factory import DBFactory
+from app.core.data.read_routing import reset_read_routing, stick_to_primary
+
+# Requests with these methods only read, they may be served by a read replica
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+class DbSessionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        # Writes, and reads asking for read-your-writes, stay on the primary
+        token = None
+        if request.method not in READ_ONLY_METHODS or request.headers.get("X-Read-Primary"):
+            token = stick_to_primary()
+        try:
+            # One session per request, shared by every repository and committed once
+            async with DBFactory().get_provider().session_scope():
+                return await call_next(request)
+        finally:
+            if token is not None:
+                reset_read_routing(token)
+
+def setup_db_session_middleware(app: FastAPI) -> None:
+    """
+    Configure the request-scoped database session middleware for the application.
+    
+    Args:
+        app (FastAPI): The FastAPI application instance
+    """
+    app.add_middleware(DbSessionMiddleware)
@@ -4,11 +4,23 @@ from starlette.middleware.base import BaseHTTPMiddleware
 import traceback
 import sys
 from app.core.logging import logger
+from app.core.utils.password import PasswordHasherBusyError
 
 class ErrorHandlerMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         try:
             return await call_next(request)
+        except PasswordHasherBusyError as e:
+            # Shed the request quickly, the client retries once the hash queue drains
+            logger.warning(f"Password hash pool is full: {str(e)}")
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "error": "Service Unavailable",
+                    "detail": "Too many concurrent sign-ins, please retry"
+                },
+                headers={"Retry-After": "1"}
+            )
         except Exception as e:
             # Log the error with traceback information
             exc_type, exc_value, exc_traceback = sys.exc_info()
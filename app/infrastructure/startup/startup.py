@@ -1,11 +1,16 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.business.application_info.services import ApplicationInfoService
 from app.core.data import DBFactory
+from app.core.cache import CacheFactory
+from app.core.data.expiry import run_expiry_job
+from app.core.data.indexes import log_index_report
 from app.core.config import settings
 from app.core.logging import logger
-from app.core.utils import get_banner
+from app.core.utils import get_banner, PasswordHashPool
+from app.core.utils.password import calibrate_password_rounds
 from app.core.container import Container
 
 @asynccontextmanager
@@ -20,17 +25,25 @@ async def lifespan(app: FastAPI):
     get_banner()
 
     # Initialize Db
-    DBFactory().get_provider().create_table()
+    db_provider = DBFactory().get_provider()
+    await db_provider.create_table()
+    log_index_report(await db_provider.get_index_report())
     application_info_service: ApplicationInfoService = Container.application_info_service()
     await application_info_service.set_application_info()
     logger.info("Connected to Database and initialized repositories")
+    await calibrate_password_rounds()
+    expiry_job = asyncio.create_task(run_expiry_job(db_provider))
 
     yield
 
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
+    expiry_job.cancel()
     await DBFactory().get_provider().close()
     logger.info("Closed Database connection")
+    await CacheFactory().get_provider().close()
+    logger.info("Closed Cache connection")
+    PasswordHashPool().close()
 
 def setup_startup_events(app: FastAPI) -> None:
     """
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.business.account.schema import User
+from app.business.account.service.user_service import UserService
+from app.business.auth.services.auth_service import AuthService
+from app.core.data.mongo_db.mongo_repository import MongoRepository
+from app.core.utils import background
+from app.core.utils.password import configure_password_rounds, hash_password, pwd_context
+from tests.core.data.mongo_db.fake_collection import FakeCollection, FakeDatabase
+
+@pytest.fixture(autouse=True)
+def password_context():
+    saved = pwd_context.to_dict()
+    yield
+    pwd_context.load(saved)
+
+@pytest.fixture
+def users() -> FakeCollection:
+    return FakeCollection("users")
+
+@pytest.fixture
+def auth_service(users) -> AuthService:
+    user_service = UserService()
+    user_service.repository = MongoRepository(FakeDatabase(users=users), User)
+    return AuthService(user_service, refresh_token_service=None)
+
+async def wait_for_background_tasks() -> None:
+    await asyncio.gather(*background._background_tasks)
+
+def add_user(users: FakeCollection, password_hash: str) -> None:
+    users.documents.append({"_id": ObjectId(), "username": "admin", "email": "admin@example.com", "password": password_hash, "language": "en", "avatar": "https://gravatar.com/avatar/admin", "is_active": True})
+
+def test_login_with_an_outdated_cost_stores_the_new_hash(users, auth_service):
+    configure_password_rounds(4)
+    add_user(users, hash_password("secret"))
+    configure_password_rounds(5)
+
+    async def scenario():
+        user = await auth_service.authenticate_user("admin", "secret")
+        assert user is not None
+        await wait_for_background_tasks()
+
+    asyncio.run(scenario())
+    stored = users.documents[0]["password"]
+    assert stored.startswith("$2b$05$")
+    assert pwd_context.verify("secret", stored)
+    # Nothing else of the user is touched
+    assert users.documents[0]["email"] == "admin@example.com"
+
+def test_login_with_the_current_cost_keeps_the_hash(users, auth_service):
+    configure_password_rounds(4)
+    password_hash = hash_password("secret")
+    add_user(users, password_hash)
+
+    async def scenario():
+        assert await auth_service.authenticate_user("admin", "secret") is not None
+        await wait_for_background_tasks()
+
+    asyncio.run(scenario())
+    assert users.documents[0]["password"] == password_hash
+    assert "update_one" not in users.calls
+
+def test_failed_login_does_not_rehash(users, auth_service):
+    configure_password_rounds(4)
+    password_hash = hash_password("secret")
+    add_user(users, password_hash)
+    configure_password_rounds(5)
+    assert asyncio.run(auth_service.authenticate_user("admin", "wrong")) is None
+    assert users.documents[0]["password"] == password_hash
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from bson import ObjectId
+
+from app.business.account.schema import User, UserRole
+from app.business.account.service.user_service import UserService
+from app.business.auth.entities import RefreshToken
+from app.business.auth.services.auth_service import AuthService
+from app.business.auth.services.refresh_token_service import RefreshTokenService
+from app.core.cache.memory_cache import MemoryCache
+from app.core.data.mongo_db.mongo_repository import MongoRepository
+from tests.core.data.mongo_db.fake_collection import FakeCollection, FakeDatabase
+
+@pytest.fixture
+def database() -> FakeDatabase:
+    return FakeDatabase(users=FakeCollection("users"), userRoles=FakeCollection("userRoles"), refresh=FakeCollection("refresh", unique=["jti"]))
+
+@pytest.fixture
+def refresh_token_service(database) -> RefreshTokenService:
+    service = RefreshTokenService()
+    service.repository = MongoRepository(database, RefreshToken)
+    service.cache = MemoryCache(max_entries=100, default_ttl=60)
+    return service
+
+@pytest.fixture
+def auth_service(database, refresh_token_service) -> AuthService:
+    user_service = UserService()
+    user_service.repository = MongoRepository(database, User)
+    user_service.user_role_repository = MongoRepository(database, UserRole)
+    return AuthService(user_service, refresh_token_service)
+
+def add_user(database: FakeDatabase) -> User:
+    database.get_collection("users").documents.append({"_id": ObjectId(), "username": "admin", "email": "admin@example.com", "password": "", "language": "en", "avatar": "https://gravatar.com/avatar/admin", "is_active": True})
+    return asyncio.run(MongoRepository(database, User).find_one({"username": "admin"}))
+
+def test_only_a_digest_of_the_token_is_stored(database, refresh_token_service):
+    asyncio.run(refresh_token_service.store("user", "jti-1", "encoded.refresh.token", datetime.now(UTC) + timedelta(days=1)))
+
+    stored = database.get_collection("refresh").documents[0]
+    assert stored["jti"] == "jti-1"
+    assert stored["token"] != "encoded.refresh.token"
+    assert len(stored["token"]) == 64
+    assert stored["is_active"] is True
+
+def test_token_is_valid_until_revoked(refresh_token_service):
+    async def scenario():
+        await refresh_token_service.store("user", "jti-1", "token", datetime.now(UTC) + timedelta(days=1))
+        assert not await refresh_token_service.is_revoked("jti-1", "token")
+        assert await refresh_token_service.revoke("jti-1")
+        # A second revoke finds no active token, so a concurrent refresh cannot rotate it again
+        assert not await refresh_token_service.revoke("jti-1")
+        assert await refresh_token_service.is_revoked("jti-1", "token")
+
+    asyncio.run(scenario())
+
+def test_unknown_expired_or_mismatched_tokens_are_revoked(refresh_token_service):
+    async def scenario():
+        await refresh_token_service.store("user", "expired", "token", datetime.now(UTC) - timedelta(seconds=1))
+        await refresh_token_service.store("user", "active", "token", datetime.now(UTC) + timedelta(days=1))
+        assert await refresh_token_service.is_revoked("unknown", "token")
+        assert await refresh_token_service.is_revoked("expired", "token")
+        assert await refresh_token_service.is_revoked("active", "another token")
+
+    asyncio.run(scenario())
+
+def test_revoked_token_is_answered_from_the_cache(database, refresh_token_service):
+    async def scenario():
+        await refresh_token_service.store("user", "jti-1", "token", datetime.now(UTC) + timedelta(days=1))
+        await refresh_token_service.revoke("jti-1")
+        database.get_collection("refresh").calls.clear()
+        assert await refresh_token_service.is_revoked("jti-1", "token")
+
+    asyncio.run(scenario())
+    assert database.get_collection("refresh").calls == []
+
+def test_refresh_rotates_the_token_and_rejects_a_replay(database, auth_service):
+    user = add_user(database)
+
+    async def scenario():
+        issued = await auth_service.get_token_data(user)
+        rotated = await auth_service.refresh_token_data(issued.refresh_token)
+        assert rotated is not None
+        assert rotated.refresh_token != issued.refresh_token
+        # The used token was revoked by the rotation, replaying it fails
+        assert await auth_service.refresh_token_data(issued.refresh_token) is None
+        assert await auth_service.refresh_token_data(rotated.refresh_token) is not None
+
+    asyncio.run(scenario())
+
+def test_logout_revokes_the_refresh_token(database, auth_service):
+    user = add_user(database)
+
+    async def scenario():
+        issued = await auth_service.get_token_data(user)
+        assert await auth_service.revoke_refresh_token(issued.refresh_token)
+        assert await auth_service.refresh_token_data(issued.refresh_token) is None
+        assert await auth_service.refresh_token_data("not a token") is None
+
+    asyncio.run(scenario())
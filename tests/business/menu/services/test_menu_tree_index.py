@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.business.menu.schema.menu import Menu
+from app.business.menu.schema.menu_role import MenuRole
+from app.business.menu.services import menu_tree_index
+from app.business.menu.services.menu_tree_index import MenuTreeIndex
+from app.core.cache import CacheFactory
+from app.core.cache.memory_cache import MemoryCache
+from app.core.data.mongo_db.mongo_repository import MongoRepository
+from tests.core.data.mongo_db.fake_collection import FakeCollection, FakeDatabase
+
+ROLE_ID = ObjectId()
+OTHER_ROLE_ID = ObjectId()
+
+class FakeRepositoryFactory:
+    def __init__(self, database: FakeDatabase):
+        self.database = database
+
+    def get_repository(self, model):
+        return MongoRepository(self.database, model)
+
+@pytest.fixture
+def database(monkeypatch) -> FakeDatabase:
+    database = FakeDatabase(menus=FakeCollection("menus"), menuRoles=FakeCollection("menuRoles"))
+    monkeypatch.setattr(menu_tree_index, "RepositoryFactory", lambda: FakeRepositoryFactory(database))
+    monkeypatch.setattr(CacheFactory(), "provider", MemoryCache(max_entries=100, default_ttl=60))
+    monkeypatch.setattr(MenuTreeIndex, "_instance", None)
+    return database
+
+def add_menu(database: FakeDatabase, key: str, sort_order: int, parent_id: ObjectId = None, role_ids=(ROLE_ID,)) -> ObjectId:
+    menu_id = ObjectId()
+    database.get_collection("menus").documents.append({
+        "_id": menu_id,
+        "key": key,
+        "name": key,
+        "path": f"/{key}",
+        "sortOrder": sort_order,
+        "parentId": str(parent_id) if parent_id is not None else None,
+        "isActive": True,
+    })
+    for role_id in role_ids:
+        database.get_collection("menuRoles").documents.append({"_id": ObjectId(), "menu_id": menu_id, "role_id": role_id})
+    return menu_id
+
+def test_role_tree_nests_menus_loaded_from_mongo(database):
+    dashboard_id = add_menu(database, "dashboard", 1)
+    add_menu(database, "reports", 2, parent_id=dashboard_id)
+    add_menu(database, "overview", 1, parent_id=dashboard_id)
+    add_menu(database, "settings", 2, role_ids=(OTHER_ROLE_ID,))
+
+    tree = asyncio.run(MenuTreeIndex().get_role_tree(str(ROLE_ID)))
+
+    assert [node.key for node in tree] == ["dashboard"]
+    assert tree[0].id == str(dashboard_id)
+    assert [child.key for child in tree[0].children] == ["overview", "reports"]
+    assert all(child.parentId == str(dashboard_id) for child in tree[0].children)
+
+def test_children_are_keyed_by_the_mongo_id(database):
+    dashboard_id = add_menu(database, "dashboard", 1)
+    add_menu(database, "overview", 1, parent_id=dashboard_id)
+
+    async def scenario():
+        index = MenuTreeIndex()
+        roots = await index.get_children(None)
+        assert [menu.id for menu in roots] == [dashboard_id]
+        assert [menu.key for menu in await index.get_children(dashboard_id)] == ["overview"]
+        # Every menu is indexed under its own id, none collapse onto a missing one
+        assert set(index.menus) == {str(document["_id"]) for document in database.get_collection("menus").documents}
+
+    asyncio.run(scenario())
+
+def test_role_link_added_after_load_shows_the_menu(database):
+    settings_id = add_menu(database, "settings", 1, role_ids=())
+
+    async def scenario():
+        index = MenuTreeIndex()
+        assert await index.get_role_tree(str(ROLE_ID)) == []
+        await index.add_role_link(settings_id, ROLE_ID)
+        assert [node.key for node in await index.get_role_tree(str(ROLE_ID))] == ["settings"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.business.account.schema.role import Role
+from app.business.permission.schema.permission import Permission
+from app.business.permission.services import permission_matrix
+from app.business.permission.services.permission_matrix import PermissionMatrix, PermissionMatrixStore
+from app.core.cache import CacheFactory
+from app.core.cache.memory_cache import MemoryCache
+from app.core.data.mongo_db.mongo_repository import MongoRepository
+from tests.core.data.mongo_db.fake_collection import FakeCollection, FakeDatabase
+
+ADMIN = str(ObjectId())
+EDITOR = str(ObjectId())
+
+def grant(role_id: str, resource: str, action: str) -> Permission:
+    return Permission(name=f"{resource}.{action}", resource=resource, action=action, role_id=role_id)
+
+def test_role_can_only_what_it_was_granted():
+    matrix = PermissionMatrix.build(1, [grant(EDITOR, "post", "read"), grant(EDITOR, "post", "update"), grant(ADMIN, "user", "delete")])
+
+    assert matrix.can([EDITOR], "post", "update")
+    assert not matrix.can([EDITOR], "post", "delete")
+    assert not matrix.can([EDITOR], "user", "delete")
+    assert matrix.can([EDITOR, ADMIN], "user", "delete")
+
+def test_wildcard_action_grants_every_action_on_its_resource():
+    matrix = PermissionMatrix.build(1, [grant(ADMIN, "user", "*"), grant(EDITOR, "user", "read")])
+
+    assert matrix.can([ADMIN], "user", "delete")
+    assert not matrix.can([EDITOR], "user", "delete")
+    assert not matrix.can([ADMIN], "post", "read")
+
+def test_unknown_resource_or_role_is_denied():
+    matrix = PermissionMatrix.build(1, [grant(ADMIN, "user", "read")])
+
+    assert not matrix.can([ADMIN], "billing", "read")
+    assert not matrix.can([str(ObjectId())], "user", "read")
+    assert not matrix.can([], "user", "read")
+
+def test_inactive_roles_are_left_out():
+    matrix = PermissionMatrix.build(1, [grant(ADMIN, "user", "read"), grant(EDITOR, "user", "read")], active_role_ids={ADMIN})
+
+    assert matrix.can([ADMIN], "user", "read")
+    assert not matrix.can([EDITOR], "user", "read")
+
+class FakeRepositoryFactory:
+    def __init__(self, database: FakeDatabase):
+        self.database = database
+
+    def get_repository(self, model):
+        return MongoRepository(self.database, model)
+
+@pytest.fixture
+def database(monkeypatch) -> FakeDatabase:
+    database = FakeDatabase(permissions=FakeCollection("permissions"), roles=FakeCollection("roles"))
+    monkeypatch.setattr(permission_matrix, "RepositoryFactory", lambda: FakeRepositoryFactory(database))
+    monkeypatch.setattr(CacheFactory(), "provider", MemoryCache(max_entries=100, default_ttl=60))
+    monkeypatch.setattr(PermissionMatrixStore, "_instance", None)
+    return database
+
+def test_store_builds_the_matrix_from_mongo_ids(database):
+    admin_id, disabled_id = ObjectId(), ObjectId()
+    database.get_collection("roles").documents.extend([
+        {"_id": admin_id, "name": "Admin", "is_active": True},
+        {"_id": disabled_id, "name": "Disabled", "is_active": False},
+    ])
+    database.get_collection("permissions").documents.extend([
+        {"_id": ObjectId(), "name": "user.read", "resource": "user", "action": "read", "role_id": admin_id},
+        {"_id": ObjectId(), "name": "user.read", "resource": "user", "action": "read", "role_id": disabled_id},
+    ])
+
+    matrix = asyncio.run(PermissionMatrixStore().get_matrix())
+
+    assert matrix.can([str(admin_id)], "user", "read")
+    assert not matrix.can([str(disabled_id)], "user", "read")
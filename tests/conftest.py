@@ -0,0 +1,7 @@
+# Register every table model, relationships between them are resolved by name when a mapper is first used
+import app.business.account.schema  # noqa: F401
+import app.business.application_info.schema  # noqa: F401
+import app.business.auth.entities  # noqa: F401
+import app.business.menu.schema.menu  # noqa: F401
+import app.business.permission.schema  # noqa: F401
+import app.business.setting.schema  # noqa: F401
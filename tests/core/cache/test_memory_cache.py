@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import memory_cache
+from app.core.cache.memory_cache import MemoryCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(memory_cache.time, "monotonic", clock)
+    return clock
+
+def test_get_returns_default_on_miss():
+    cache = MemoryCache(max_entries=10, default_ttl=60)
+
+    async def scenario():
+        assert await cache.get("missing") is None
+        assert await cache.get("missing", "fallback") == "fallback"
+        await cache.set("key", "value")
+        assert await cache.get("key") == "value"
+
+    asyncio.run(scenario())
+
+def test_evicts_least_recently_used_entry():
+    cache = MemoryCache(max_entries=2, default_ttl=60)
+
+    async def scenario():
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        # Reading a makes b the least recently used entry
+        assert await cache.get("a") == 1
+        await cache.set("c", 3)
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert await cache.get("c") == 3
+        assert (await cache.get_stats())["evictions"] == 1
+
+    asyncio.run(scenario())
+
+def test_overwriting_a_key_does_not_evict():
+    cache = MemoryCache(max_entries=2, default_ttl=60)
+
+    async def scenario():
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.set("a", 10)
+        assert await cache.get("a") == 10
+        assert await cache.get("b") == 2
+        assert (await cache.get_stats())["evictions"] == 0
+
+    asyncio.run(scenario())
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = MemoryCache(max_entries=10, default_ttl=60)
+
+    async def scenario():
+        await cache.set("default", 1)
+        await cache.set("short", 2, ttl=5)
+        clock.now += 5
+        assert await cache.get("short") is None
+        assert await cache.get("default") == 1
+        clock.now += 55
+        assert await cache.get("default") is None
+        stats = await cache.get_stats()
+        assert stats["expirations"] == 2
+        assert stats["entries"] == 0
+
+    asyncio.run(scenario())
+
+def test_zero_ttl_never_expires(clock):
+    cache = MemoryCache(max_entries=10, default_ttl=60)
+
+    async def scenario():
+        await cache.set("key", "value", ttl=0)
+        clock.now += 10 ** 9
+        assert await cache.get("key") == "value"
+
+    asyncio.run(scenario())
+
+def test_delete_prefix_and_clear():
+    cache = MemoryCache(max_entries=10, default_ttl=60)
+
+    async def scenario():
+        await cache.set("repo:Role:id:1", 1)
+        await cache.set("repo:Role:id:2", 2)
+        await cache.set("repo:Menu:id:1", 3)
+        assert await cache.delete_prefix("repo:Role:") == 2
+        assert await cache.get("repo:Role:id:1") is None
+        assert await cache.get("repo:Menu:id:1") == 3
+        await cache.delete("repo:Menu:id:1")
+        assert await cache.get("repo:Menu:id:1") is None
+        await cache.set("key", "value")
+        await cache.clear()
+        assert (await cache.get_stats())["entries"] == 0
+
+    asyncio.run(scenario())
+
+def test_stats_count_hits_and_misses():
+    cache = MemoryCache(max_entries=10, default_ttl=60)
+
+    async def scenario():
+        await cache.set("key", "value")
+        await cache.get("key")
+        await cache.get("key")
+        await cache.get("missing")
+        stats = await cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.667
+
+    asyncio.run(scenario())
+
+def test_get_or_set_loads_once():
+    cache = MemoryCache(max_entries=10, default_ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return "loaded"
+
+    async def scenario():
+        assert await cache.get_or_set("key", loader) == "loaded"
+        assert await cache.get_or_set("key", loader) == "loaded"
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
@@ -0,0 +1,130 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from app.core.cache import CacheFactory, SnapshotStore
+from app.core.cache.memory_cache import MemoryCache
+from app.core.data.unit_of_work import pop_after_commit, reset_current_session, run_after_commit, set_current_session
+
+VERSION_KEY = "test_snapshot:version"
+
+class CountingStore(SnapshotStore[Tuple[int, int]]):
+    """
+    Snapshot of (version, build number), so tests see which build a reader got.
+    """
+    version_key = VERSION_KEY
+
+    async def build(self, version: int) -> Tuple[int, int]:
+        # Yield like a database read would, so concurrent readers interleave
+        await asyncio.sleep(0)
+        self.builds.append(version)
+        return version, len(self.builds)
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+
+@pytest.fixture
+def cache(monkeypatch) -> MemoryCache:
+    cache = MemoryCache(max_entries=100, default_ttl=60)
+    monkeypatch.setattr(CacheFactory(), "provider", cache)
+    return cache
+
+@pytest.fixture
+def store(cache) -> CountingStore:
+    CountingStore._instance = None
+    store = CountingStore()
+    store.builds: List[int] = []
+    yield store
+    CountingStore._instance = None
+
+def test_store_is_a_singleton(store):
+    assert CountingStore() is store
+
+def test_first_get_builds_and_publishes_the_version(store, cache):
+    async def scenario():
+        version, build = await store.get()
+        assert build == 1
+        assert await cache.get(VERSION_KEY) == version
+        # The same version is served without rebuilding
+        assert await store.get() == (version, 1)
+
+    asyncio.run(scenario())
+    assert len(store.builds) == 1
+
+def test_get_rebuilds_when_another_worker_published_a_version(store, cache):
+    async def scenario():
+        first_version, _ = await store.get()
+        await cache.set(VERSION_KEY, first_version + 1, ttl=0)
+        assert await store.get() == (first_version + 1, 2)
+        assert store.version == first_version + 1
+
+    asyncio.run(scenario())
+
+def test_get_keeps_the_snapshot_when_the_shared_version_is_gone(store, cache):
+    async def scenario():
+        snapshot = await store.get()
+        # e.g. the cache was flushed or the entry evicted
+        await cache.delete(VERSION_KEY)
+        assert await store.get() == snapshot
+
+    asyncio.run(scenario())
+    assert len(store.builds) == 1
+
+def test_concurrent_first_reads_build_once(store):
+    async def scenario():
+        snapshots = await asyncio.gather(*[store.get() for _ in range(10)])
+        assert len(set(snapshots)) == 1
+
+    asyncio.run(scenario())
+    assert len(store.builds) == 1
+
+def test_reload_outside_a_unit_of_work_swaps_at_once(store, cache):
+    async def scenario():
+        first_version, _ = await store.get()
+        await store.reload()
+        version, build = await store.get()
+        assert version != first_version
+        assert build == 2
+        assert await cache.get(VERSION_KEY) == version
+
+    asyncio.run(scenario())
+
+def test_reload_inside_a_unit_of_work_waits_for_commit(store, cache):
+    async def scenario():
+        snapshot = await store.get()
+        session = FakeSession()
+        token = set_current_session(session)
+        try:
+            await store.reload()
+            # Nothing is published while the write is uncommitted
+            assert await cache.get(VERSION_KEY) == snapshot[0]
+            assert await store.get() == snapshot
+        finally:
+            reset_current_session(token)
+        await run_after_commit(pop_after_commit(session))
+        version, build = await store.get()
+        assert version != snapshot[0]
+        assert build == 2
+        assert await cache.get(VERSION_KEY) == version
+
+    asyncio.run(scenario())
+
+def test_reload_is_dropped_when_the_unit_of_work_rolls_back(store, cache):
+    async def scenario():
+        snapshot = await store.get()
+        session = FakeSession()
+        token = set_current_session(session)
+        try:
+            await store.reload()
+        finally:
+            reset_current_session(token)
+        # A rolled back scope takes the callbacks without running them
+        pop_after_commit(session)
+        await run_after_commit(pop_after_commit(session))
+        assert await store.get() == snapshot
+        assert await cache.get(VERSION_KEY) == snapshot[0]
+
+    asyncio.run(scenario())
+    assert len(store.builds) == 1
@@ -0,0 +1,220 @@
+import copy
+import re
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+def _compare(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+        for operator, operand in condition.items():
+            if operator == "$in" and value not in operand:
+                return False
+            if operator == "$gt" and not (value is not None and value > operand):
+                return False
+            if operator == "$lt" and not (value is not None and value < operand):
+                return False
+            if operator == "$regex" and not (isinstance(value, str) and re.search(operand, value)):
+                return False
+        return True
+    return value == condition
+
+def matches(document: Dict[str, Any], filter_dict: Dict[str, Any]) -> bool:
+    for key, condition in (filter_dict or {}).items():
+        if key == "$and":
+            if not all(matches(document, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif not _compare(document.get(key), condition):
+            return False
+    return True
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    if not projection:
+        return copy.deepcopy(document)
+    return {key: copy.deepcopy(value) for key, value in document.items() if key == "_id" or key in projection}
+
+def _run_pipeline(documents: List[Dict[str, Any]], pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # The stages find_paging sends: $match, $sort, $skip, $limit, $project, $count and $facet
+    for stage in pipeline:
+        (operator, argument), = stage.items()
+        if operator == "$match":
+            documents = [document for document in documents if matches(document, argument)]
+        elif operator == "$sort":
+            documents = FakeCursor(list(documents)).sort(argument).documents
+        elif operator == "$skip":
+            documents = documents[argument:]
+        elif operator == "$limit":
+            documents = documents[:argument]
+        elif operator == "$project":
+            documents = [_project(document, argument) for document in documents]
+        elif operator == "$count":
+            documents = [{argument: len(documents)}] if documents else []
+        elif operator == "$facet":
+            documents = [{name: _run_pipeline(documents, stages) for name, stages in argument.items()}]
+        else:
+            raise NotImplementedError(operator)
+    return documents
+
+class FakeCursor:
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.documents = documents
+        self.__skip = 0
+        self.__limit = 0
+        self.closed = False
+
+    def sort(self, sort):
+        for field, direction in reversed(list(sort.items() if isinstance(sort, dict) else sort)):
+            self.documents.sort(key=lambda document: document.get(field), reverse=direction == -1)
+        return self
+
+    def skip(self, skip: int):
+        self.__skip = skip
+        return self
+
+    def limit(self, limit: int):
+        self.__limit = limit
+        return self
+
+    def __window(self) -> List[Dict[str, Any]]:
+        documents = self.documents[self.__skip:]
+        return documents[:self.__limit] if self.__limit else documents
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        documents = self.__window()
+        return documents[:length] if length else documents
+
+    def __aiter__(self):
+        self.__iterator = iter(self.__window())
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.__iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self) -> None:
+        self.closed = True
+
+class FakeCollection:
+    """
+    In-memory stand-in for pymongo's AsyncCollection, covering the calls MongoRepository makes.
+    Every server operation is recorded in calls, so tests can count round trips.
+    """
+    def __init__(self, name: str = "fake", unique: Optional[List[str]] = None):
+        self.name = name
+        self.documents: List[Dict[str, Any]] = []
+        self.unique = unique or []
+        self.calls: List[str] = []
+        self.cursors: List[FakeCursor] = []
+
+    def with_options(self, **kwargs) -> "FakeCollection":
+        return self
+
+    def __check_unique(self, document: Dict[str, Any]) -> None:
+        for field in ["_id", *self.unique]:
+            if any(existing.get(field) == document.get(field) for existing in self.documents if existing is not document):
+                raise DuplicateKeyError(f"duplicate key {field}")
+
+    def __insert(self, document: Dict[str, Any]) -> ObjectId:
+        document.setdefault("_id", ObjectId())
+        self.__check_unique(document)
+        self.documents.append(copy.deepcopy(document))
+        return document["_id"]
+
+    async def insert_one(self, document: Dict[str, Any]):
+        self.calls.append("insert_one")
+        return SimpleNamespace(inserted_id=self.__insert(document))
+
+    async def insert_many(self, documents: List[Dict[str, Any]]):
+        self.calls.append("insert_many")
+        return SimpleNamespace(inserted_ids=[self.__insert(document) for document in documents])
+
+    async def find_one(self, filter_dict: Dict[str, Any], projection: Optional[Dict[str, int]] = None):
+        self.calls.append("find_one")
+        for document in self.documents:
+            if matches(document, filter_dict):
+                return _project(document, projection)
+        return None
+
+    def find(self, filter_dict: Dict[str, Any], projection: Optional[Dict[str, int]] = None, batch_size: Optional[int] = None) -> FakeCursor:
+        self.calls.append("find")
+        cursor = FakeCursor([_project(document, projection) for document in self.documents if matches(document, filter_dict)])
+        self.cursors.append(cursor)
+        return cursor
+
+    async def aggregate(self, pipeline: List[Dict[str, Any]]) -> FakeCursor:
+        self.calls.append("aggregate")
+        return FakeCursor(_run_pipeline(copy.deepcopy(self.documents), pipeline))
+
+    def __update(self, document: Dict[str, Any], update: Dict[str, Any], inserted: bool) -> None:
+        document.update(copy.deepcopy(update.get("$set", {})))
+        if inserted:
+            document.update(copy.deepcopy(update.get("$setOnInsert", {})))
+
+    async def find_one_and_update(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False, return_document=ReturnDocument.BEFORE):
+        self.calls.append("find_one_and_update")
+        for document in self.documents:
+            if matches(document, filter):
+                before = copy.deepcopy(document)
+                self.__update(document, update, False)
+                return copy.deepcopy(document if return_document == ReturnDocument.AFTER else before)
+        if not upsert:
+            return None
+        document = {key: value for key, value in filter.items() if not key.startswith("$")}
+        self.__update(document, update, True)
+        self.__insert(document)
+        return copy.deepcopy(document) if return_document == ReturnDocument.AFTER else None
+
+    async def __update_matching(self, filter_dict: Dict[str, Any], update: Dict[str, Any], many: bool):
+        matched = 0
+        for document in self.documents:
+            if matches(document, filter_dict):
+                self.__update(document, update, False)
+                matched += 1
+                if not many:
+                    break
+        return SimpleNamespace(matched_count=matched, modified_count=matched)
+
+    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any]):
+        self.calls.append("update_one")
+        return await self.__update_matching(filter, update, False)
+
+    async def update_many(self, filter: Dict[str, Any], update: Dict[str, Any]):
+        self.calls.append("update_many")
+        return await self.__update_matching(filter, update, True)
+
+    async def delete_one(self, filter_dict: Dict[str, Any]):
+        self.calls.append("delete_one")
+        for document in self.documents:
+            if matches(document, filter_dict):
+                self.documents.remove(document)
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    async def delete_many(self, filter_dict: Dict[str, Any]):
+        self.calls.append("delete_many")
+        remaining = [document for document in self.documents if not matches(document, filter_dict)]
+        deleted = len(self.documents) - len(remaining)
+        self.documents = remaining
+        return SimpleNamespace(deleted_count=deleted)
+
+    async def count_documents(self, filter_dict: Dict[str, Any]) -> int:
+        self.calls.append("count_documents")
+        return sum(1 for document in self.documents if matches(document, filter_dict))
+
+    async def estimated_document_count(self) -> int:
+        self.calls.append("estimated_document_count")
+        return len(self.documents)
+
+class FakeDatabase:
+    def __init__(self, **collections: FakeCollection):
+        self.collections = collections
+
+    def get_collection(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection(name))
@@ -0,0 +1,160 @@
+import asyncio
+
+from bson import ObjectId
+
+from app.business.common.model.pagingation.pagination_request import PaginationRequest
+from app.business.menu.model.menu_viewmodel import MenuUpdate
+from app.business.menu.schema.menu import Menu
+from app.core.data.mongo_db.mongo_repository import MongoRepository
+from tests.core.data.mongo_db.fake_collection import FakeCollection, FakeDatabase
+
+def make_repository() -> tuple[MongoRepository, FakeCollection]:
+    collection = FakeCollection("menus")
+    return MongoRepository(FakeDatabase(menus=collection), Menu), collection
+
+def make_menu(key: str, **fields) -> Menu:
+    return Menu(key=key, path=f"/{key}", name=key, isActive=True, **fields)
+
+def test_insert_one_returns_the_generated_id():
+    repository, collection = make_repository()
+
+    async def scenario():
+        menu = await repository.insert_one(make_menu("dashboard"))
+        stored = collection.documents[0]
+        assert isinstance(menu.id, ObjectId)
+        assert menu.id == stored["_id"]
+        assert menu.key == "dashboard"
+        # The id is stored once, as _id
+        assert "id" not in stored
+
+    asyncio.run(scenario())
+
+def test_insert_one_without_return_document_skips_the_model():
+    repository, collection = make_repository()
+    assert asyncio.run(repository.insert_one(make_menu("dashboard"), return_document=False)) is None
+    assert len(collection.documents) == 1
+
+def test_insert_many_returns_models_with_ids():
+    repository, collection = make_repository()
+    menus = asyncio.run(repository.insert_many([make_menu("a"), make_menu("b")]))
+    assert [menu.id for menu in menus] == [document["_id"] for document in collection.documents]
+    assert collection.calls == ["insert_many"]
+
+def test_reads_map_the_document_id():
+    repository, _ = make_repository()
+
+    async def scenario():
+        created = await repository.insert_one(make_menu("dashboard"))
+        assert (await repository.find_by_id(str(created.id))).id == created.id
+        assert (await repository.find_one({"key": "dashboard"})).id == created.id
+        assert [menu.id for menu in await repository.find_many({})] == [created.id]
+        assert [menu.id for menu in await repository.list()] == [created.id]
+        batches = [batch async for batch in repository.iter_many({})]
+        assert [menu.id for menu in batches[0]] == [created.id]
+
+    asyncio.run(scenario())
+
+def test_documents_written_with_a_null_id_field_still_map_their_id():
+    repository, collection = make_repository()
+    _id = ObjectId()
+    collection.documents.append({"_id": _id, "id": None, "key": "legacy", "path": "/legacy", "isActive": True})
+    assert asyncio.run(repository.find_one({"key": "legacy"})).id == _id
+
+def test_insert_if_not_exist_returns_the_inserted_then_the_existing_document():
+    repository, collection = make_repository()
+
+    async def scenario():
+        inserted = await repository.insert_if_not_exist({"key": "dashboard"}, make_menu("dashboard"))
+        existing = await repository.insert_if_not_exist({"key": "dashboard"}, make_menu("dashboard", sortOrder=5))
+        assert isinstance(inserted.id, ObjectId)
+        assert existing.id == inserted.id
+        assert existing.sortOrder is None
+        assert len(collection.documents) == 1
+
+    asyncio.run(scenario())
+
+def test_update_one_returns_the_updated_document_with_its_id():
+    repository, _ = make_repository()
+
+    async def scenario():
+        created = await repository.insert_one(make_menu("dashboard"))
+        updated = await repository.update_one({"_id": created.id}, MenuUpdate(name="Home"))
+        assert updated.id == created.id
+        assert updated.name == "Home"
+        assert updated.path == "/dashboard"
+
+    asyncio.run(scenario())
+
+def add_menus(collection: FakeCollection, *keys: str) -> None:
+    collection.documents.extend({"_id": ObjectId(), "key": key, "path": f"/{key}", "isActive": True} for key in keys)
+
+def test_find_paging_returns_page_and_total_in_one_aggregate():
+    repository, collection = make_repository()
+    add_menus(collection, "d", "b", "e", "a", "c")
+
+    request = PaginationRequest(limit=2, sort={"key": "asc"}, filter={"key": ["a", "b", "c", "d"]})
+    page = asyncio.run(repository.find_paging(request))
+
+    assert collection.calls == ["aggregate"]
+    assert [menu.key for menu in page.data] == ["a", "b"]
+    assert all(isinstance(menu.id, ObjectId) for menu in page.data)
+    assert page.total == 4
+    assert page.has_next
+
+def test_find_paging_follows_the_next_cursor():
+    repository, collection = make_repository()
+    add_menus(collection, "d", "b", "e", "a", "c")
+
+    async def scenario():
+        first = await repository.find_paging(PaginationRequest(limit=2, sort={"key": "asc"}))
+        second = await repository.find_paging(PaginationRequest(limit=2, sort={"key": "asc"}, next=first.next))
+        third = await repository.find_paging(PaginationRequest(limit=2, sort={"key": "asc"}, next=second.next))
+        assert [menu.key for menu in second.data] == ["c", "d"]
+        assert [menu.key for menu in third.data] == ["e"]
+        assert second.total == third.total == 5
+        assert not third.has_next
+
+    asyncio.run(scenario())
+
+def test_find_paging_with_an_empty_result_has_zero_total():
+    repository, collection = make_repository()
+    add_menus(collection, "a")
+
+    page = asyncio.run(repository.find_paging(PaginationRequest(filter={"key": ["missing"]})))
+
+    assert page.data == []
+    assert page.total == 0
+
+def test_find_paging_estimated_without_filter_reads_the_collection_metadata():
+    repository, collection = make_repository()
+    add_menus(collection, "b", "a", "c")
+
+    page = asyncio.run(repository.find_paging(PaginationRequest(limit=2, sort={"key": "asc"}, count_mode="estimated")))
+
+    assert sorted(collection.calls) == ["estimated_document_count", "find"]
+    assert [menu.key for menu in page.data] == ["a", "b"]
+    assert page.total == 3
+
+def test_iter_many_yields_full_batches_and_the_remainder():
+    repository, collection = make_repository()
+    add_menus(collection, "a", "b", "c", "d", "e")
+
+    async def scenario():
+        return [[menu.key for menu in batch] async for batch in repository.iter_many({}, batch_size=2)]
+
+    assert asyncio.run(scenario()) == [["a", "b"], ["c", "d"], ["e"]]
+    assert collection.calls == ["find"]
+    assert collection.cursors[0].closed
+
+def test_iter_many_closes_the_cursor_when_the_caller_stops_early():
+    repository, collection = make_repository()
+    add_menus(collection, "a", "b", "c")
+
+    async def scenario():
+        batches = repository.iter_many({"key": {"$in": ["a", "b", "c"]}}, batch_size=1)
+        first = await anext(batches)
+        await batches.aclose()
+        return first
+
+    assert [menu.key for menu in asyncio.run(scenario())] == ["a"]
+    assert collection.cursors[0].closed
@@ -0,0 +1,81 @@
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.business.menu.schema.menu import Menu
+from app.business.menu.schema.menu_role import MenuRole
+from app.core.data.indexes import IndexSpec, get_registered_indexes
+from app.business.common.model.pagingation.pagination_request import PaginationRequest
+from app.core.data.keyset import encode_cursor
+from app.core.data.bulk import BulkOperation
+from app.core.data.postgresql_db.query import build_bulk_delete_statements, build_bulk_insert_statements, build_insert_if_not_exist_statement, build_keyset_clause, build_paging_statement, get_conflict_target
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+def test_menu_role_pair_is_a_unique_key():
+    assert IndexSpec(("menu_id", "role_id"), unique=True) in get_registered_indexes()["menuRoles"]
+    assert get_conflict_target(MenuRole.__table__, ["menu_id", "role_id"]) == ["menu_id", "role_id"]
+    assert get_conflict_target(MenuRole.__table__, ["menu_id"]) is None
+
+def test_insert_if_not_exist_on_a_unique_key_uses_on_conflict():
+    link = {"menu_id": uuid.uuid4(), "role_id": uuid.uuid4()}
+    sql = compile_sql(build_insert_if_not_exist_statement(MenuRole, link, MenuRole(**link)))
+    assert "ON CONFLICT (menu_id, role_id) DO NOTHING" in sql
+    assert "INSERT INTO \"menuRoles\" (menu_id, role_id) VALUES" in sql
+    # The existing row is read only when nothing was inserted
+    assert "UNION ALL" in sql
+    assert "FROM inserted)) \n LIMIT" in sql
+
+def test_insert_if_not_exist_without_a_unique_key_guards_with_not_exists():
+    menu = Menu(key="dashboard", path="/dashboard", isActive=True)
+    sql = compile_sql(build_insert_if_not_exist_statement(Menu, {"key": "dashboard"}, menu))
+    assert "INSERT INTO menus" in sql
+    assert "ON CONFLICT DO NOTHING" in sql
+    assert "WHERE NOT (EXISTS (SELECT %(param_4)s AS anon_1 \nFROM menus \nWHERE menus.key = %(key_1)s))" in sql
+
+def test_keyset_clause_in_one_direction_is_a_row_value_comparison():
+    sql = compile_sql(build_keyset_clause(Menu, [("key", 1), ("id", 1)], ["b", uuid.uuid4()]))
+    assert sql == "(menus.key, menus.id) > (%(param_1)s, %(param_2)s::UUID)"
+
+def test_keyset_clause_in_mixed_directions_expands_per_field():
+    sql = compile_sql(build_keyset_clause(Menu, [("key", -1), ("id", 1)], ["b", uuid.uuid4()]))
+    assert sql == "menus.key < %(key_1)s OR menus.key = %(key_2)s AND menus.id > %(id_1)s::UUID"
+
+def test_paging_statement_counts_with_a_window_and_fetches_one_extra_row():
+    sort = [("key", 1), ("id", 1)]
+    sql = compile_sql(build_paging_statement(Menu, PaginationRequest(limit=10, page=2), sort))
+    assert "count(*) OVER () AS total" in sql
+    assert "ORDER BY menus.key ASC, menus.id ASC" in sql
+    assert "LIMIT %(param_1)s OFFSET %(param_2)s" in sql
+
+def test_paging_statement_with_a_cursor_counts_the_filtered_set():
+    sort = [("key", 1), ("id", 1)]
+    request = PaginationRequest(limit=10, next=encode_cursor(sort, {"key": "b", "id": uuid.uuid4()}))
+    sql = compile_sql(build_paging_statement(Menu, request, sort))
+    assert "(SELECT count(*) AS count_1 \nFROM menus) AS total" in sql
+    assert "WHERE (menus.key, menus.id) > (%(param_1)s, %(param_2)s::UUID)" in sql
+    assert "OVER ()" not in sql
+
+def test_bulk_insert_groups_rows_by_their_columns():
+    menus = [
+        Menu(key="a", path="/a", isActive=True),
+        Menu(key="b", path="/b", isActive=True, sortOrder=1),
+        Menu(key="c", path="/c", isActive=True),
+    ]
+    statements = build_bulk_insert_statements(Menu, menus)
+    sqls = [compile_sql(statement) for statement in statements]
+    assert len(statements) == 2
+    # Columns left out keep their server defaults, e.g. the generated id
+    assert sqls[0].startswith('INSERT INTO menus (key, path, "isActive") VALUES (%(key_m0)s, %(path_m0)s, %(isActive_m0)s), (%(key_m1)s')
+    assert sqls[0].endswith("RETURNING menus.id")
+    assert '"sortOrder"' in sqls[1] and "key_m1" not in sqls[1]
+
+def test_bulk_delete_merges_deletes_by_id():
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    operations = [BulkOperation.delete({"id": ids[0]}), BulkOperation.delete({"key": "a"}), BulkOperation.delete({"id": ids[1]})]
+    sqls = [compile_sql(statement) for statement in build_bulk_delete_statements(Menu, operations)]
+    assert sqls == [
+        "DELETE FROM menus WHERE menus.id IN (__[POSTCOMPILE_id_1])",
+        "DELETE FROM menus WHERE menus.key = %(key_1)s",
+    ]
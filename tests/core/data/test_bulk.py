@@ -0,0 +1,27 @@
+from app.core.data.bulk import BulkOperation, BulkOperationType, chunk_operations, group_operations, to_operations
+
+def test_plain_models_become_inserts():
+    delete = BulkOperation.delete({"id": 1})
+    assert to_operations(["row", delete]) == [BulkOperation.insert("row"), delete]
+
+def test_chunks_keep_the_order_and_the_tail():
+    operations = to_operations(list(range(5)))
+    assert [[op.data for op in chunk] for chunk in chunk_operations(operations, 2)] == [[0, 1], [2, 3], [4]]
+
+def test_ordered_groups_keep_consecutive_runs():
+    batch = [BulkOperation.insert(1), BulkOperation.insert(2), BulkOperation.delete({"id": 1}), BulkOperation.insert(3)]
+    groups = group_operations(batch, ordered=True)
+    assert [(operation_type, len(ops)) for operation_type, ops in groups] == [
+        (BulkOperationType.INSERT, 2),
+        (BulkOperationType.DELETE, 1),
+        (BulkOperationType.INSERT, 1),
+    ]
+
+def test_unordered_groups_merge_each_type():
+    batch = [BulkOperation.insert(1), BulkOperation.delete({"id": 1}), BulkOperation.insert(2), BulkOperation.update({"id": 2}, "data")]
+    groups = group_operations(batch, ordered=False)
+    assert [(operation_type, [op.data for op in ops]) for operation_type, ops in groups] == [
+        (BulkOperationType.INSERT, [1, 2]),
+        (BulkOperationType.UPDATE, ["data"]),
+        (BulkOperationType.DELETE, [None]),
+    ]
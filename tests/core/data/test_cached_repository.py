@@ -0,0 +1,104 @@
+import asyncio
+
+from app.core.cache.memory_cache import MemoryCache
+from app.core.data.cached_repository import CachedRepository
+from app.core.data.unit_of_work import pop_after_commit, reset_current_session, run_after_commit, set_current_session
+
+class Row:
+    def __init__(self, id: str, name: str):
+        self.id = id
+        self.name = name
+
+class FakeRepository:
+    """
+    Keeps committed rows apart from the rows written by the open transaction.
+    """
+    model = Row
+
+    def __init__(self):
+        self.committed = {"1": "committed"}
+        self.pending = {}
+        self.reads = 0
+
+    async def find_by_id(self, _id: str) -> Row:
+        self.reads += 1
+        name = self.pending.get(_id, self.committed.get(_id))
+        return Row(_id, name) if name is not None else None
+
+    async def update_one_by_id(self, _id: str, data: str, return_document: bool = True):
+        self.pending[_id] = data
+        return Row(_id, data)
+
+    def commit(self):
+        self.committed.update(self.pending)
+        self.pending.clear()
+
+    def rollback(self):
+        self.pending.clear()
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+
+async def run_unit_of_work(repository: FakeRepository, work, fail: bool = False):
+    # Mirrors session_scope: callbacks run after commit and are dropped on rollback
+    session = FakeSession()
+    token = set_current_session(session)
+    try:
+        await work()
+        if fail:
+            raise RuntimeError("rollback")
+        repository.commit()
+    except RuntimeError:
+        pop_after_commit(session)
+        repository.rollback()
+        return
+    finally:
+        reset_current_session(token)
+    await run_after_commit(pop_after_commit(session))
+
+def make_repository():
+    inner = FakeRepository()
+    return inner, CachedRepository(inner, MemoryCache(max_entries=100, default_ttl=60), ttl=60)
+
+def test_read_after_write_is_not_cached_past_a_rollback():
+    inner, repository = make_repository()
+
+    async def scenario():
+        async def work():
+            await repository.update_one_by_id("1", "uncommitted")
+            assert (await repository.find_by_id("1")).name == "uncommitted"
+
+        await run_unit_of_work(inner, work, fail=True)
+        assert (await repository.find_by_id("1")).name == "committed"
+
+    asyncio.run(scenario())
+
+def test_read_after_write_sees_the_committed_row_after_commit():
+    inner, repository = make_repository()
+
+    async def scenario():
+        assert (await repository.find_by_id("1")).name == "committed"
+
+        async def work():
+            await repository.update_one_by_id("1", "updated")
+            assert (await repository.find_by_id("1")).name == "updated"
+
+        await run_unit_of_work(inner, work)
+        assert (await repository.find_by_id("1")).name == "updated"
+
+    asyncio.run(scenario())
+
+def test_reads_are_cached_outside_a_writing_unit_of_work():
+    inner, repository = make_repository()
+
+    async def scenario():
+        async def work():
+            await repository.find_by_id("1")
+            await repository.find_by_id("1")
+
+        await run_unit_of_work(inner, work)
+        await repository.find_by_id("1")
+        assert inner.reads == 1
+
+    asyncio.run(scenario())
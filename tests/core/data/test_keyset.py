@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from app.business.common.model.pagingation.pagination_request import PaginationRequest
+from app.core.data.keyset import build_keyset_page, decode_cursor, encode_cursor, get_keyset_position, get_offset, get_sort_spec
+
+def test_sort_spec_ends_with_the_id_in_the_last_direction():
+    assert get_sort_spec({"name": "asc", "created_at": "desc"}, "id") == [("name", 1), ("created_at", -1), ("id", -1)]
+    assert get_sort_spec({"id": "desc", "name": "asc"}, "id") == [("name", 1), ("id", -1)]
+    assert get_sort_spec(None, "_id") == [("_id", 1)]
+
+def test_cursor_round_trips_typed_values():
+    sort = [("created_at", -1), ("owner", 1), ("_id", 1)]
+    row = {"created_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), "owner": uuid.uuid4(), "_id": ObjectId()}
+    token = encode_cursor(sort, row)
+    assert "=" not in token
+    assert decode_cursor(token, sort) == [row["created_at"], row["owner"], row["_id"]]
+
+def test_cursor_of_another_sort_is_rejected():
+    token = encode_cursor([("name", 1), ("id", 1)], {"name": "a", "id": 1})
+    with pytest.raises(ValueError, match="does not match"):
+        decode_cursor(token, [("path", 1), ("id", 1)])
+
+@pytest.mark.parametrize("token", ["!!!", "bm90IGpzb24"])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_cursor(token, [("id", 1)])
+
+def test_previous_cursor_walks_the_sort_backwards():
+    sort = [("name", 1), ("id", 1)]
+    token = encode_cursor(sort, {"name": "b", "id": 2})
+    assert get_keyset_position(PaginationRequest(next=token), sort) == (sort, ["b", 2])
+    assert get_keyset_position(PaginationRequest(previous=token), sort) == ([("name", -1), ("id", -1)], ["b", 2])
+    assert get_keyset_position(PaginationRequest(), sort) == (sort, None)
+
+def test_offset_applies_only_without_a_cursor():
+    assert get_offset(PaginationRequest(limit=10, page=3)) == 20
+    assert get_offset(PaginationRequest(limit=10, page=3, next="token")) == 0
+
+def test_page_trims_the_look_ahead_row_and_sets_cursors():
+    sort = [("id", 1)]
+    rows = [{"id": 1}, {"id": 2}, {"id": 3}]
+    page = build_keyset_page(rows, PaginationRequest(limit=2), sort)
+    assert page.rows == rows[:2]
+    assert page.has_next and not page.has_previous
+    assert decode_cursor(page.next, sort) == [2]
+    assert page.previous is None
+
+def test_previous_page_is_returned_in_sort_order():
+    sort = [("id", 1)]
+    token = encode_cursor(sort, {"id": 4})
+    # Rows come back in the reversed sort, nearest the cursor first
+    page = build_keyset_page([{"id": 3}, {"id": 2}, {"id": 1}], PaginationRequest(limit=2, previous=token), sort)
+    assert page.rows == [{"id": 2}, {"id": 3}]
+    assert page.has_previous and page.has_next
+    assert decode_cursor(page.previous, sort) == [2]
+    assert decode_cursor(page.next, sort) == [3]
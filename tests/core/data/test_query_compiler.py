@@ -0,0 +1,41 @@
+import pytest
+
+from app.business.common.model.pagingation.pagination_request import PaginationRequest
+from app.business.menu.schema.menu import Menu
+from app.core.data.query_compiler import QueryCompilationError, compile_mongo_filter, compile_projection, compile_sort, compile_sql_filters
+
+def test_sort_on_an_indexed_field_ends_with_the_id():
+    assert compile_sort(Menu, PaginationRequest(sort={"key": "desc"}), "_id") == [("key", -1), ("_id", -1)]
+    assert compile_sort(Menu, PaginationRequest(sort={"id": "asc"}), "_id") == [("_id", 1)]
+
+def test_sort_on_an_unindexed_field_is_rejected():
+    with pytest.raises(QueryCompilationError, match="not backed by an index"):
+        compile_sort(Menu, PaginationRequest(sort={"name": "asc"}), "id")
+
+def test_sort_with_an_invalid_direction_is_rejected():
+    with pytest.raises(QueryCompilationError, match="'asc' or 'desc'"):
+        compile_sort(Menu, PaginationRequest(sort={"key": "up"}), "id")
+
+def test_unknown_filter_field_is_rejected():
+    with pytest.raises(QueryCompilationError, match="Unknown filter"):
+        compile_mongo_filter(Menu, PaginationRequest(filter={"missing": ["x"]}))
+
+def test_mongo_filter_uses_equality_in_and_anchored_prefixes():
+    request = PaginationRequest(filter={"key": ["a"], "path": ["/a", "/b"]}, search={"name": "Da.sh"})
+    assert compile_mongo_filter(Menu, request) == {"$and": [
+        {"key": "a"},
+        {"path": {"$in": ["/a", "/b"]}},
+        {"name": {"$regex": "^Da\\.sh"}},
+    ]}
+    assert compile_mongo_filter(Menu, PaginationRequest()) == {}
+
+def test_sql_filters_use_in_lists_and_escaped_prefixes():
+    request = PaginationRequest(filter={"path": ["/a", "/b"]}, search={"name": "50%"})
+    clauses = [str(clause.compile(compile_kwargs={"literal_binds": True})) for clause in compile_sql_filters(Menu, request)]
+    assert clauses == ["menus.path IN ('/a', '/b')", "menus.name LIKE '50/%' || '%' ESCAPE '/'"]
+
+def test_projection_always_keeps_the_id_and_required_fields():
+    assert compile_projection(Menu, ["name", "id"], "_id", ["key"]) == ["_id", "name", "key"]
+    assert compile_projection(Menu, None, "_id") is None
+    with pytest.raises(QueryCompilationError, match="Unknown projection"):
+        compile_projection(Menu, ["missing"], "_id")
@@ -0,0 +1,33 @@
+import pytest
+from fastapi import Request, status
+
+from app.core.utils.etag import is_not_modified, make_etag, not_modified_response
+
+def make_request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_etag_is_quoted_and_follows_the_version():
+    etag = make_etag("settings", 1)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert len(etag) == 34
+    assert etag == make_etag("settings", 1)
+    assert etag != make_etag("settings", 2)
+    assert etag != make_etag("menus", 1)
+
+@pytest.mark.parametrize("header", ['"{etag}"', 'W/"{etag}"', '"other", "{etag}"', "*"])
+def test_matching_if_none_match_is_not_modified(header):
+    etag = make_etag("settings", 1)
+    assert is_not_modified(make_request(header.replace('"{etag}"', etag)), etag)
+
+@pytest.mark.parametrize("header", [None, "", '"other"'])
+def test_missing_or_stale_if_none_match_is_modified(header):
+    assert not is_not_modified(make_request(header), make_etag("settings", 1))
+
+def test_not_modified_response_is_empty_and_keeps_the_validators():
+    etag = make_etag("settings", 1)
+    response = not_modified_response(etag, "private, max-age=0")
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.body == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"] == "private, max-age=0"
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import Request
+
+from app.core.utils.password import PasswordHashPool, PasswordHasherBusyError
+from app.infrastructure.middleware.error_handler import ErrorHandlerMiddleware
+
+@pytest.fixture
+def pool(monkeypatch) -> PasswordHashPool:
+    monkeypatch.setattr(PasswordHashPool, "_instance", None)
+    pool = PasswordHashPool()
+    pool.max_workers = 1
+    pool.max_pending = 2
+    yield pool
+    pool.close()
+    PasswordHashPool._instance = None
+
+def test_full_pool_rejects_instead_of_queueing(pool):
+    release = threading.Event()
+
+    def blocked(value):
+        release.wait(timeout=5)
+        return value
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(blocked, index)) for index in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusyError):
+            await pool.run(blocked, 2)
+        stats = pool.get_stats()
+        assert (stats["running"], stats["queue_depth"], stats["rejected"]) == (1, 1, 1)
+        release.set()
+        assert await asyncio.gather(*running) == [0, 1]
+        # The slots are given back on the loop once the threads finish
+        await asyncio.sleep(0)
+        assert await pool.run(blocked, 3) == 3
+
+    asyncio.run(scenario())
+    assert pool.pending == 0
+    assert pool.get_stats()["completed"] == 3
+
+def test_failing_hash_releases_its_slot(pool):
+    def failing():
+        raise ValueError("bad hash")
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await pool.run(failing)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert pool.pending == 0
+
+def test_busy_pool_is_answered_with_503():
+    async def call_next(request):
+        raise PasswordHasherBusyError("2 password hashes pending")
+
+    request = Request({"type": "http", "method": "POST", "path": "/api/v1/auth/login", "headers": []})
+    response = asyncio.run(ErrorHandlerMiddleware(app=None).dispatch(request, call_next))
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert json.loads(response.body)["error"] == "Service Unavailable"